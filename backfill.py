@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Backfill debriefs for every Zoom recording in a date range.
+
+Crawls /accounts/me/recordings, ingests each transcript and runs the debrief
+directly (no supervisor), writing one JSON result per meeting to the output
+directory. Progress is checkpointed so an interrupted run can be resumed.
+
+Example:
+    python backfill.py --from 2025-09-01 --to 2025-09-30 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def parse_args():
+    today = date.today()
+    parser = argparse.ArgumentParser(description="Backfill meeting debriefs from Zoom recordings")
+    parser.add_argument("--from", dest="from_date", type=date.fromisoformat,
+                        default=today - timedelta(days=30), help="First day to crawl (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="to_date", type=date.fromisoformat,
+                        default=today, help="Last day to crawl (YYYY-MM-DD)")
+    parser.add_argument("--window-days", type=positive_int, default=30,
+                        help="Days per recordings query (Zoom allows at most one month)")
+    parser.add_argument("--concurrency", type=positive_int, default=4,
+                        help="Meetings processed at the same time")
+    parser.add_argument("--output", type=Path, default=Path("backfill_output"),
+                        help="Directory for results and the checkpoint file")
+    parser.add_argument("--no-debrief", action="store_true",
+                        help="Only ingest transcripts, skip the debrief")
+    return parser.parse_args()
+
+
+class Checkpoint:
+    """Set of finished meeting uuids, persisted after every meeting."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.done = set()
+        if path.exists():
+            self.done = set(json.loads(path.read_text(encoding="utf-8")).get("done", []))
+
+    def mark_done(self, uuid: str):
+        self.done.add(uuid)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"done": sorted(self.done)}), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def result_filename(meeting: dict) -> str:
+    start = (meeting.get("start_time") or "unknown").replace(":", "-")
+    return f"{meeting.get('id')}_{start}.json"
+
+
+async def process_meeting(meeting: dict, args, checkpoint: Checkpoint, semaphore: asyncio.Semaphore, stats: dict):
+    # src imports load settings from .env, keep them out of `--help`
+    from src.ingest import IngestJob, ingest_meeting
+    from src.agents.debrief_agent import precompute_debrief
+
+    topic = meeting.get("topic", "").strip()
+    async with semaphore:
+        try:
+            ingested = await ingest_meeting(IngestJob(meeting=meeting, ingested_via="backfill"))
+            if ingested is None:
+                stats["skipped"] += 1
+                checkpoint.mark_done(meeting["uuid"])
+                return
+
+            result = {**ingested, "start_time": meeting.get("start_time")}
+            if not args.no_debrief:
+                debrief = await precompute_debrief(ingested["transcript_path"])
+                result.update(summary=debrief.summary, todo=debrief.todo, feedback=debrief.feedback)
+
+            out_file = args.output / result_filename(meeting)
+            out_file.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+            checkpoint.mark_done(meeting["uuid"])
+            stats["processed"] += 1
+            print(f"✅ {topic} → {out_file}")
+        except Exception as e:
+            stats["failed"] += 1
+            print(f"❌ {topic}: {e}")
+
+
+async def run(args):
+    from src.tools.zoom_tools import get_access_token, iter_account_recordings
+    from src.scheduler import BACKGROUND, current_priority
+
+    # Every task spawned below inherits the background class
+    current_priority.set(BACKGROUND)
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    checkpoint = Checkpoint(args.output / "checkpoint.json")
+    semaphore = asyncio.Semaphore(args.concurrency)
+    stats = {"processed": 0, "skipped": 0, "failed": 0, "resumed": 0}
+
+    print(f"🔎 Crawling recordings from {args.from_date} to {args.to_date}")
+    started = time.monotonic()
+    token = await get_access_token()
+    tasks = []
+    async for meeting in iter_account_recordings(token, args.from_date, args.to_date, args.window_days):
+        if meeting.get("uuid") in checkpoint.done:
+            stats["resumed"] += 1
+            continue
+        tasks.append(asyncio.create_task(process_meeting(meeting, args, checkpoint, semaphore, stats)))
+    print(f"📂 {len(tasks)} meetings to process ({stats['resumed']} already done)")
+    await asyncio.gather(*tasks)
+
+    elapsed = time.monotonic() - started
+    per_minute = stats["processed"] / (elapsed / 60) if elapsed else 0.0
+    print()
+    print(f"🏁 Backfill finished in {elapsed:.1f}s")
+    print(f"   processed={stats['processed']} skipped={stats['skipped']} "
+          f"failed={stats['failed']} resumed={stats['resumed']}")
+    print(f"   throughput: {per_minute:.2f} meetings/min")
+
+
+def main():
+    asyncio.run(run(parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Cold-start import time of the API (or any module), measured with `python -X importtime`.
+
+Every run is a fresh interpreter, so the numbers match what an autoscaled
+replica or a `reload=True` restart pays before it can serve a request.
+
+Usage:
+    python benchmarks/import_time.py                      # src.main, 5 runs
+    python benchmarks/import_time.py --module src.graph --runs 10
+    python benchmarks/import_time.py --max-ms 1500        # exit 1 above the budget (CI)
+    python benchmarks/import_time.py --json results.json  # keep a record of the run
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# "import time: self [us] | cumulative | imported package"
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+# Settings without defaults; importing never contacts these services, so placeholders are enough
+REQUIRED_SETTINGS = (
+    "OPENAI_API_KEY", "NOTION_TOKEN", "ZOOM_ACCOUNT_ID", "ZOOM_CLIENT_ID",
+    "ZOOM_CLIENT_SECRET", "ZOOM_WEBHOOK_USER", "ZOOM_WEBHOOK_PASS",
+)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.main", help="module to import (default: src.main)")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to measure (default: 5)")
+    parser.add_argument("--top", type=int, default=15, help="slowest top-level imports to list (default: 15)")
+    parser.add_argument("--max-ms", type=float, help="fail when the median exceeds this many milliseconds")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    return parser.parse_args()
+
+
+def measure(module: str) -> dict:
+    env = dict(os.environ)
+    for name in REQUIRED_SETTINGS:
+        env.setdefault(name, "import-benchmark")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"❌ Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    modules = {}
+    total_us = None
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match[1]), int(match[2]), match[3], match[4]
+        depth = (len(indent) - 1) // 2
+        if name == module and depth == 0:
+            total_us = cumulative_us
+        # Direct imports of the measured module are one level below it
+        if depth == 1:
+            modules[name] = cumulative_us
+    return {"total_ms": (total_us or 0) / 1000, "imports_ms": {k: v / 1000 for k, v in modules.items()}}
+
+
+def main():
+    args = parse_args()
+    runs = [measure(args.module) for _ in range(args.runs)]
+    totals = [run["total_ms"] for run in runs]
+    median = statistics.median(totals)
+
+    # Per-import medians over the runs
+    names = set().union(*(run["imports_ms"] for run in runs))
+    imports = {
+        name: statistics.median(run["imports_ms"].get(name, 0.0) for run in runs)
+        for name in names
+    }
+    slowest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:args.top]
+
+    print(f"⏱️  import {args.module}: median {median:.1f} ms "
+          f"(min {min(totals):.1f}, max {max(totals):.1f}, {args.runs} runs)")
+    print(f"\nSlowest direct imports of {args.module}:")
+    for name, ms in slowest:
+        print(f"  {ms:9.1f} ms  {name}")
+
+    if args.json:
+        args.json.write_text(json.dumps({
+            "module": args.module,
+            "runs": args.runs,
+            "median_ms": round(median, 1),
+            "totals_ms": [round(t, 1) for t in totals],
+            "slowest_imports_ms": {name: round(ms, 1) for name, ms in slowest},
+        }, indent=2), encoding="utf-8")
+
+    if args.max_ms is not None and median > args.max_ms:
+        print(f"\n❌ Median import time {median:.1f} ms is above the {args.max_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
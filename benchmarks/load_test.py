@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+End-to-end load and latency benchmark.
+
+Starts the stub services (benchmarks/stubs.py, benchmarks/mcp_stub.py) and the
+real API (uvicorn src.main:app, full compiled graph) pointed at them, then
+drives /api/v1/query at a fixed concurrency and reports:
+
+- throughput (completed runs per second / minute)
+- time to first event (the SSE `start` event) and to the first node update
+- end-to-end latency
+- p50 / p95 / p99 per graph node, taken from the server timestamps of
+  consecutive SSE events (parallel branches overlap, so those are approximate)
+
+Usage:
+    python benchmarks/load_test.py --requests 40 --concurrency 8
+    python benchmarks/load_test.py --llm-latency-ms 800 --token-delay-ms 5 --json baseline.json
+    python benchmarks/load_test.py --query "Summarise AI Sharing分享 and save it to Notion"
+    python benchmarks/load_test.py --app-env RESULT_CACHE_ENABLED=true --app-env MAX_INFLIGHT_RUNS=4
+
+Record once, then replay the same LLM/Zoom/Notion/MCP responses on every branch:
+    python benchmarks/load_test.py --record cassettes/summary.jsonl
+    python benchmarks/load_test.py --replay cassettes/summary.jsonl --latency-scale 0
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_QUERY = "Help me get transcript of meet recording named AI Sharing分享 and summarise it"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="measured queries (default: 20)")
+    parser.add_argument("--concurrency", type=int, default=4, help="queries in flight (default: 4)")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured queries sent first (default: 1)")
+    parser.add_argument("--query", default=DEFAULT_QUERY)
+    parser.add_argument("--llm-latency-ms", type=float, default=300, help="stub LLM time to first token")
+    parser.add_argument("--token-delay-ms", type=float, default=2, help="stub LLM delay per output token")
+    parser.add_argument("--completion-tokens", type=int, default=120, help="stub summary/todo/feedback length")
+    parser.add_argument("--zoom-latency-ms", type=float, default=80)
+    parser.add_argument("--notion-latency-ms", type=float, default=60)
+    parser.add_argument("--cues-per-meeting", type=int, default=400, help="transcript size of each stub meeting")
+    parser.add_argument("--workers", type=int, default=1, help="API worker processes (default: 1)")
+    parser.add_argument("--app-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra settings for the API process (repeatable)")
+    parser.add_argument("--record", type=Path, metavar="CASSETTE", help="record every upstream interaction to this file")
+    parser.add_argument("--replay", type=Path, metavar="CASSETTE", help="serve upstream interactions from this file")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="replayed latency multiplier (0: instant)")
+    parser.add_argument("--allow-loose", action="store_true",
+                        help="replay calls whose payload changed since recording (e.g. a reworded prompt) by endpoint and shape")
+    parser.add_argument("--app-url", help="benchmark an already running API instead of starting one")
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the API and stub logs")
+    return parser.parse_args()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    low, high = int(rank), min(int(rank) + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: List[float]) -> Dict:
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else None,
+    }
+
+
+# === Processes ===
+def start_services(args, workdir: Path) -> (List[subprocess.Popen], str, str):
+    output = None if args.verbose else subprocess.DEVNULL
+    stub_port, app_port = free_port(), free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+
+    stub_env = {
+        **os.environ,
+        "STUB_LLM_LATENCY_MS": str(args.llm_latency_ms),
+        "STUB_TOKEN_DELAY_MS": str(args.token_delay_ms),
+        "STUB_COMPLETION_TOKENS": str(args.completion_tokens),
+        "STUB_ZOOM_LATENCY_MS": str(args.zoom_latency_ms),
+        "STUB_NOTION_LATENCY_MS": str(args.notion_latency_ms),
+        "STUB_CUES_PER_MEETING": str(args.cues_per_meeting),
+    }
+    stubs = subprocess.Popen(
+        [sys.executable, str(ROOT / "benchmarks" / "stubs.py"), "--port", str(stub_port)],
+        env=stub_env, stdout=output, stderr=output,
+    )
+
+    app_env = {
+        **os.environ,
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_BASE_URL": f"{stub_url}/openai/v1",
+        "NOTION_TOKEN": "stub",
+        "NOTION_API_BASE_URL": f"{stub_url}/notion/v1",
+        "NOTION_MCP_COMMAND": sys.executable,
+        "NOTION_MCP_ARGS": str(ROOT / "benchmarks" / "mcp_stub.py"),
+        "ZOOM_ACCOUNT_ID": "stub",
+        "ZOOM_CLIENT_ID": "stub",
+        "ZOOM_CLIENT_SECRET": "stub",
+        "ZOOM_WEBHOOK_USER": "stub",
+        "ZOOM_WEBHOOK_PASS": "stub",
+        "ZOOM_OAUTH_URL": f"{stub_url}/zoom/oauth/token",
+        "ZOOM_API_BASE_URL": f"{stub_url}/zoom/v2",
+        "TRANSCRIPT_DIR": str(workdir / "transcripts"),
+        "CACHE_DB_PATH": str(workdir / "cache.sqlite3"),
+        "TRANSCRIPT_INDEX_PATH": str(workdir / "index.sqlite3"),
+        # Measure the pipeline itself unless asked otherwise
+        "RESULT_CACHE_ENABLED": "false",
+        "PYTHONPATH": str(ROOT),
+    }
+    if args.record or args.replay:
+        app_env["CASSETTE_MODE"] = "record" if args.record else "replay"
+        app_env["CASSETTE_PATH"] = str((args.record or args.replay).resolve())
+        app_env["CASSETTE_LATENCY_SCALE"] = str(args.latency_scale)
+        app_env["CASSETTE_ALLOW_LOOSE"] = str(args.allow_loose).lower()
+    for item in args.app_env:
+        key, _, value = item.partition("=")
+        app_env[key] = value
+    app = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1",
+         "--port", str(app_port), "--log-level", "warning", "--workers", str(args.workers)],
+        cwd=ROOT, env=app_env, stdout=output, stderr=output,
+    )
+    return [app, stubs], f"http://127.0.0.1:{app_port}", stub_url
+
+
+async def wait_ready(client: httpx.AsyncClient, app_url: str, timeout: float = 120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            resp = await client.get(f"{app_url}/api/v1/ready")
+            if resp.status_code == 200:
+                return resp.json()
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit(f"❌ API at {app_url} was not ready after {timeout:.0f}s")
+
+
+# === Load ===
+async def run_query(client: httpx.AsyncClient, app_url: str, query: str) -> Dict:
+    started = time.perf_counter()
+    result = {"status": None, "ttfe": None, "first_node": None, "latency": None, "nodes": [], "error": None}
+    previous_ts = None
+    try:
+        async with client.stream("POST", f"{app_url}/api/v1/query", json={"query": query}) as resp:
+            result["status"] = resp.status_code
+            if resp.status_code != 200:
+                await resp.aread()
+                return result
+            event = None
+            async for line in resp.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[7:]
+                    continue
+                if not line.startswith("data: "):
+                    continue
+                now = time.perf_counter() - started
+                data = json.loads(line[6:])
+                if event == "start":
+                    result["ttfe"] = now
+                    previous_ts = data.get("timestamp")
+                elif event == "node_update":
+                    if result["first_node"] is None:
+                        result["first_node"] = now
+                    ts = data.get("timestamp")
+                    if previous_ts is not None and ts is not None:
+                        result["nodes"].append((data["node"], ts - previous_ts))
+                    previous_ts = ts
+                elif event == "error":
+                    result["error"] = data.get("error")
+                elif event == "completion":
+                    break
+    except httpx.HTTPError as e:
+        result["error"] = str(e) or type(e).__name__
+    result["latency"] = time.perf_counter() - started
+    return result
+
+
+async def drive(args, app_url: str) -> Dict:
+    timeout = httpx.Timeout(600.0, connect=10.0)
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        readiness = await wait_ready(client, app_url)
+        print(f"✅ API ready: " + ", ".join(
+            f"{name}={dep['status']} ({dep['latency_ms']} ms)" for name, dep in readiness["dependencies"].items()
+        ))
+
+        for _ in range(args.warmup):
+            await run_query(client, app_url, args.query)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(args.requests):
+            queue.put_nowait(i)
+        results = []
+
+        async def worker():
+            while True:
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results.append(await run_query(client, app_url, args.query))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        cassette = (await client.get(f"{app_url}/api/v1/cassette")).json()
+    return {"results": results, "elapsed": elapsed, "cassette": cassette}
+
+
+def report(args, run: Dict, upstream_calls: Optional[Dict]) -> Dict:
+    results, elapsed = run["results"], run["elapsed"]
+    ok = [r for r in results if r["status"] == 200 and not r["error"]]
+    rejected = [r for r in results if r["status"] == 429]
+    failed = [r for r in results if r not in ok and r not in rejected]
+
+    per_node = defaultdict(list)
+    for r in ok:
+        for node, seconds in r["nodes"]:
+            per_node[node].append(seconds)
+
+    summary = {
+        "query": args.query,
+        "requests": len(results),
+        "concurrency": args.concurrency,
+        "completed": len(ok),
+        "rejected_429": len(rejected),
+        "failed": len(failed),
+        "elapsed_s": elapsed,
+        "throughput_per_s": len(ok) / elapsed if elapsed else 0.0,
+        "time_to_first_event_s": summarize([r["ttfe"] for r in ok if r["ttfe"] is not None]),
+        "time_to_first_node_s": summarize([r["first_node"] for r in ok if r["first_node"] is not None]),
+        "latency_s": summarize([r["latency"] for r in ok]),
+        "nodes_s": {node: summarize(values) for node, values in sorted(per_node.items())},
+        "upstream_calls": upstream_calls,
+        "cassette": run["cassette"],
+        "errors": sorted({r["error"] or f"HTTP {r['status']}" for r in failed})[:10],
+    }
+
+    fmt = lambda v: "-" if v is None else f"{v * 1000:8.0f}"
+    print()
+    print(f"🏁 {summary['completed']}/{summary['requests']} completed in {elapsed:.1f}s "
+          f"at concurrency {args.concurrency} "
+          f"(429: {summary['rejected_429']}, failed: {summary['failed']})")
+    print(f"   throughput: {summary['throughput_per_s']:.2f} runs/s ({summary['throughput_per_s'] * 60:.1f} runs/min)")
+    print()
+    print(f"   {'ms':<22}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'n':>6}")
+    rows = [("time to first event", summary["time_to_first_event_s"]),
+            ("time to first node", summary["time_to_first_node_s"]),
+            ("end to end", summary["latency_s"])]
+    rows += [(f"node {node}", stats) for node, stats in summary["nodes_s"].items()]
+    for label, stats in rows:
+        print(f"   {label:<22}{fmt(stats['p50'])} {fmt(stats['p95'])} {fmt(stats['p99'])} "
+              f"{fmt(stats['max'])}{stats['count']:>6}")
+    if upstream_calls:
+        print(f"\n   upstream calls: " + ", ".join(f"{k}={v}" for k, v in sorted(upstream_calls.items())))
+    if run["cassette"]["mode"] != "off":
+        print(f"   cassette: " + ", ".join(f"{k}={v}" for k, v in run["cassette"].items()))
+    for error in summary["errors"]:
+        print(f"   ❌ {error}")
+    return summary
+
+
+async def fetch_stub_stats(stub_url: Optional[str]) -> Optional[Dict]:
+    if not stub_url:
+        return None
+    async with httpx.AsyncClient() as client:
+        return (await client.get(f"{stub_url}/stats")).json()
+
+
+def main():
+    args = parse_args()
+    processes, stub_url = [], None
+    with tempfile.TemporaryDirectory(prefix="meeting-agent-bench-") as workdir:
+        try:
+            if args.app_url:
+                app_url = args.app_url.rstrip("/")
+            else:
+                processes, app_url, stub_url = start_services(args, Path(workdir))
+                print(f"🚀 API at {app_url}, stubs at {stub_url}")
+            run = asyncio.run(drive(args, app_url))
+            summary = report(args, run, asyncio.run(fetch_stub_stats(stub_url)))
+        finally:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                try:
+                    process.wait(timeout=15)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Stdio MCP server standing in for @notionhq/notion-mcp-server in benchmarks.
+
+Point the app at it with:
+    NOTION_MCP_COMMAND=python NOTION_MCP_ARGS="benchmarks/mcp_stub.py"
+"""
+
+import asyncio
+import os
+import uuid
+from mcp.server.fastmcp import FastMCP
+
+LATENCY_MS = float(os.getenv("STUB_NOTION_LATENCY_MS", "60"))
+
+mcp = FastMCP("notion-stub")
+
+
+@mcp.tool(name="API-post-search")
+async def post_search(query: str = "") -> dict:
+    """Search pages and databases by title."""
+    await asyncio.sleep(LATENCY_MS / 1000)
+    return {"results": [{
+        "object": "page",
+        "id": f"page-{abs(hash(query)) % 10 ** 8}",
+        "properties": {"title": {"type": "title", "title": [{"plain_text": query or "Meeting Notes"}]}},
+    }]}
+
+
+@mcp.tool(name="API-post-page")
+async def post_page(parent: dict, properties: dict, children: list = None) -> dict:
+    """Create a page under a parent page or database."""
+    await asyncio.sleep(LATENCY_MS / 1000)
+    return {"object": "page", "id": str(uuid.uuid4())}
+
+
+@mcp.tool(name="API-patch-block-children")
+async def patch_block_children(block_id: str, children: list) -> dict:
+    """Append blocks to a page."""
+    await asyncio.sleep(LATENCY_MS / 1000)
+    return {"object": "list", "results": []}
+
+
+if __name__ == "__main__":
+    mcp.run("stdio")
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the services the pipeline calls, served from one FastAPI app:
+
+    /openai/v1   OpenAI-compatible chat completions (schema-valid structured output,
+                 tool calls for the Zoom agent, optional token streaming)
+    /zoom        Zoom OAuth token, account recordings and VTT transcript downloads
+    /notion/v1   Notion search / pages / blocks used by the direct publisher
+
+Latencies come from STUB_* environment variables (see StubConfig) so the load
+benchmark can model slow or fast upstreams.
+
+Usage:
+    python benchmarks/stubs.py --port 8100
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+SPEAKERS = ("Alice", "Bob", "Chen Wei", "Dana")
+WORDS = (
+    "roadmap launch metrics budget hiring review customer feedback latency rollout "
+    "design migration deadline owner risk quarter demo release onboarding"
+).split()
+
+
+@dataclass
+class StubConfig:
+    llm_latency_ms: float = float(os.getenv("STUB_LLM_LATENCY_MS", "300"))
+    token_delay_ms: float = float(os.getenv("STUB_TOKEN_DELAY_MS", "2"))
+    completion_tokens: int = int(os.getenv("STUB_COMPLETION_TOKENS", "120"))
+    zoom_latency_ms: float = float(os.getenv("STUB_ZOOM_LATENCY_MS", "80"))
+    notion_latency_ms: float = float(os.getenv("STUB_NOTION_LATENCY_MS", "60"))
+    meeting_topic: str = os.getenv("STUB_MEETING_TOPIC", "AI Sharing分享")
+    meetings: int = int(os.getenv("STUB_MEETINGS", "5"))
+    cues_per_meeting: int = int(os.getenv("STUB_CUES_PER_MEETING", "400"))
+    calls: Dict[str, int] = field(default_factory=dict)
+
+    def count(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+
+config = StubConfig()
+
+
+def words(n: int, seed: int = 0) -> str:
+    return " ".join(WORDS[(seed + i * 7) % len(WORDS)] for i in range(n))
+
+
+# === OpenAI-compatible chat completions ===
+def resolve(schema: Dict, root: Dict) -> Dict:
+    if "$ref" in schema:
+        name = schema["$ref"].split("/")[-1]
+        return resolve(root.get("$defs", root.get("definitions", {}))[name], root)
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        return resolve(options[0] if options else schema["anyOf"][0], root)
+    return schema
+
+
+def supervisor_route(prompt: str) -> str:
+    """Walk the workflow the way the real supervisor would: zoom -> debrief -> (notion) -> end."""
+    def flag(label: str) -> bool:
+        match = re.search(rf"- {label}: (\w+)", prompt)
+        return bool(match) and match.group(1) == "Yes"
+
+    if not flag("Transcript available"):
+        return "zoom"
+    if not flag("Summary generated"):
+        return "debrief"
+    instruction = re.search(r"User Instruction: (.*)", prompt)
+    if instruction and "notion" in instruction.group(1).lower() and not flag("Notion page created"):
+        return "notion"
+    return "end"
+
+
+def tool_results(messages: List[Dict]) -> Dict:
+    """Values returned by earlier tool calls (e.g. the transcript_path from zoom_find_transcript)."""
+    found = {}
+    for message in messages:
+        if message.get("role") != "tool":
+            continue
+        try:
+            data = json.loads(message.get("content") or "{}")
+        except (TypeError, json.JSONDecodeError):
+            continue
+        if isinstance(data, dict):
+            found.update({k: v for k, v in data.items() if isinstance(v, (str, int))})
+    return found
+
+
+def generate(schema: Dict, root: Dict, name: str, context: Dict) -> Any:
+    schema = resolve(schema, root)
+    if "enum" in schema:
+        if name == "route":
+            return supervisor_route(context["prompt"])
+        return schema["enum"][0]
+    kind = schema.get("type", "object")
+    if kind == "object":
+        return {
+            key: generate(prop, root, key, context)
+            for key, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        item = resolve(schema.get("items", {}), root)
+        if item.get("type", "object") == "object":
+            return []
+        return [generate(item, root, name, context) for _ in range(3)]
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 1.0
+    if kind == "boolean":
+        return False
+    if name in context["tool_results"]:
+        return str(context["tool_results"][name])
+    if name == "next_step":
+        return f"Continue with the user's request: {context['instruction']}"
+    if name in ("summary", "todo", "feedback"):
+        return f"{name.capitalize()}: {words(config.completion_tokens, len(name))}"
+    return f"{name} {words(8)}"
+
+
+def last_user_text(messages: List[Dict]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            content = message.get("content")
+            if isinstance(content, list):
+                content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+            return content or ""
+    return ""
+
+
+def completion_message(body: Dict) -> Dict:
+    messages = body.get("messages", [])
+    prompt = last_user_text(messages)
+    instruction = re.search(r"User Instruction: (.*)", prompt)
+    context = {
+        "prompt": prompt,
+        "instruction": instruction.group(1).strip() if instruction else prompt[:200],
+        "tool_results": tool_results(messages),
+    }
+
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        schema = response_format["json_schema"]["schema"]
+        return {"role": "assistant", "content": json.dumps(generate(schema, schema, "", context), ensure_ascii=False)}
+
+    tools = {tool["function"]["name"]: tool["function"] for tool in body.get("tools", [])}
+    tool_choice = body.get("tool_choice")
+    forced = tool_choice.get("function", {}).get("name") if isinstance(tool_choice, dict) else None
+    call = None
+    if forced in tools:
+        schema = tools[forced].get("parameters", {})
+        call = (forced, generate(schema, schema, "", context))
+    elif "zoom_find_transcript" in tools and not context["tool_results"]:
+        call = ("zoom_find_transcript", {"meeting_name": config.meeting_topic})
+
+    if call:
+        return {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": call[0], "arguments": json.dumps(call[1], ensure_ascii=False)},
+            }],
+        }
+    return {"role": "assistant", "content": f"Done. {words(12)}"}
+
+
+openai_router = APIRouter()
+
+
+@openai_router.get("/models")
+async def list_models():
+    return {"object": "list", "data": [{"id": "stub", "object": "model"}]}
+
+
+@openai_router.post("/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    config.count("llm")
+    message = completion_message(body)
+    text = message.get("content") or json.dumps(message.get("tool_calls"))
+    completion_tokens = max(1, len(text) // 4)
+    prompt_tokens = sum(len(json.dumps(m.get("content") or "")) for m in body.get("messages", [])) // 4
+    base = {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "system_fingerprint": "stub",
+    }
+    finish_reason = "tool_calls" if message.get("tool_calls") else "stop"
+
+    await asyncio.sleep(config.llm_latency_ms / 1000)
+    if not body.get("stream"):
+        await asyncio.sleep(config.token_delay_ms * completion_tokens / 1000)
+        return {
+            **base,
+            "object": "chat.completion",
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    async def stream():
+        def chunk(delta: Dict, finish: Optional[str] = None) -> str:
+            data = {**base, "object": "chat.completion.chunk",
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish, "logprobs": None}]}
+            return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+        if message.get("tool_calls"):
+            calls = [{**call, "index": i} for i, call in enumerate(message["tool_calls"])]
+            yield chunk({"role": "assistant", "content": None, "tool_calls": calls})
+        else:
+            yield chunk({"role": "assistant", "content": ""})
+            content = message["content"]
+            for i in range(0, len(content), 4):
+                await asyncio.sleep(config.token_delay_ms / 1000)
+                yield chunk({"content": content[i:i + 4]})
+        yield chunk({}, finish_reason)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+# === Zoom ===
+def meeting_vtt(index: int) -> bytes:
+    lines = ["WEBVTT", ""]
+    t = 0.0
+    for i in range(config.cues_per_meeting):
+        start, end = t, t + 4.0 + (i % 3)
+        t = end + (0.5 if i % 25 else 8.0)
+        stamp = lambda s: f"{int(s // 3600):02d}:{int(s % 3600 // 60):02d}:{s % 60:06.3f}"
+        lines += [str(i + 1), f"{stamp(start)} --> {stamp(end)}",
+                  f"{SPEAKERS[(i + index) % len(SPEAKERS)]}: {words(14, i + index)}", ""]
+    return "\n".join(lines).encode("utf-8")
+
+
+def zoom_meetings(base_url: str) -> List[Dict]:
+    meetings = []
+    for i in range(config.meetings):
+        vtt = meeting_vtt(i)
+        meetings.append({
+            "uuid": f"stub-uuid-{i}==",
+            "id": 81000000000 + i,
+            "topic": config.meeting_topic if i == 0 else f"{config.meeting_topic} #{i}",
+            "start_time": f"2026-10-{10 + i % 9:02d}T09:00:00Z",
+            "recording_files": [{
+                "id": f"file-{i}",
+                "file_type": "TRANSCRIPT",
+                "file_size": len(vtt),
+                "status": "completed",
+                "recording_end": f"2026-10-{10 + i % 9:02d}T10:00:00Z",
+                "download_url": f"{base_url}/zoom/download/{i}",
+            }],
+        })
+    return meetings
+
+
+zoom_router = APIRouter()
+
+
+@zoom_router.post("/oauth/token")
+async def zoom_token():
+    config.count("zoom_token")
+    await asyncio.sleep(config.zoom_latency_ms / 1000)
+    return {"access_token": f"stub-{uuid.uuid4().hex}", "token_type": "bearer", "expires_in": 3600}
+
+
+@zoom_router.get("/v2/accounts/me/recordings")
+async def zoom_recordings(request: Request):
+    config.count("zoom_recordings")
+    await asyncio.sleep(config.zoom_latency_ms / 1000)
+    return {"meetings": zoom_meetings(str(request.base_url).rstrip("/")), "next_page_token": ""}
+
+
+@zoom_router.get("/v2/meetings/{meeting_uuid:path}/recordings")
+async def zoom_meeting_recordings(meeting_uuid: str, request: Request):
+    config.count("zoom_recordings")
+    await asyncio.sleep(config.zoom_latency_ms / 1000)
+    for meeting in zoom_meetings(str(request.base_url).rstrip("/")):
+        if meeting_uuid in (meeting["uuid"], str(meeting["id"])):
+            return meeting
+    return JSONResponse(status_code=404, content={"code": 3301, "message": "No recording"})
+
+
+@zoom_router.get("/download/{index}")
+async def zoom_download(index: int):
+    config.count("zoom_download")
+    await asyncio.sleep(config.zoom_latency_ms / 1000)
+    return PlainTextResponse(meeting_vtt(index).decode("utf-8"), media_type="text/vtt")
+
+
+# === Notion ===
+notion_router = APIRouter()
+
+
+@notion_router.get("/users/me")
+async def notion_me():
+    return {"object": "user", "id": "stub-bot", "type": "bot"}
+
+
+@notion_router.post("/search")
+async def notion_search(request: Request):
+    config.count("notion_search")
+    body = await request.json()
+    await asyncio.sleep(config.notion_latency_ms / 1000)
+    title = body.get("query") or "Meeting Notes"
+    return {"results": [{
+        "object": "page",
+        "id": f"page-{abs(hash(title)) % 10 ** 8}",
+        "properties": {"title": {"type": "title", "title": [{"plain_text": title}]}},
+    }]}
+
+
+@notion_router.get("/databases/{database_id}")
+async def notion_database(database_id: str):
+    return {"object": "database", "id": database_id, "properties": {"Name": {"type": "title"}}}
+
+
+@notion_router.post("/pages")
+async def notion_create_page():
+    config.count("notion_pages")
+    await asyncio.sleep(config.notion_latency_ms / 1000)
+    return {"object": "page", "id": str(uuid.uuid4())}
+
+
+@notion_router.patch("/blocks/{block_id}/children")
+async def notion_append_blocks(block_id: str):
+    config.count("notion_blocks")
+    await asyncio.sleep(config.notion_latency_ms / 1000)
+    return {"object": "list", "results": []}
+
+
+app = FastAPI(title="Meeting Agent stub services")
+app.include_router(openai_router, prefix="/openai/v1")
+app.include_router(zoom_router, prefix="/zoom")
+app.include_router(notion_router, prefix="/notion/v1")
+
+
+@app.get("/stats")
+async def stats():
+    """Calls received per upstream, so a benchmark can report e.g. LLM calls per query"""
+    return config.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
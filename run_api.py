@@ -1,13 +1,34 @@
 #!/usr/bin/env python3
 """
-Simple script to run the Meeting Agent API locally
+Simple script to run the Meeting Agent API
+
+    python run_api.py                        # development: one process with auto-reload
+    python run_api.py --prod                 # production: API_WORKERS processes (default one per CPU core)
+    python run_api.py --prod --workers 4
 """
 
+import argparse
 import uvicorn
 import os
 from pathlib import Path
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the Meeting Agent API")
+    parser.add_argument("--prod", action="store_true",
+                        help="Production mode: several worker processes, no auto-reload")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes in production mode (default: API_WORKERS, 0 = one per CPU core)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    return parser.parse_args()
+
+def worker_count(requested):
+    from src.config.settings import settings
+    workers = requested if requested is not None else settings.API_WORKERS
+    return workers if workers > 0 else os.cpu_count() or 1
+
 def main():
+    args = parse_args()
     # Check if .env file exists
     if not Path(".env").exists():
         print("⚠️  Warning: .env file not found!")
@@ -29,16 +50,34 @@ def main():
         print()
     
     print("🚀 Starting Meeting Agent API...")
-    print("📖 API Documentation will be available at: http://localhost:8000/docs")
-    print("🔍 Health check: http://localhost:8000/api/v1/health")
+    print(f"📖 API Documentation will be available at: http://localhost:{args.port}/docs")
+    print(f"🔍 Health check: http://localhost:{args.port}/api/v1/health")
     print("⏹️  Press Ctrl+C to stop the server")
     print()
-    
+
+    if args.prod:
+        # Workers share the Zoom token, downloads, digests and results through the
+        # cache database (CACHE_DB_PATH) and the transcript directory
+        from src.config.settings import settings
+        workers = worker_count(args.workers)
+        print(f"🏭 Production mode with {workers} worker processes")
+        # Admission and LLM limits apply per process, the totals grow with the worker count
+        print(f"   up to {workers * settings.MAX_INFLIGHT_RUNS} pipeline runs (MAX_INFLIGHT_RUNS={settings.MAX_INFLIGHT_RUNS} per worker)")
+        print(f"   up to {workers * settings.LLM_CONCURRENCY} concurrent LLM calls (LLM_CONCURRENCY={settings.LLM_CONCURRENCY} per worker)")
+        uvicorn.run(
+            "src.main:app",
+            host=args.host,
+            port=args.port,
+            workers=workers,
+            log_level="info"
+        )
+        return
+
     # Run the FastAPI server
     uvicorn.run(
         "src.main:app",
-        host="0.0.0.0",
-        port=8000,
+        host=args.host,
+        port=args.port,
         reload=True,
         log_level="info"
     )
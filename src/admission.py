@@ -0,0 +1,153 @@
+import asyncio
+import math
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Deque
+from loguru import logger
+from src.config.settings import settings
+
+
+class Rejected(Exception):
+    """The service is saturated; the client should retry after `retry_after` seconds."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """One admitted run. Releasing is idempotent, so every exit path may call it."""
+
+    def __init__(self, controller: "AdmissionController", waiting: bool = False):
+        self._controller = controller
+        self._started = time.monotonic()
+        self._released = False
+        self._waiting = waiting
+
+    def done_waiting(self):
+        """The identical run this ticket waited for is over; the ticket now covers a run or a replay."""
+        if self._waiting:
+            self._waiting = False
+            self._controller.waiting -= 1
+
+    def release(self):
+        if self._released:
+            return
+        self._released = True
+        self.done_waiting()
+        self._controller._release(time.monotonic() - self._started)
+
+
+class AdmissionController:
+    """
+    Caps the number of pipeline runs in flight.
+
+    Up to `max_in_flight` runs execute at once, up to `max_queue` more wait
+    (FIFO) for at most `max_wait` seconds. Anything beyond that is rejected
+    right away so an overload does not slow every accepted run down.
+
+    A query waiting for an identical run to finish (see the in-flight registry) takes a
+    slot like a run, and at most `max_waiters` such queries wait at once.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, max_wait: float, max_waiters: int = 0):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.max_waiters = max_waiters
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Moving average of run duration, used for the Retry-After estimate
+        self._avg_run_seconds = 30.0
+
+    def depth(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        backlog = self.depth() + 1
+        return max(1, math.ceil(self._avg_run_seconds * backlog / self.max_in_flight))
+
+    async def acquire(self, waiting: bool = False) -> Ticket:
+        """A ticket for a run, or with `waiting` for a query that first waits for an identical run."""
+        if not waiting:
+            return await self._acquire(False)
+        if self.waiting >= self.max_waiters:
+            self.rejected += 1
+            raise Rejected("Too many queries waiting for an identical query", self.retry_after())
+        # Counted before queueing for a slot, so concurrent requests cannot all pass the check
+        self.waiting += 1
+        try:
+            return await self._acquire(True)
+        except BaseException:
+            self.waiting -= 1
+            raise
+
+    async def _acquire(self, waiting: bool) -> Ticket:
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return Ticket(self, waiting)
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise Rejected("Too many queries in flight", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait ran out, keep it
+                return Ticket(self, waiting)
+            self._waiters.remove(waiter)
+            waiter.cancel()
+            self.rejected += 1
+            raise Rejected("Timed out waiting for a free slot", self.retry_after())
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(None)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+        return Ticket(self, waiting)
+
+    def _release(self, run_seconds):
+        if run_seconds is not None:
+            self._avg_run_seconds = 0.8 * self._avg_run_seconds + 0.2 * run_seconds
+        # Hand the slot straight to the oldest waiter, in_flight stays the same
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.depth(),
+            "waiting_for_identical": self.waiting,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "max_wait_seconds": self.max_wait,
+            "max_waiters": self.max_waiters,
+            "rejected": self.rejected,
+            "avg_run_seconds": round(self._avg_run_seconds, 2),
+        }
+
+
+@lru_cache()
+def get_admission_controller() -> AdmissionController:
+    logger.info(
+        f"🚦 Admission control: {settings.MAX_INFLIGHT_RUNS} runs in flight, "
+        f"{settings.ADMISSION_QUEUE_SIZE} queued for up to {settings.ADMISSION_MAX_WAIT_SECONDS}s"
+    )
+    return AdmissionController(
+        max_in_flight=settings.MAX_INFLIGHT_RUNS,
+        max_queue=settings.ADMISSION_QUEUE_SIZE,
+        max_wait=settings.ADMISSION_MAX_WAIT_SECONDS,
+        max_waiters=settings.INFLIGHT_MAX_WAITERS,
+    )
@@ -1,24 +1,27 @@
-from typing import Dict
-from langgraph.constants import Send
-from langgraph.graph import START, END, StateGraph
-from langgraph.types import interrupt, Command
-from typing_extensions import TypedDict
-from src.agents.zoom_agent import zoom_agent_node
-from src.agents.notion_agent import notion_agent_node
+import asyncio
+import hashlib
+import re
+from typing import Dict, List, Optional
+from pathlib import Path
 from src.config.settings import settings
-from openai import OpenAI
-from src.tools.debrief_tools import create_summary, create_feedback, create_todo
-from langgraph.prebuilt import create_react_agent
-from langchain_openai import ChatOpenAI
-from utils.get_transcript import load_transcript
+from src.deadline import current_deadline
+from src.llm import get_chat_model
+from src.result_cache import requested_tasks
+from src.tools import zoom_download_cache
+from src.tools.digest_tools import get_or_build_digests, format_digests, split_chunks, digest_chunk, spread
+from utils.blob_store import offload, offload_fields, resolve_fields
+from utils.get_transcript import aload_transcript
+from utils.kv_store import get_kv_store
+from utils.transcript_index import get_transcript_index
+from utils.transcript_io import run_io
+from utils.vtt import load_cues, render_cue
+from utils.meeting_analytics import compute_analytics, format_analytics
 from pydantic import BaseModel
-from langchain_core.messages import HumanMessage, SystemMessage
 
-client = ChatOpenAI(
-    model="gpt-4o", 
-    api_key=settings.OPENAI_API_KEY,
-    base_url=settings.OPENAI_BASE_URL,
-)
+DEBRIEF_MODEL = settings.DEBRIEF_MODEL
+
+# Outputs kept in the graph state as blob handles once they are large
+DEBRIEF_FIELDS = ("summary", "todo", "feedback")
 
 class DebriefAgentOutput(BaseModel):
     summary: str
@@ -26,21 +29,280 @@ class DebriefAgentOutput(BaseModel):
     feedback: str
     step_summary: str
 
-debrief_agent = create_react_agent(
-    model=client,
-    tools=[create_summary, create_feedback, create_todo],
-    prompt=(
-        "You are a helpful assistant that can create summaries, feedback, and todos from a transcript. "
-        "Use the create_summary tool to generate meeting summaries, "
-        "create_todo tool to extract action items, and "
-        "create_feedback tool to provide constructive feedback. "
-        "Always analyze the user's request to determine which tools to use. "
-        "For the step_summary field, describe what you accomplished for the user (e.g., 'Generated meeting summary' or 'Extracted action items from transcript'), "
-        "not the actual content of the summary, todo, or feedback."
-    ),
-    debug=True,
-    response_format=DebriefAgentOutput,
+PRECOMPUTED_NAMESPACE = "precomputed_debriefs"
+
+# Task used when a debrief is computed ahead of time, before anyone asked for it
+PRECOMPUTE_TASK = "Produce all three: a meeting summary, a todo list of action items, and constructive feedback."
+FULL_DEBRIEF_RE = re.compile(r"\bdebrief|复盘", re.IGNORECASE)
+
+
+async def run_debrief(transcript: str, task: str, model: str = DEBRIEF_MODEL) -> DebriefAgentOutput:
+    output_prompt = [
+        {"role": "system", "content": "You are a helpful assistant for meeting debriefs. Return JSON. "
+                                      "Participants, meeting duration and engagement metrics (talk time, "
+                                      "participation balance, interruptions) are measured separately, "
+                                      "do not estimate them."},
+        {"role": "user", "content": f"Current task: {task}\n\n\n Transcript:\n{transcript}"}
+    ]
+
+    result = await get_chat_model(model).ainvoke(
+        output_prompt,
+        response_format=DebriefAgentOutput  # ensures structured output
+    )
+    print("Result: ", result)
+
+    # Get the parsed structured output
+    return result.additional_kwargs["parsed"]
+
+
+async def precompute_debrief(transcript_path: str) -> DebriefAgentOutput:
+    """Run the full debrief for a transcript and keep it for the next debrief_agent_node."""
+    parsed = await compose_debrief(transcript_path, PRECOMPUTE_TASK)
+    parsed.step_summary = "Loaded pre-computed meeting debrief (summary, todo and feedback)"
+    if not run_degraded():
+        await run_io(get_kv_store().set, PRECOMPUTED_NAMESPACE, Path(transcript_path).stem, parsed.model_dump())
+    return parsed
+
+
+async def get_precomputed_debrief(transcript_path: str) -> Optional[DebriefAgentOutput]:
+    data = await run_io(get_kv_store().get, PRECOMPUTED_NAMESPACE, Path(transcript_path).stem)
+    return DebriefAgentOutput(**data) if data else None
+
+
+def wants_full_debrief(user_message: str) -> bool:
+    """Asks for summary, todo and feedback together (or a plain debrief), which is what PRECOMPUTE_TASK produced."""
+    tasks = set(requested_tasks(user_message)) - {"notion"}
+    return tasks >= {"summary", "todo", "feedback"} or (tasks == {"debrief"} and bool(FULL_DEBRIEF_RE.search(user_message)))
+
+
+async def debrief_transcript(transcript_path: Optional[str], task: str, user_message: str = "") -> DebriefAgentOutput:
+    # The pre-computed debrief answers the generic task only; anything narrower is composed
+    # for its own task (from the chunk digests the pre-computation already built)
+    if transcript_path and wants_full_debrief(user_message):
+        precomputed = await get_precomputed_debrief(transcript_path)
+        if precomputed:
+            print("[DEBRIEF AGENT] ⚡ Using pre-computed debrief")
+            return precomputed
+    return await compose_debrief(transcript_path, task)
+
+
+def run_degraded() -> bool:
+    """Whether the current run already cut something short to meet its deadline."""
+    deadline = current_deadline.get()
+    return deadline is not None and bool(deadline.degraded)
+
+
+def deadline_short() -> bool:
+    """Whether the current run is too close to its deadline for the full-quality path."""
+    deadline = current_deadline.get()
+    return deadline is not None and deadline.short()
+
+
+async def compose_debrief(transcript_path: Optional[str], task: str) -> DebriefAgentOutput:
+    # Close to the request deadline: the fast model, and digests of only a few new chunks
+    deadline = current_deadline.get()
+    degraded = deadline is not None and deadline.short()
+    model = settings.DEADLINE_FAST_MODEL if degraded else DEBRIEF_MODEL
+    if degraded:
+        deadline.degrade(f"debrief with {model}")
+
+    if not transcript_path:
+        return await run_debrief("No transcript provided", task, model)
+
+    transcript = await aload_transcript(transcript_path)
+    if len(transcript) <= settings.DIGEST_CHUNK_CHARS:
+        return await run_debrief(transcript, task, model)
+
+    # Compose the task from the per-chunk digests; the raw text is only read once per meeting
+    max_new = settings.DEADLINE_DEGRADED_CHUNKS if degraded else None
+    digests = await get_or_build_digests(transcript_path, transcript, max_new=max_new)
+    total = len(split_chunks(transcript, settings.DIGEST_CHUNK_CHARS)) if degraded else len(digests)
+    print(f"[DEBRIEF AGENT] 🧾 Composing from {len(digests)} chunk digests")
+    if len(digests) < total:
+        deadline.degrade(f"debrief from {len(digests)} of {total} transcript segments")
+        task = f"{task}\n(Only {len(digests)} of {total} segments were digested in time; say the debrief is partial.)"
+    return await run_debrief(format_digests(digests), f"{task}\n(The transcript is given as per-segment notes.)", model)
+
+
+# === Locally computed speaker and engagement analytics ===
+def transcript_analytics(transcript_path: str) -> Optional[Dict]:
+    if not Path(transcript_path).exists():
+        return None
+    return compute_analytics(load_cues(transcript_path))
+
+
+async def attach_analytics(parsed: DebriefAgentOutput, transcript_path: Optional[str]) -> Optional[Dict]:
+    """Append measured participants/duration to the summary and engagement numbers to the feedback."""
+    if not transcript_path:
+        return None
+    analytics = await run_io(transcript_analytics, transcript_path)
+    if analytics:
+        block = format_analytics(analytics)
+        parsed.summary = f"{parsed.summary}\n\nMeeting stats (measured from the transcript):\n{block}"
+        if parsed.feedback:
+            parsed.feedback = f"{parsed.feedback}\n\nEngagement metrics (measured from the transcript):\n{block}"
+    return analytics
+
+
+# === Incremental debrief for growing or regenerated transcripts ===
+INCREMENTAL_NAMESPACE = "incremental_debriefs"
+REFRESH_RE = re.compile(
+    r"\b(refresh(ed|ing)?|so far|live|still running)\b|\b(update|re-?run) (the )?(debrief|summary|notes)\b"
+    r"|刷新|更新|目前为止",
+    re.IGNORECASE,
+)
+
+
+def wants_incremental(state: Dict) -> bool:
+    return bool(state.get("incremental")) or bool(REFRESH_RE.search(state.get("last_user_message", "")))
+
+
+def cues_fingerprint(cues: List[Dict]) -> str:
+    digest = hashlib.sha1()
+    for cue in cues:
+        digest.update(render_cue(cue).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class MergedDebrief(BaseModel):
+    summary: str
+    todo: str
+    feedback: str
+
+
+async def merge_new_cues(previous: Dict, new_cues: List[Dict], task: str) -> MergedDebrief:
+    """Fold newly appended cues into an existing summary/todo/feedback."""
+    # Close to the request deadline: the fast model, and digests of only a few new chunks (as compose_debrief)
+    degraded = deadline_short()
+    model = settings.DEADLINE_FAST_MODEL if degraded else DEBRIEF_MODEL
+    if degraded:
+        current_deadline.get().degrade(f"debrief update with {model}")
+
+    new_text = "\n".join(render_cue(cue) for cue in new_cues)
+    if len(new_text) > settings.DIGEST_CHUNK_CHARS:
+        chunks = split_chunks(new_text, settings.DIGEST_CHUNK_CHARS)
+        total = len(chunks)
+        if degraded and total > settings.DEADLINE_DEGRADED_CHUNKS:
+            chunks = spread(chunks, settings.DEADLINE_DEGRADED_CHUNKS)
+            current_deadline.get().degrade(f"debrief update from {len(chunks)} of {total} new segments")
+            task = f"{task}\n(Only {len(chunks)} of {total} new segments were digested in time; say the update is partial.)"
+        digests = await asyncio.gather(*(digest_chunk(chunk["text"]) for chunk in chunks))
+        new_text = format_digests([
+            {**chunk, "digest": digest.model_dump()} for chunk, digest in zip(chunks, digests)
+        ])
+    result = await get_chat_model(model).ainvoke(
+        [
+            {"role": "system", "content": "You update meeting debriefs as a meeting transcript grows. Return JSON."},
+            {"role": "user", "content": (
+                f"Current task: {task}\n\n"
+                f"Existing debrief of the earlier part of the meeting:\n"
+                f"Summary:\n{previous['summary']}\n\nTodo:\n{previous['todo']}\n\nFeedback:\n{previous['feedback']}\n\n"
+                f"Newly appended transcript:\n{new_text}\n\n"
+                "Return the complete updated summary, todo and feedback covering the whole meeting so far."
+            )},
+        ],
+        response_format=MergedDebrief,
+    )
+    return result.additional_kwargs["parsed"]
+
+
+def incremental_source_key(state: Dict, transcript_path: str) -> str:
+    """
+    Key of a meeting's incremental debrief. Transcript files are named by content hash, so a
+    grown transcript has a new path; a downloaded one is keyed by its Zoom meeting instance.
+    """
+    entry = zoom_download_cache.find_by_transcript_path(transcript_path)
+    if entry:
+        return str(entry.get("uuid") or entry.get("file_id"))
+    return str(state.get("meeting_id") or Path(transcript_path).stem)
+
+
+async def incremental_debrief(source_key: str, transcript_path: str, task: str) -> DebriefAgentOutput:
+    """
+    Debrief only the cues appended since the last run for this meeting and merge them into
+    the stored result. Falls back to a full debrief when the earlier cues changed.
+    """
+    cues = await run_io(load_cues, transcript_path)
+    stored = await run_io(get_kv_store().get, INCREMENTAL_NAMESPACE, source_key)
+
+    offset = stored["cue_offset"] if stored else 0
+    if stored and (offset > len(cues) or cues_fingerprint(cues[:offset]) != stored["prefix_fingerprint"]):
+        print("[DEBRIEF AGENT] ♻️ Transcript was rewritten, starting the incremental debrief over")
+        stored, offset = None, 0
+    new_cues = cues[offset:]
+
+    if stored is None:
+        parsed = await compose_debrief(transcript_path, task)
+        outputs = {"summary": parsed.summary, "todo": parsed.todo, "feedback": parsed.feedback}
+        step_summary = parsed.step_summary
+    elif not new_cues:
+        print("[DEBRIEF AGENT] ✅ No new cues since the last debrief")
+        outputs = {field: stored[field] for field in ("summary", "todo", "feedback")}
+        step_summary = "Debrief is already up to date with the transcript"
+    else:
+        print(f"[DEBRIEF AGENT] ➕ Debriefing {len(new_cues)} new cues (from cue {offset})")
+        merged = await merge_new_cues(stored, new_cues, task)
+        outputs = merged.model_dump()
+        step_summary = f"Updated the debrief with {len(new_cues)} new transcript cues"
+
+    if run_degraded():
+        # A partial or fast-model debrief must not become the baseline later runs only add to
+        print("[DEBRIEF AGENT] ⏱️ Debrief was degraded by the deadline, not storing it for incremental updates")
+    else:
+        await run_io(get_kv_store().set, INCREMENTAL_NAMESPACE, source_key, {
+            **outputs,
+            "cue_offset": len(cues),
+            "prefix_fingerprint": cues_fingerprint(cues),
+            "transcript_path": transcript_path,
+        })
+    return DebriefAgentOutput(**outputs, step_summary=step_summary)
+
+
+# === Retrieval for question-style queries ===
+QUESTION_RE = re.compile(
+    r"[?？]|^\s*(what|why|how|when|who|which|where|did|does|do|is|are|was|were|can|could|should)\b"
+    r"|什么|为什么|怎么|如何|哪|谁|吗|是否|有没有",
+    re.IGNORECASE,
 )
+DEBRIEF_TASK_RE = re.compile(r"summar|todo|to-do|action item|feedback|总结|摘要|待办|反馈", re.IGNORECASE)
+
+
+def is_question(message: str) -> bool:
+    """A question about the meeting content, rather than a request for a full debrief."""
+    return bool(QUESTION_RE.search(message)) and not DEBRIEF_TASK_RE.search(message)
+
+
+def retrieve_passages(transcript_path: str, query: str) -> List[Dict]:
+    path = Path(transcript_path)
+    if not path.exists():
+        return []
+    index = get_transcript_index()
+    index.add_transcript(path)  # no-op when already indexed
+    return index.search(query, k=settings.RETRIEVAL_TOP_K, docs=[path.stem])
+
+
+async def answer_from_passages(transcript_path: str, question: str, task: str) -> Optional[DebriefAgentOutput]:
+    """Answer a question from the top-k BM25 passages instead of the whole transcript."""
+    passages = await run_io(retrieve_passages, transcript_path, question)
+    if not passages:
+        return None
+    print(f"[DEBRIEF AGENT] 🔎 Answering from {len(passages)} retrieved passages")
+    excerpts = "\n\n".join(
+        f"[Excerpt {p['ordinal'] + 1}]\n{p['text']}"
+        for p in sorted(passages, key=lambda p: p["ordinal"])
+    )
+    task = (
+        f"{task}\n\nAnswer the user's question: {question}\n"
+        "Use only the transcript excerpts below. Put the answer in the summary field, "
+        "and leave todo and feedback empty unless the question asks for them."
+    )
+    model = DEBRIEF_MODEL
+    if deadline_short():
+        model = settings.DEADLINE_FAST_MODEL
+        current_deadline.get().degrade(f"answer with {model}")
+    return await run_debrief(excerpts, task, model)
+
 
 async def debrief_agent_node(state: Dict) -> Dict:
     print("="*50)
@@ -49,7 +311,6 @@ async def debrief_agent_node(state: Dict) -> Dict:
     
     user_message = state.get("last_user_message", "")
     transcript_path = state.get("transcript_path")
-    transcript = load_transcript(transcript_path) if transcript_path else "No transcript provided"
 
     # # === First call: figure out intent ===
     # intent_prompt = [
@@ -72,27 +333,74 @@ async def debrief_agent_node(state: Dict) -> Dict:
     #     task = "Produce all three: summary, todo, feedback."
 
     current_step = state.get("next_step", "")
-    output_prompt = [
-        {"role": "system", "content": "You are a helpful assistant for meeting debriefs. Return JSON."},
-        {"role": "user", "content": f"Current task: {current_step}\n\n\n Transcript:\n{transcript}"}
-    ]
-
-    result = await client.ainvoke(
-        output_prompt,
-        response_format=DebriefAgentOutput  # ensures structured output
-    )
-    print("Result: ", result)
-
-    # Get the parsed structured output
-    parsed: DebriefAgentOutput = result.additional_kwargs["parsed"]
+    parsed = None
+    if transcript_path and is_question(user_message):
+        parsed = await answer_from_passages(transcript_path, user_message, current_step)
+    elif transcript_path and wants_incremental(state):
+        source_key = await run_io(incremental_source_key, state, transcript_path)
+        parsed = await incremental_debrief(source_key, transcript_path, current_step)
+    analytics = None
+    if parsed is None:
+        parsed = await debrief_transcript(transcript_path, current_step, user_message)
+    if not is_question(user_message):
+        analytics = await attach_analytics(parsed, transcript_path)
 
     print("[DEBRIEF AGENT] Step Summary:", parsed.step_summary)
     print("[DEBRIEF AGENT] Summary:", parsed.summary)
 
     return {
-        **state,
-        "summary": parsed.summary,
-        "todo": parsed.todo,
-        "feedback": parsed.feedback,
+        "summary": await offload(parsed.summary),
+        "todo": await offload(parsed.todo),
+        "feedback": await offload(parsed.feedback),
+        "analytics": await offload(analytics),
         "step_summary": [parsed.step_summary]
-    }
\ No newline at end of file
+    }
+
+
+# === Multi-meeting fan-out ===
+async def debrief_meeting_node(state: Dict) -> Dict:
+    """
+    One parallel branch of a multi-meeting debrief (dispatched with Send).
+    Only returns reducer keys, so branches running in the same step never conflict.
+    """
+    meeting = state["meeting"]
+    print(f"[DEBRIEF AGENT] 🔀 Debriefing meeting: {meeting.get('topic')}")
+    parsed = await debrief_transcript(
+        meeting.get("transcript_path"), state.get("next_step", ""), state.get("last_user_message", "")
+    )
+    await attach_analytics(parsed, meeting.get("transcript_path"))
+    return {
+        "meeting_debriefs": [await offload_fields({
+            **meeting,
+            "fanout_id": state.get("fanout_id"),
+            "summary": parsed.summary,
+            "todo": parsed.todo,
+            "feedback": parsed.feedback,
+        }, DEBRIEF_FIELDS)]
+    }
+
+
+async def merge_debriefs_node(state: Dict) -> Dict:
+    """Combine the per-meeting branch results into the single summary/todo/feedback fields."""
+    # Only this fan-out's entries: a branch skipped at the deadline leaves none, and must not
+    # pull in another meeting's debrief from an earlier fan-out
+    debriefs = [
+        await resolve_fields(d, DEBRIEF_FIELDS)
+        for d in state.get("meeting_debriefs", [])
+        if d.get("fanout_id") == state.get("fanout_id")
+    ]
+    debriefs.sort(key=lambda d: d.get("start_time") or "")
+
+    def combine(field: str) -> str:
+        return "\n\n".join(
+            f"## {d.get('topic')} ({d.get('start_time') or 'unknown date'})\n{d.get(field, '')}"
+            for d in debriefs
+        )
+
+    print(f"[DEBRIEF AGENT] 🧩 Merged debriefs of {len(debriefs)} meetings")
+    return {
+        "summary": await offload(combine("summary")),
+        "todo": await offload(combine("todo")),
+        "feedback": await offload(combine("feedback")),
+        "step_summary": [f"Debriefed {len(debriefs)} meetings in parallel and merged the results"],
+    }
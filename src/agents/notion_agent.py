@@ -1,61 +1,94 @@
 from typing import Dict
-import pandas as pd
-from typing import List
-from difflib import SequenceMatcher
+import httpx
 from pydantic import BaseModel
-from langchain.chat_models import init_chat_model
-from langchain.tools import Tool
-from langgraph.prebuilt import create_react_agent
-from langgraph.graph import StateGraph, START, END
-from typing_extensions import TypedDict
-import time
-from openai import OpenAI
+from src.llm import get_chat_model
 from src.tools.notion_tools import get_notion_tools
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from src.tools.notion_publisher import IncompletePageError, PageMaybeCreatedError, publish_debrief
+from src.tools.notion_cache import known_parents
+from utils.blob_store import resolve_fields
 from src.config.settings import settings
 
-client = ChatOpenAI(
-    model="gpt-4o",
-    api_key=settings.OPENAI_API_KEY,
-    base_url=settings.OPENAI_BASE_URL,
-)
+NOTION_MODEL = settings.NOTION_MODEL
 
 class NotionAgentOutput(BaseModel):
     notion_parent_id: str
     step_summary: str
 
 
-import asyncio
-from typing import Dict
-
 async def notion_agent_node(state: Dict) -> Dict:
     print("="*50)
     print("🤖 NOTION AGENT")
     print("="*50)
+    # The debrief outputs are the only large values this node needs
+    state = await resolve_fields(state, ("summary", "todo", "feedback"))
+
+    # Deterministic path: build blocks locally and call the Notion API directly
+    try:
+        published = await publish_debrief(state)
+    except IncompletePageError as e:
+        # The page exists, so the agent must not create another one
+        step_summary = (
+            f"Created the Notion page but added only {e.appended} of {e.total} debrief blocks "
+            f"before Notion failed: {e.error}"
+        )
+        print("[NOTION AGENT] ⚠️", step_summary)
+        return {
+            "notion_parent_id": e.page["id"],
+            "route": "end",  # Always end after notion
+            "step_summary": [step_summary]
+        }
+    except PageMaybeCreatedError as e:
+        # Retrying through the agent could publish the debrief twice
+        step_summary = (
+            f"Notion did not confirm the page '{e.title}' ({e.error}); it may have been created, "
+            "check the parent page before publishing again"
+        )
+        print("[NOTION AGENT] ⚠️", step_summary)
+        return {
+            "notion_parent_id": e.parent["id"],
+            "route": "end",  # Always end after notion
+            "step_summary": [step_summary]
+        }
+    except httpx.HTTPError as e:
+        # Failed before or while creating the page (4xx, or never sent): nothing was published
+        print(f"[NOTION AGENT] ⚠️ Direct publish failed, falling back to agent: {e}")
+        published = None
+    if published:
+        step_summary = f"Published meeting results to Notion under '{published['target_name']}'"
+        print("[NOTION AGENT] Step Summary:", step_summary)
+        return {
+            "notion_parent_id": published["page"]["id"],
+            "route": "end",  # Always end after notion
+            "step_summary": [step_summary]
+        }
+    print("[NOTION AGENT] Target page is ambiguous, letting the agent decide")
     # Run the async get_notion_tools once synchronously
     notion_tools = await get_notion_tools()
 
     # Create the agent
+    from langgraph.prebuilt import create_react_agent
     notion_agent = create_react_agent(
-        model=client,
+        model=get_chat_model(NOTION_MODEL),
         tools=notion_tools,
-        prompt="You are a helpful assistant that can create pages in Notion. Always call for search tool to find the relevant page ids/details first. Then call create tool to create the page if needed. "
+        prompt="You are a helpful assistant that can create pages in Notion. Always call for search tool to find the relevant page ids/details first, unless the parent id is already given below. Then call create tool to create the page if needed. "
                "For the step_summary field, describe what you accomplished for the user (e.g., 'Created Notion page for meeting results' or 'Published meeting summary to Notion'), "
                "not the actual page content or Notion page details.",
         # debug=True,
         response_format=NotionAgentOutput,
     )
     user_message = state.get("last_user_message")
+    # Ids resolved by earlier publishes, so the agent can skip searching for them
+    parents = await known_parents()
+    known = "\n".join(f"- '{name}': {parent['type']} id {parent['id']}" for name, parent in parents.items())
+    hint = f"\nKnown Notion parents (use the id directly instead of searching):\n{known}" if known else ""
     # Run the agent synchronously
     result = await notion_agent.ainvoke(
-        {"messages": [{"role": "user", "content": f"Current task: {state.get('next_step')},summary: {state.get('summary')},todo: {state.get('todo')},feedback: {state.get('feedback')}"}]}
+        {"messages": [{"role": "user", "content": f"Current task: {state.get('next_step')},summary: {state.get('summary')},todo: {state.get('todo')},feedback: {state.get('feedback')}{hint}"}]}
     )
     notion_parent_id = result['structured_response'].notion_parent_id
     step_summary = result['structured_response'].step_summary
     print("[NOTION AGENT] Step Summary:", step_summary)
     updated = {
-        **state,
         "notion_parent_id": notion_parent_id,
         "route": "end",  # Always end after notion
         "step_summary": [step_summary]
@@ -1,15 +1,12 @@
-from typing import Dict, Literal
+import uuid
+from functools import lru_cache
+from typing import Dict, List, Literal
 from pydantic import BaseModel
-from langchain_openai import ChatOpenAI
-from langgraph.prebuilt import create_react_agent
+from src.budget import current_budget
+from src.llm import get_chat_model
 from src.config.settings import settings
-from typing import List
 
-client = ChatOpenAI(
-    model="o3",
-    api_key=settings.OPENAI_API_KEY,
-    base_url=settings.OPENAI_BASE_URL,
-)
+SUPERVISOR_MODEL = settings.SUPERVISOR_MODEL
 
 class SupervisorAgentOutput(BaseModel):
     route: Literal["zoom", "debrief", "notion", "end"]
@@ -17,44 +14,65 @@ class SupervisorAgentOutput(BaseModel):
     reasoning: str
     step_summary: str
 
-supervisor_agent = create_react_agent(
-    model=client,
-    tools=[],
-    prompt=(
-        "You are a supervisor agent that acts as a router and decision maker for a meeting agent workflow. "
-        "Your job is to analyze the current state and user request to determine the next step and which agent should handle it. "
-        "You have access to the step_summary list, user's last message, and current workflow state. "
-        "Make intelligent routing decisions based on what has been completed and what the user is requesting. "
-        "You are responsible for generating the next_step field, which should clearly describe what the next agent will do for the user. "
-        "For the step_summary field, describe what you accomplished for the user (e.g., 'Determined next step: route to debrief agent' or 'Analyzed workflow state and routed to zoom agent'), "
-        "not the detailed reasoning or internal decision process."
-    ),
-    response_format=SupervisorAgentOutput,
-)
+@lru_cache()
+def get_supervisor_agent():
+    """Built on first use, compiling the ReAct agent is not needed to import the graph."""
+    from langgraph.prebuilt import create_react_agent
+    return create_react_agent(
+        model=get_chat_model(SUPERVISOR_MODEL),
+        tools=[],
+        prompt=(
+            "You are a supervisor agent that acts as a router and decision maker for a meeting agent workflow. "
+            "Your job is to analyze the current state and user request to determine the next step and which agent should handle it. "
+            "You have access to the step_summary list, user's last message, and current workflow state. "
+            "Make intelligent routing decisions based on what has been completed and what the user is requesting. "
+            "You are responsible for generating the next_step field, which should clearly describe what the next agent will do for the user. "
+            "For the step_summary field, describe what you accomplished for the user (e.g., 'Determined next step: route to debrief agent' or 'Analyzed workflow state and routed to zoom agent'), "
+            "not the detailed reasoning or internal decision process."
+        ),
+        response_format=SupervisorAgentOutput,
+    )
+
+def end_early(reason: str) -> Dict:
+    print(f"[SUPERVISOR AGENT] 🛑 Ending early: {reason}")
+    return {
+        "route": "end",
+        "next_step": f"End workflow - {reason}",
+        "step_summary": [f"Stopped early ({reason}); returning the results completed so far"]
+    }
 
 async def supervisor_agent_node(state: Dict) -> Dict:
     print("="*50)
     print("🤖 SUPERVISOR AGENT")
     print("="*50)
     
+    # An exhausted run ends here, without another routing call
+    budget = current_budget.get()
+    stop_reason = budget.check() if budget else None
+    if stop_reason:
+        return end_early(stop_reason)
+
     # Extract relevant information from state
     last_user_message = state.get("last_user_message", "")
     step_summary = state.get("step_summary", [])
     meeting_name = state.get("meeting_name", "")
     transcript_path = state.get("transcript_path", "")
+    # Large values may be blob handles; only their presence matters here, they are never resolved
     transcript = state.get("transcript", "")
     summary = state.get("summary", "")
     todo = state.get("todo", "")
     feedback = state.get("feedback", "")
     notion_parent_id = state.get("notion_parent_id", "")
     next_step = state.get("next_step", "")
+    meetings = state.get("meetings") or []
     
     # Create a comprehensive context for the supervisor
     context = f"""
 Current Workflow State:
 - User's instruction: {last_user_message}
 - Meeting name: {meeting_name or "Not specified"}
-- Transcript available: {"Yes" if (transcript_path or transcript) else "No"}
+- Transcript available: {"Yes" if (transcript_path or transcript or meetings) else "No"}
+- Meetings resolved: {len(meetings) or "Single meeting"}{(" (" + ", ".join(m.get("topic", "") for m in meetings) + ")") if meetings else ""}
 - Summary generated: {"Yes" if summary else "No"}
 - Todo list generated: {"Yes" if todo else "No"}
 - Feedback generated: {"Yes" if feedback else "No"}
@@ -66,8 +84,10 @@ Step Summary History:
 
 Available Routes and Next Steps:
 - 'zoom': Handle Zoom recordings/transcripts. Use when user needs transcript URL or transcript processing.
-  Next step examples: "Find transcript URL for the meeting", "Locate Zoom recording for meeting X"
+  For questions spanning several meetings, ask it to find all matching meetings and the date range.
+  Next step examples: "Find transcript URL for the meeting", "Locate Zoom recording for meeting X", "Find all standup meetings from this week"
 - 'debrief': Generate summaries, todos, and feedback from transcripts. Use when transcript is available and user wants analysis.
+  When several meetings are resolved they are debriefed in parallel and merged automatically.
   Next step examples: "Generate meeting summary and extract action items", "Create summary and feedback from transcript"
 - 'notion': Publish results to Notion. Use when user explicitly requests saving/publishing to Notion.
   Next step examples: "Create Notion page with meeting results", "Publish summary and todos to Notion"
@@ -100,7 +120,7 @@ Return a structured response with your routing decision and next step descriptio
 """
     
     # Invoke the supervisor agent
-    result = await supervisor_agent.ainvoke(
+    result = await get_supervisor_agent().ainvoke(
         {"messages": [{"role": "user", "content": user_message}]}
     )
     
@@ -115,9 +135,16 @@ Return a structured response with your routing decision and next step descriptio
     print(f"[SUPERVISOR AGENT] Step Summary: {step_summary}")
     
     supervisor_summary = structured_response.step_summary
-    return {
-        **state,
+    stop_reason = budget.record_decision(route, next_step) if budget else None
+    if stop_reason:
+        return end_early(stop_reason)
+    # Only the changed keys: LangGraph merges them into the state, nothing else is copied or streamed
+    update = {
         "route": route,
         "next_step": next_step,
         "step_summary": [supervisor_summary]
     }
+    if route == "debrief":
+        # Tags the per-meeting debriefs of this fan-out, so merging ignores those of an earlier one
+        update["fanout_id"] = uuid.uuid4().hex[:12]
+    return update
@@ -1,62 +1,51 @@
-from typing import Dict
-from src.tools.zoom_tools import zoom_find_transcript
-from src.config.settings import settings
-import pandas as pd
-from typing import List
-from difflib import SequenceMatcher
+import json
+from functools import lru_cache
+from typing import Dict, List
 from pydantic import BaseModel
-from langchain.chat_models import init_chat_model
-from langchain.tools import Tool
-from langgraph.prebuilt import create_react_agent
-from langgraph.graph import StateGraph, START, END
-from typing_extensions import TypedDict
-import time
-from langchain_openai import ChatOpenAI
-from pathlib import Path
-import httpx
-from loguru import logger
-from utils.get_transcript import load_transcript
+from src.cassette import run_date
+from src.llm import get_chat_model
+from src.tools.zoom_tools import zoom_find_transcript, zoom_find_transcripts
+from src.config.settings import settings
 
-client = ChatOpenAI(
-    model="gpt-4o-mini", 
-    api_key=settings.OPENAI_API_KEY,
-    base_url=settings.OPENAI_BASE_URL,
-)
+ZOOM_MODEL = settings.ZOOM_MODEL
 
 class ZoomAgentOutput(BaseModel):
     transcript_path: str
+    meeting_id: str = ""
     step_summary: str
 
-zoom_agent = create_react_agent(
-    model=client,
-    tools=[zoom_find_transcript],
-    prompt=(
-        "You are a helpful assistant that can find transcript URLs of Zoom meetings. "
-        "You can use the zoom_find_transcript tool to get the transcript URL of a Zoom meeting. "
-        "Your job is done when you find the transcript URL of a Zoom meeting and return it to the user. Then it's up to user to download the transcript. "
-        "For the step_summary field, describe what you accomplished for the user (e.g., 'Found transcript URL for meeting X' or 'Located recording for meeting Y'), "
-        "not the actual content or URL details."
-    ),
-    response_format=ZoomAgentOutput,
-)
-
-import json
-from typing import Dict
-
-DOWNLOAD_DIR = Path("zoom_transcripts")
-DOWNLOAD_DIR.mkdir(exist_ok=True)
-
+@lru_cache()
+def get_zoom_agent():
+    from langgraph.prebuilt import create_react_agent
+    return create_react_agent(
+        model=get_chat_model(ZOOM_MODEL),
+        tools=[zoom_find_transcript, zoom_find_transcripts],
+        prompt=(
+            "You are a helpful assistant that can find transcript URLs of Zoom meetings. "
+            "You can use the zoom_find_transcript tool to get the transcript URL of a Zoom meeting. "
+            "When the task is about several meetings (e.g. 'all standups this week'), use the zoom_find_transcripts tool "
+            "with a date range instead (transcript_path should then be the first meeting's path). "
+            "Your job is done when you find the transcript URL of a Zoom meeting and return it to the user. Then it's up to user to download the transcript. "
+            "For the step_summary field, describe what you accomplished for the user (e.g., 'Found transcript URL for meeting X' or 'Located recording for meeting Y'), "
+            "not the actual content or URL details."
+        ),
+        response_format=ZoomAgentOutput,
+    )
 
 
-# === Download transcript file ===
-async def download_file(download_url: str, filename: Path, token: str):
-    url_with_token = f"{download_url}?access_token={token}"
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        resp = await client.get(url_with_token)
-        resp.raise_for_status()
-        filename.write_bytes(resp.content)
-        logger.info(f"✅ Downloaded transcript: {filename}")
-    return filename
+def tool_results(messages: List, tool_name: str) -> List[Dict]:
+    """Outputs of every call to `tool_name` in the agent's messages, oldest first."""
+    results = []
+    for message in messages:
+        if getattr(message, "type", None) != "tool" or message.name != tool_name:
+            continue
+        try:
+            data = json.loads(message.content)
+        except (TypeError, ValueError):
+            continue
+        if isinstance(data, dict):
+            results.append(data)
+    return results
 
 
 async def zoom_agent_node(state: Dict) -> Dict:
@@ -64,25 +53,34 @@ async def zoom_agent_node(state: Dict) -> Dict:
     print("🤖 ZOOM AGENT")
     print("="*50)
 
-    meeting_name = state.get("meeting_name", "Unknown meeting")
-    transcript = state.get("transcript") or f"Transcript placeholder for {meeting_name}"
-
     next_step = state.get("next_step", "Unknown next step")
-    result = await zoom_agent.ainvoke(
-        {"messages": [{"role": "user", "content": f"This is your current task: {next_step}"}]},
+    result = await get_zoom_agent().ainvoke(
+        {"messages": [{"role": "user", "content": f"Today is {run_date().isoformat()}. This is your current task: {next_step}"}]},
     )
 
     # --- Extract transcript_path from result ---
     transcript_url = result['structured_response'].transcript_path
     step_summary = result['structured_response'].step_summary
+    # Meetings for the fan-out come straight from the tool, not through the model's answer
+    found = [r for r in tool_results(result["messages"], "zoom_find_transcripts") if r.get("meetings")]
+    meetings = found[-1]["meetings"] if found else []
+    # The meeting the transcript belongs to, so its topic is known to the result cache
+    single = [r for r in tool_results(result["messages"], "zoom_find_transcript") if r.get("transcript_path")]
+    resolved = meetings[0] if meetings else (single[-1] if single else {})
+    if resolved:
+        transcript_url = resolved["transcript_path"]
 
 
     # Fallback if nothing was found
     transcript_url = transcript_url or state.get("transcript_path") or "/tmp/placeholder.txt"
     print("[ZOOM AGENT] Summary:", step_summary)
+    if len(meetings) > 1:
+        print(f"[ZOOM AGENT] Resolved {len(meetings)} meetings")
     return {
-        **state,
         "transcript_path": transcript_url,
+        "meeting_id": str(resolved.get("meeting_id") or result['structured_response'].meeting_id or state.get("meeting_id") or ""),
+        "meeting_name": resolved.get("topic") or state.get("meeting_name"),
+        "meetings": meetings if len(meetings) > 1 else [],
         "step_summary": [step_summary]
     }
 
@@ -5,6 +5,8 @@ import json
 class QueryRequest(BaseModel):
     query: str
     context: Optional[Dict[str, Any]] = None
+    # Seconds the client will wait for the answer; the run returns what is complete by then
+    timeout_seconds: Optional[float] = None
 
 class QueryResponse(BaseModel):
     node: str
@@ -1,102 +1,373 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from .models import QueryRequest, QueryResponse, SSEEvent
-from src.graph import compiled_graph
+from src.config.settings import settings
+from src.ingest import IngestJob, get_ingest_queue
+from src import result_cache
+from src.admission import Rejected, Ticket, get_admission_controller
+from src.budget import RunBudget, current_budget
+from src.deadline import Deadline, current_deadline, request_timeout
+from src.cassette import get_cassette
+from src.uploads import UploadError, declared_format, ingest_multipart, ingest_stream, query_context, resolve_upload_context
+from src.warmup import get_warmup_tracker
+from src.scheduler import INTERACTIVE, PRIORITY_CLASSES, current_priority, get_scheduler
+from utils.blob_store import resolve_fields
+from utils.inflight import Lease, get_inflight_registry
+from utils.loop_monitor import get_loop_monitor
+from utils.run_profiler import RunProfile, get_profile_store, reserve_profile, running_profiles
+from utils.transcript_io import run_io
 import asyncio
+import base64
+import hashlib
+import hmac
 import json
-from typing import AsyncGenerator
+import os
+import secrets
+from typing import AsyncGenerator, Dict, Optional
 import time
 
 router = APIRouter()
 
-@router.post("/query")
-async def process_query(request: QueryRequest):
-    async def generate_stream():
-        try:
-            # Send start event
-            start_event = SSEEvent(
-                event="start",
-                data={
-                    "message": "Workflow started",
-                    "query": request.query,
-                    "timestamp": time.time()
-                }
-            )
-            start_sse = start_event.to_sse()
+SSE_HEADERS = {
+    "Cache-Control": "no-cache, no-store, must-revalidate",
+    "Pragma": "no-cache",
+    "Expires": "0",
+    "Connection": "keep-alive",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Cache-Control",
+    "X-Accel-Buffering": "no"
+}
+
+# Node outputs the client renders; graph state may hold them as blob handles (the transcript stays one)
+CLIENT_BLOB_FIELDS = ("summary", "todo", "feedback", "analytics")
+
+async def client_payload(payload):
+    """A node update as sent to the client, with the debrief outputs it renders resolved"""
+    if not isinstance(payload, dict):
+        return payload
+    payload = await resolve_fields(payload, CLIENT_BLOB_FIELDS)
+    if isinstance(payload.get("meeting_debriefs"), list):
+        payload["meeting_debriefs"] = [
+            await resolve_fields(d, CLIENT_BLOB_FIELDS) for d in payload["meeting_debriefs"]
+        ]
+    return payload
+
+def cached_stream(query: str, cached: Dict, announce: bool = True):
+    """Replay a cached pipeline result as the usual start / node_update / completion events"""
+    result = cached["result"]
+    if announce:
+        yield SSEEvent(
+            event="start",
+            data={
+                "message": "Workflow started",
+                "query": query,
+                "cached": True,
+                "timestamp": time.time()
+            }
+        ).to_sse()
+    yield SSEEvent(
+        event="node_update",
+        data={
+            "node": "log_summary",
+            "payload": result,
+            "cached": True,
+            "cached_at": cached["created_at"],
+            "timestamp": time.time()
+        }
+    ).to_sse()
+    yield SSEEvent(
+        event="completion",
+        data={
+            "message": "Workflow completed successfully (served from cache)",
+            "total_steps": len(result.get("step_summary") or []),
+            "cached": True,
+            "timestamp": time.time()
+        }
+    ).to_sse()
+
+def get_compiled_graph():
+    """Imported on first use: the graph pulls in every agent and the LLM client libraries"""
+    from src.graph import compiled_graph
+    return compiled_graph
+
+async def graph_input(query: str, context: Dict) -> Dict:
+    from src.graph import initial_state
+    return await initial_state(query, context)
+
+async def generate_stream(query: str, context: Dict, priority_class: str = INTERACTIVE,
+                          profile: Optional[RunProfile] = None, deadline: Optional[Deadline] = None,
+                          announce: bool = True):
+    nodes = []
+    # LLM calls and node boundaries of this run are scheduled under its priority class
+    current_priority.set(priority_class)
+    budget = RunBudget.from_settings()
+    current_budget.set(budget)
+    current_deadline.set(deadline)
+    if profile is not None:
+        profile.start()
+    try:
+        # Send start event
+        start_event = SSEEvent(
+            event="start",
+            data={
+                "message": "Workflow started",
+                "query": query,
+                "cached": False,
+                "timestamp": time.time()
+            }
+        )
+        start_sse = start_event.to_sse()
+        if announce:
             print(f"[API] Sending start event: {start_sse}")
             yield start_sse
-            
-            # Stream graph updates with proper streaming mode
-            async for update in compiled_graph.astream({
-                "last_user_message": request.query,
-                "step_summary": [],
-                **(request.context or {})
-            }, stream_mode="updates"):
-                print(f"[API] Received update: {update}")
-                print(f"[API] Update type: {type(update)}")
-                print(f"[API] Update keys: {update.keys() if hasattr(update, 'keys') else 'No keys'}")
-                
-                                # Handle the update structure properly
-                if isinstance(update, dict):
-                    # Each update contains a single node's result
-                    for node, payload in update.items():
-                        print(f"[API] Processing node: {node}")
-                        
-                        # Create node update event
-                        node_event = SSEEvent(
-                            event="node_update",
+
+        # Stream graph updates with proper streaming mode
+        graph = get_compiled_graph()
+        # The hop budget ends runs long before this; the recursion limit is only a backstop
+        config = {"recursion_limit": settings.RUN_MAX_HOPS * 3 + 5}
+        async for update in graph.astream(await graph_input(query, context), config, stream_mode="updates"):
+            print(f"[API] Received update: {update}")
+            print(f"[API] Update type: {type(update)}")
+            print(f"[API] Update keys: {update.keys() if hasattr(update, 'keys') else 'No keys'}")
+
+            # Handle the update structure properly
+            if isinstance(update, dict):
+                # Each update contains a single node's result
+                for node, payload in update.items():
+                    print(f"[API] Processing node: {node}")
+                    nodes.append(node)
+                    payload = await client_payload(payload)
+
+                    # Create node update event
+                    node_event = SSEEvent(
+                        event="node_update",
+                        data={
+                            "node": node,
+                            "payload": payload,
+                            "timestamp": time.time()
+                        }
+                    )
+                    serialize_started = time.perf_counter()
+                    node_sse = node_event.to_sse()
+                    if profile is not None:
+                        profile.mark("node_update", node=node, sse_bytes=len(node_sse),
+                                     serialize_ms=round((time.perf_counter() - serialize_started) * 1000, 2))
+                    print(f"[API] Sending node event for {node}")
+                    yield node_sse
+
+                    # If this is the final summary, send completion event
+                    if node == "log_summary":
+                        ended_early = budget.exhausted
+                        if not ended_early and deadline is not None and (deadline.expired or deadline.degraded):
+                            ended_early = "request deadline"
+                        completion_event = SSEEvent(
+                            event="completion",
                             data={
-                                "node": node,
-                                "payload": payload,
+                                "message": (
+                                    "Workflow completed successfully" if not ended_early
+                                    else f"Workflow ended early with partial results: {ended_early}"
+                                ),
+                                "total_steps": len(payload.get("step_summary", [])),
+                                "cached": False,
+                                "partial": bool(ended_early),
+                                "budget": budget.report(),
+                                **({"deadline": deadline.report()} if deadline is not None else {}),
+                                **({"profile_id": profile.id} if profile is not None else {}),
                                 "timestamp": time.time()
                             }
                         )
-                        node_sse = node_event.to_sse()
-                        print(f"[API] Sending node event for {node}")
-                        yield node_sse
-                        
-                        # If this is the final summary, send completion event
-                        if node == "log_summary":
-                            completion_event = SSEEvent(
-                                event="completion",
-                                data={
-                                    "message": "Workflow completed successfully",
-                                    "total_steps": len(payload.get("step_summary", [])),
-                                    "timestamp": time.time()
-                                }
-                            )
-                            completion_sse = completion_event.to_sse()
-                            print(f"[API] Sending completion event")
-                            yield completion_sse
-                else:
-                    print(f"[API] Non-dict update received: {update}")
-                        
-        except Exception as e:
-            error_event = SSEEvent(
-                event="error",
-                data={
-                    "error": str(e),
-                    "timestamp": time.time()
-                }
-            )
-            yield error_event.to_sse()
-    
+                        # Partial or degraded results are not worth replaying. Stored before the completion
+                        # event: clients disconnect on it, and queries waiting on this run read the result
+                        if settings.RESULT_CACHE_ENABLED and not ended_early:
+                            await result_cache.arecord(query, context, payload, nodes)
+
+                        completion_sse = completion_event.to_sse()
+                        print(f"[API] Sending completion event")
+                        yield completion_sse
+            else:
+                print(f"[API] Non-dict update received: {update}")
+
+    except Exception as e:
+        error_event = SSEEvent(
+            event="error",
+            data={
+                "error": str(e),
+                "timestamp": time.time()
+            }
+        )
+        yield error_event.to_sse()
+    finally:
+        if profile is not None:
+            profile.stop()
+            await run_io(get_profile_store().save, profile)
+
+async def release_run(ticket: Ticket, lease: Optional[Lease], profile: Optional[RunProfile] = None):
+    ticket.release()
+    if profile is not None:
+        profile.release()
+    if lease is not None:
+        await lease.release()
+
+async def admitted_stream(ticket: Ticket, stream: AsyncGenerator, lease: Optional[Lease] = None,
+                          profile: Optional[RunProfile] = None):
+    try:
+        async for chunk in stream:
+            yield chunk
+    finally:
+        await release_run(ticket, lease, profile)
+
+async def shared_run_stream(query: str, context: Dict, priority_class: str, deadline: Optional[Deadline],
+                            ticket: Ticket, run_key: str):
+    """
+    Wait for the identical query running in this or another worker and replay its cached result,
+    or run the pipeline here if it left none. The start event goes out before the wait.
+    """
+    yield SSEEvent(
+        event="start",
+        data={
+            "message": "Workflow started, waiting for an identical query already running",
+            "query": query,
+            "cached": False,
+            "timestamp": time.time()
+        }
+    ).to_sse()
+    registry = get_inflight_registry()
+    lease = None
+    # Another waiter may take over the run if the first one left no result, then wait for that one
+    while await registry.wait_released(run_key, deadline.remaining() if deadline else None):
+        cached = await result_cache.alookup(query, context)
+        if cached:
+            ticket.done_waiting()
+            print(f"[API] ♻️ Serving the identical query's result for meeting {cached['meeting_id']}")
+            for chunk in cached_stream(query, cached, announce=False):
+                yield chunk
+            return
+        lease = await registry.acquire(run_key)
+        if lease is not None:
+            break
+    ticket.done_waiting()
+    try:
+        async for chunk in generate_stream(query, context, priority_class, None, deadline, announce=False):
+            yield chunk
+    finally:
+        if lease is not None:
+            await lease.release()
+
+def cached_response(query: str, cached: Dict) -> StreamingResponse:
+    print(f"[API] ♻️ Serving cached result for meeting {cached['meeting_id']}")
     return StreamingResponse(
-        generate_stream(),
+        cached_stream(query, cached),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache, no-store, must-revalidate",
-            "Pragma": "no-cache",
-            "Expires": "0",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Cache-Control",
-            "X-Accel-Buffering": "no"
-        }
+        headers={**SSE_HEADERS, "X-Cache": "HIT"}
+    )
+
+async def stream_query(query: str, context: Dict, priority_class: str = INTERACTIVE,
+                       profile_mode: Optional[str] = None, timeout: Optional[float] = None) -> StreamingResponse:
+    """Serve a repeated query from the result cache, otherwise run the pipeline"""
+    # `{"transcript_id": ...}` from POST /transcripts stands for the uploaded transcript
+    try:
+        context = await resolve_upload_context(context)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status, detail=str(e))
+    # The deadline starts now, time spent waiting for admission counts against it
+    timeout = request_timeout(timeout)
+    deadline = Deadline(timeout, settings.DEADLINE_MARGIN_SECONDS) if timeout else None
+    # A profiled query always runs the pipeline, the cached replay is not what is being diagnosed
+    cacheable = settings.RESULT_CACHE_ENABLED and not profile_mode and not result_cache.bypasses_cache(query)
+    lease = None
+    waiting = False
+    if cacheable:
+        cached = await result_cache.alookup(query, context)
+        if cached:
+            return cached_response(query, cached)
+        # The same query running in this or another worker process caches its result: wait for that
+        run_key = result_cache.run_key(query, context)
+        lease = await get_inflight_registry().acquire(run_key)
+        waiting = lease is None
+
+    # Cache hits are cheap, only pipeline runs and queries waiting for one count against admission control
+    try:
+        ticket = await get_admission_controller().acquire(waiting)
+    except Rejected as e:
+        print(f"[API] 🚦 Rejected query: {e.reason}")
+        if lease is not None:
+            await lease.release()
+        raise HTTPException(
+            status_code=429,
+            detail=e.reason,
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    headers = {**SSE_HEADERS, "X-Cache": "MISS"}
+    profile = None
+    if profile_mode:
+        profile = reserve_profile(query, trace_memory=profile_mode == "mem")
+        if profile is not None:
+            headers["X-Profile-Id"] = profile.id
+        else:
+            headers["X-Profile"] = "skipped"
+    if waiting:
+        print(f"[API] ⏳ Identical query already running, waiting for its result")
+        headers["X-Cache"] = "WAIT"
+        stream = shared_run_stream(query, context, priority_class, deadline, ticket, run_key)
+    else:
+        stream = generate_stream(query, context, priority_class, profile, deadline)
+    return StreamingResponse(
+        admitted_stream(ticket, stream, lease, profile),
+        media_type="text/event-stream",
+        headers=headers,
+        # Also released here in case the stream is never iterated
+        background=BackgroundTask(release_run, ticket, lease, profile)
+    )
+
+def request_priority(request: Request) -> str:
+    """Scripted clients can send `X-Priority: background` to run behind interactive queries"""
+    value = request.headers.get("x-priority", INTERACTIVE).lower()
+    if value not in PRIORITY_CLASSES:
+        raise HTTPException(status_code=400, detail=f"X-Priority must be one of {', '.join(PRIORITY_CLASSES)}")
+    return value
+
+def require_admin(request: Request):
+    """Profiling and the admin endpoints are off unless PROFILE_ADMIN_TOKEN is set"""
+    if not settings.PROFILE_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Profiling is disabled, set PROFILE_ADMIN_TOKEN to enable it")
+    if not secrets.compare_digest(request.headers.get("x-admin-token", ""), settings.PROFILE_ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+def profile_requested(request: Request) -> Optional[str]:
+    """
+    `X-Profile: 1` or `?profile=1` profiles this one run, `mem` also traces its allocations
+    (admin token required); None when no profile was asked for
+    """
+    flag = (request.headers.get("x-profile") or request.query_params.get("profile") or "").lower()
+    if flag == "mem":
+        mode = "mem"
+    elif flag in ("1", "true", "yes"):
+        mode = "run"
+    else:
+        return None
+    require_admin(request)
+    return mode
+
+def requested_timeout(request: Request, body_timeout: Optional[float] = None) -> Optional[float]:
+    """Client deadline in seconds: `X-Request-Timeout` header, `timeout_seconds` in the body or `?timeout=`"""
+    value = request.headers.get("x-request-timeout") or request.query_params.get("timeout")
+    if value is None:
+        return body_timeout
+    try:
+        return float(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="X-Request-Timeout must be a number of seconds")
+
+@router.post("/query")
+async def process_query(request: QueryRequest, http_request: Request):
+    return await stream_query(
+        request.query, request.context or {}, request_priority(http_request), profile_requested(http_request),
+        requested_timeout(http_request, request.timeout_seconds)
     )
 
 @router.get("/query")
-async def process_query_get(query: str = None, context: str = None):
+async def process_query_get(http_request: Request, query: str = None, context: str = None):
     """GET endpoint for EventSource compatibility"""
     if not query:
         raise HTTPException(status_code=400, detail="Query parameter is required")
@@ -109,102 +380,159 @@ async def process_query_get(query: str = None, context: str = None):
         except json.JSONDecodeError:
             pass
     
-    # Create a mock request object
-    class MockRequest:
-        def __init__(self, query: str, context: dict):
-            self.query = query
-            self.context = context
-    
-    request = MockRequest(query, parsed_context)
-    
-    async def generate_stream():
-        try:
-            # Send start event
-            start_event = SSEEvent(
-                event="start",
-                data={
-                    "message": "Workflow started",
-                    "query": request.query,
-                    "timestamp": time.time()
-                }
-            )
-            start_sse = start_event.to_sse()
-            print(f"[API] Sending start event: {start_sse}")
-            yield start_sse
-            
-            # Stream graph updates with proper streaming mode
-            async for update in compiled_graph.astream({
-                "last_user_message": request.query,
-                "step_summary": [],
-                **(request.context or {})
-            }, stream_mode="updates"):
-                print(f"[API] Received update: {update}")
-                print(f"[API] Update type: {type(update)}")
-                print(f"[API] Update keys: {update.keys() if hasattr(update, 'keys') else 'No keys'}")
-                
-                # Handle the update structure properly
-                if isinstance(update, dict):
-                    # Each update contains a single node's result
-                    for node, payload in update.items():
-                        print(f"[API] Processing node: {node}")
-                        
-                        # Create node update event
-                        node_event = SSEEvent(
-                            event="node_update",
-                            data={
-                                "node": node,
-                                "payload": payload,
-                                "timestamp": time.time()
-                            }
-                        )
-                        node_sse = node_event.to_sse()
-                        print(f"[API] Sending node event for {node}")
-                        yield node_sse
-                        
-                        # If this is the final summary, send completion event
-                        if node == "log_summary":
-                            completion_event = SSEEvent(
-                                event="completion",
-                                data={
-                                    "message": "Workflow completed successfully",
-                                    "total_steps": len(payload.get("step_summary", [])),
-                                    "timestamp": time.time()
-                                }
-                            )
-                            completion_sse = completion_event.to_sse()
-                            print(f"[API] Sending completion event")
-                            yield completion_sse
-                else:
-                    print(f"[API] Non-dict update received: {update}")
-                        
-        except Exception as e:
-            error_event = SSEEvent(
-                event="error",
-                data={
-                    "error": str(e),
-                    "timestamp": time.time()
-                }
-            )
-            yield error_event.to_sse()
-    
-    return StreamingResponse(
-        generate_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache, no-store, must-revalidate",
-            "Pragma": "no-cache",
-            "Expires": "0",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Cache-Control",
-            "X-Accel-Buffering": "no"
-        }
+    return await stream_query(
+        query, parsed_context, request_priority(http_request), profile_requested(http_request),
+        requested_timeout(http_request)
     )
 
+@router.post("/transcripts")
+async def upload_transcript(request: Request, format: str = None, name: str = None):
+    """
+    Upload a VTT, SRT or plain-text transcript as the raw body or a multipart `file` field.
+    It is cleaned and indexed while it streams in; pass the returned `context`
+    (or `{"transcript_id": ...}`) to /query to run the pipeline on it.
+    """
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith("multipart/form-data"):
+            record = await ingest_multipart(request.stream(), content_type, format, name)
+        else:
+            fmt = declared_format(format, request.headers.get("x-filename"), content_type)
+            record = await ingest_stream(request.stream(), fmt, name)
+    except UploadError as e:
+        raise HTTPException(status_code=e.status, detail=str(e))
+    print(f"[API] 📤 Uploaded transcript {record['transcript_id'][:12]} ({record['format']}, {record['bytes']} bytes)")
+    return {**record, "context": query_context(record)}
+
 @router.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+@router.get("/ready")
+async def readiness_check():
+    """Warm status and latency per dependency; 503 until every critical dependency is warm"""
+    report = get_warmup_tracker().report()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+@router.get("/admission")
+async def admission_status():
+    """
+    Live in-flight count and wait queue depth of /query runs, and LLM slot usage per priority class
+    (all of this worker process), plus the work in progress across all worker processes
+    """
+    return {
+        **get_admission_controller().stats(),
+        "scheduler": get_scheduler().stats(),
+        "worker_pid": os.getpid(),
+        "inflight": await run_io(get_inflight_registry().running),
+    }
+
+@router.get("/cassette")
+async def cassette_status():
+    """Record/replay mode and how many interactions were recorded, replayed or missed"""
+    cassette = get_cassette()
+    return cassette.report() if cassette else {"mode": "off"}
+
+@router.get("/admin/profiles")
+async def list_profiles(request: Request):
+    """Captured per-run profiles, newest first"""
+    require_admin(request)
+    return {"profiles": await run_io(get_profile_store().list), "running": len(running_profiles)}
+
+@router.get("/admin/profiles/{profile_id}")
+async def get_profile(profile_id: str, request: Request, format: str = "json"):
+    """Profile report (json), or folded stacks of the CPU (cpu) or await (wait) profile for flame graphs"""
+    require_admin(request)
+    suffixes = {"json": ".json", "cpu": ".cpu.folded", "wait": ".wait.folded"}
+    if format not in suffixes:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(suffixes)}")
+    path = get_profile_store().path(profile_id, suffixes[format])
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    content = await run_io(path.read_text, encoding="utf-8")
+    if format == "json":
+        return JSONResponse(content=json.loads(content))
+    return PlainTextResponse(content, headers={"Content-Disposition": f'attachment; filename="{path.name}"'})
+
+@router.get("/loop-lag")
+async def loop_lag():
+    """Recent event loop stalls above the configured threshold"""
+    monitor = get_loop_monitor()
+    if monitor is None:
+        return {"enabled": False, "stalls": []}
+    return {
+        "enabled": True,
+        "threshold_ms": monitor.threshold * 1000,
+        "stalls": monitor.recent_stalls(),
+    }
+
+def _verify_zoom_webhook(request: Request, body: bytes) -> bool:
+    """Check the Basic auth credentials and, if a secret token is configured, the x-zm-signature."""
+    auth = request.headers.get("authorization", "")
+    if not auth.startswith("Basic "):
+        return False
+    try:
+        user, _, password = base64.b64decode(auth[6:]).decode("utf-8").partition(":")
+    except (ValueError, UnicodeDecodeError):
+        return False
+    if not (secrets.compare_digest(user, settings.ZOOM_WEBHOOK_USER)
+            and secrets.compare_digest(password, settings.ZOOM_WEBHOOK_PASS)):
+        return False
+
+    if settings.ZOOM_WEBHOOK_SECRET_TOKEN:
+        timestamp = request.headers.get("x-zm-request-timestamp", "")
+        message = f"v0:{timestamp}:{body.decode('utf-8')}"
+        expected = "v0=" + hmac.new(
+            settings.ZOOM_WEBHOOK_SECRET_TOKEN.encode(), message.encode(), hashlib.sha256
+        ).hexdigest()
+        if not secrets.compare_digest(request.headers.get("x-zm-signature", ""), expected):
+            return False
+    return True
+
+@router.post("/webhooks/zoom")
+async def zoom_webhook(request: Request):
+    """Receive Zoom recording.transcript_completed events and ingest them in the background"""
+    body = await request.body()
+    if not _verify_zoom_webhook(request, body):
+        raise HTTPException(status_code=401, detail="Invalid webhook credentials")
+
+    try:
+        event = json.loads(body)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Webhook body is not valid JSON")
+    if not isinstance(event, dict) or not isinstance(event.get("payload", {}), dict):
+        raise HTTPException(status_code=400, detail="Webhook body is not a Zoom event")
+    event_type = event.get("event")
+    print(f"[API] Zoom webhook event: {event_type}")
+
+    if event_type == "endpoint.url_validation":
+        if not settings.ZOOM_WEBHOOK_SECRET_TOKEN:
+            raise HTTPException(status_code=400, detail="ZOOM_WEBHOOK_SECRET_TOKEN is not configured")
+        plain_token = event.get("payload", {}).get("plainToken")
+        if not isinstance(plain_token, str) or not plain_token:
+            raise HTTPException(status_code=400, detail="url_validation event without payload.plainToken")
+        encrypted_token = hmac.new(
+            settings.ZOOM_WEBHOOK_SECRET_TOKEN.encode(), plain_token.encode(), hashlib.sha256
+        ).hexdigest()
+        return {"plainToken": plain_token, "encryptedToken": encrypted_token}
+
+    if event_type != "recording.transcript_completed":
+        return {"status": "ignored", "event": event_type}
+
+    queue = get_ingest_queue()
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Ingest queue is not running")
+
+    meeting = event.get("payload", {}).get("object", {})
+    queued = queue.enqueue(IngestJob(
+        meeting=meeting,
+        download_token=event.get("download_token"),
+        precompute_debrief=settings.ZOOM_WEBHOOK_PRECOMPUTE_DEBRIEF,
+    ))
+    if not queued:
+        raise HTTPException(status_code=503, detail="Ingest queue is full")
+    return {"status": "queued", "topic": meeting.get("topic"), "queue_depth": queue.depth()}
+
 @router.get("/test-sse")
 async def test_sse():
     """Test endpoint for SSE connection"""
@@ -237,13 +565,5 @@ async def test_sse():
     return StreamingResponse(
         generate_test_stream(),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache, no-store, must-revalidate",
-            "Pragma": "no-cache",
-            "Expires": "0",
-            "Connection": "keep-alive",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Cache-Control",
-            "X-Accel-Buffering": "no"
-        }
+        headers=SSE_HEADERS
     )
@@ -0,0 +1,132 @@
+import contextvars
+import json
+import re
+import time
+from typing import Dict, Optional, Set, Tuple
+from loguru import logger
+from src.config.settings import settings
+
+# Budget of the graph run the current task belongs to (inherited by the node tasks)
+current_budget: contextvars.ContextVar[Optional["RunBudget"]] = contextvars.ContextVar("current_budget", default=None)
+
+
+def _normalize_step(text: str) -> str:
+    return re.sub(r"\W+", " ", text or "").strip().lower()
+
+
+class RunBudget:
+    """
+    Limits of one graph run: supervisor hops, LLM calls, tokens and wall time,
+    plus loop detection on the supervisor's routing decisions.
+
+    The supervisor checks the budget before each decision; once it is exhausted
+    (or a decision repeats an earlier route/next_step pair, or visits one agent
+    too often) the run is routed to the end and returns the results it has so far.
+    A node that is already running is allowed to finish.
+    """
+
+    def __init__(self, max_hops: int, max_llm_calls: int, max_tokens: int, max_seconds: float,
+                 max_route_visits: int):
+        self.limits = {
+            "hops": max_hops,
+            "llm_calls": max_llm_calls,
+            "tokens": max_tokens,
+            "seconds": max_seconds,
+            "route_visits": max_route_visits,
+        }
+        self.hops = 0
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.route_visits: Dict[str, int] = {}
+        self.exhausted: Optional[str] = None
+        self._decisions: Set[Tuple[str, str]] = set()
+        self._started = time.monotonic()
+
+    @classmethod
+    def from_settings(cls) -> "RunBudget":
+        return cls(
+            max_hops=settings.RUN_MAX_HOPS,
+            max_llm_calls=settings.RUN_MAX_LLM_CALLS,
+            max_tokens=settings.RUN_MAX_TOKENS,
+            max_seconds=settings.RUN_MAX_SECONDS,
+            max_route_visits=settings.RUN_MAX_ROUTE_VISITS,
+        )
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self._started
+
+    # === Consumption ===
+    def record_llm_call(self, usage: Optional[Dict]):
+        self.llm_calls += 1
+        if usage:
+            self.prompt_tokens += usage.get("prompt_tokens") or 0
+            self.completion_tokens += usage.get("completion_tokens") or 0
+
+    def _stop(self, reason: str) -> str:
+        if self.exhausted is None:
+            self.exhausted = reason
+            logger.warning(f"🛑 Run budget: {reason}, ending with partial results")
+        return reason
+
+    def check(self) -> Optional[str]:
+        """Reason the run must stop now, or None."""
+        if self.exhausted:
+            return self.exhausted
+        if self.hops >= self.limits["hops"]:
+            return self._stop(f"hop limit of {self.limits['hops']} reached")
+        if self.llm_calls >= self.limits["llm_calls"]:
+            return self._stop(f"LLM call limit of {self.limits['llm_calls']} reached")
+        if self.prompt_tokens + self.completion_tokens >= self.limits["tokens"]:
+            return self._stop(f"token limit of {self.limits['tokens']} reached")
+        if self.elapsed() >= self.limits["seconds"]:
+            return self._stop(f"wall time limit of {self.limits['seconds']:.0f}s reached")
+        return None
+
+    def record_decision(self, route: str, next_step: str) -> Optional[str]:
+        """Count a supervisor hop; reason to stop if it repeats an earlier decision or loops on an agent."""
+        if route == "end":
+            return None
+        self.hops += 1
+        decision = (route, _normalize_step(next_step))
+        if decision in self._decisions:
+            return self._stop(f"repeated decision: route '{route}' with the same next step")
+        self._decisions.add(decision)
+        self.route_visits[route] = self.route_visits.get(route, 0) + 1
+        if self.route_visits[route] > self.limits["route_visits"]:
+            return self._stop(f"route '{route}' chosen {self.route_visits[route]} times")
+        return None
+
+    def report(self) -> Dict:
+        return {
+            "limits": self.limits,
+            "used": {
+                "hops": self.hops,
+                "llm_calls": self.llm_calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "tokens": self.prompt_tokens + self.completion_tokens,
+                "seconds": round(self.elapsed(), 2),
+                "route_visits": self.route_visits,
+            },
+            "exhausted": self.exhausted,
+        }
+
+
+def record_llm_response(content: bytes, content_type: str):
+    """Charge an LLM HTTP response to the current run's budget (usage from JSON or the last SSE chunk)."""
+    budget = current_budget.get()
+    if budget is None:
+        return
+    usage = None
+    try:
+        if "json" in content_type:
+            usage = json.loads(content).get("usage")
+        elif "event-stream" in content_type:
+            for line in reversed(content.decode("utf-8", "replace").splitlines()):
+                if line.startswith("data: {") and '"usage"' in line:
+                    usage = json.loads(line[6:]).get("usage")
+                    break
+    except (ValueError, AttributeError):
+        pass
+    budget.record_llm_call(usage)
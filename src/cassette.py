@@ -0,0 +1,332 @@
+import asyncio
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import httpx
+from loguru import logger
+from src.config.settings import settings
+from utils.transcript_io import run_io
+
+OFF, RECORD, REPLAY = "off", "record", "replay"
+
+# Secrets kept out of cassette files and out of the request keys
+SECRET_PARAMS = {"access_token", "token", "api_key", "key"}
+SECRET_FIELDS = {"access_token", "refresh_token"}
+# Hop-by-hop and encoding headers, the recorded body is already decoded
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+# Transcript paths reach prompts and answers; stored relative to this marker so a cassette
+# recorded with one TRANSCRIPT_DIR replays under another
+TRANSCRIPT_DIR_MARKER = b"{{TRANSCRIPT_DIR}}"
+
+
+class CassetteMiss(LookupError):
+    """A replayed run made a call the cassette has no recording for."""
+
+
+def redact_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = [(k, "redacted" if k in SECRET_PARAMS else v) for k, v in parse_qsl(parts.query, keep_blank_values=True)]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def redact_body(content: bytes) -> bytes:
+    try:
+        data = json.loads(content)
+    except ValueError:
+        return content
+    if not isinstance(data, dict) or not SECRET_FIELDS & data.keys():
+        return content
+    return json.dumps({k: "redacted" if k in SECRET_FIELDS else v for k, v in data.items()}).encode()
+
+
+def transcript_dir() -> bytes:
+    return settings.TRANSCRIPT_DIR.rstrip("/").encode("utf-8")
+
+
+def portable(content: bytes) -> bytes:
+    return content.replace(transcript_dir(), TRANSCRIPT_DIR_MARKER)
+
+
+def localized(content: bytes) -> bytes:
+    return content.replace(TRANSCRIPT_DIR_MARKER, transcript_dir())
+
+
+def encode_body(content: bytes) -> Dict:
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+
+
+def decode_body(body: Dict) -> bytes:
+    if "base64" in body:
+        return base64.b64decode(body["base64"])
+    return body["text"].encode("utf-8")
+
+
+def llm_signature(data: Dict) -> str:
+    """
+    Shape of an LLM request: message roles, system prompts, tools and response format.
+    User and tool message contents are left out, they carry the incidental differences.
+    """
+    messages = data.get("messages") or []
+    shape = [
+        [m.get("role") for m in messages if isinstance(m, dict)],
+        [m.get("content") for m in messages if isinstance(m, dict) and m.get("role") in ("system", "developer")],
+        sorted((t.get("function") or {}).get("name", "") for t in data.get("tools") or [] if isinstance(t, dict)),
+        data.get("response_format"),
+    ]
+    return hashlib.sha256(json.dumps(shape, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def request_keys(kind: str, method: str, url: str, payload: bytes) -> (str, str):
+    """
+    Exact key (endpoint + payload digest) and loose key (endpoint + model, plus the request
+    shape for LLM calls). Replay prefers the exact key; the loose key serves calls whose
+    payload changed only incidentally, e.g. a reworded user message, and only when
+    CASSETTE_ALLOW_LOOSE is set.
+    """
+    # The host is left out, a cassette recorded against one endpoint (or stub port) replays against any
+    parts = urlsplit(redact_url(url))
+    endpoint = f"{kind} {method} {parts.path}"
+    loose = endpoint
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        loose = f"{endpoint} {data.get('model', '')}".rstrip()
+        if kind == "llm":
+            loose = f"{loose} {llm_signature(data)}"
+    digest = hashlib.sha256(f"{parts.query}\n".encode() + portable(payload)).hexdigest()[:24]
+    return f"{endpoint} {digest}", loose
+
+
+class Cassette:
+    """
+    Recorded LLM, Zoom, Notion and MCP interactions, one JSON line each.
+    A record run appends to the file; a replay run loads it and hands out every
+    interaction once, in recording order per key, with its latency scaled.
+    """
+
+    def __init__(self, path: Path, mode: str, latency_scale: float = 1.0, allow_loose: bool = False):
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.allow_loose = allow_loose
+        self.exact: Dict[str, Deque[Dict]] = defaultdict(deque)
+        self.loose: Dict[str, Deque[Dict]] = defaultdict(deque)
+        self.meta: Dict[str, Dict] = {}
+        self.stats = {"recorded": 0, "replayed": 0, "loose_matches": 0, "misses": 0}
+        self._lock = threading.Lock()
+        if mode == RECORD:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text("", encoding="utf-8")
+            # Prompts and page titles carry the date, a replay on a later day reuses this one
+            self._append({"kind": "meta", "name": "run_date", "value": date.today().isoformat()})
+        elif mode == REPLAY:
+            self._load()
+
+    def _load(self):
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["kind"] == "meta":
+                    self.meta[entry["name"]] = entry["value"]
+                    continue
+                self.exact[entry["key"]].append(entry)
+                self.loose[entry["loose_key"]].append(entry)
+        count = sum(len(q) for q in self.exact.values())
+        logger.info(f"📼 Replaying {count} interactions from {self.path} (latency x{self.latency_scale})")
+
+    # === Recording ===
+    def _append(self, entry: Dict):
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    async def record(self, kind: str, method: str, url: str, payload: bytes, response: Dict, elapsed: float):
+        key, loose_key = request_keys(kind, method, url, payload)
+        entry = {
+            "kind": kind, "key": key, "loose_key": loose_key,
+            "method": method, "url": redact_url(url),
+            "elapsed": round(elapsed, 4), "response": response,
+        }
+        self.stats["recorded"] += 1
+        await run_io(self._append, entry)
+
+    async def record_meta(self, name: str, value):
+        await run_io(self._append, {"kind": "meta", "name": name, "value": value})
+
+    # === Replay ===
+    def take(self, kind: str, method: str, url: str, payload: bytes) -> Dict:
+        key, loose_key = request_keys(kind, method, url, payload)
+        with self._lock:
+            queue = self.exact.get(key)
+            if queue:
+                entry = queue.popleft()
+                self.loose[entry["loose_key"]].remove(entry)
+            else:
+                queue = self.loose.get(loose_key)
+                if not queue or not self.allow_loose:
+                    # A payload that differs from the recording is a miss unless loose matching is on
+                    self.stats["misses"] += 1
+                    hint = " (a loose match exists, set CASSETTE_ALLOW_LOOSE to use it)" if queue else ""
+                    raise CassetteMiss(f"No recording left for {method} {redact_url(url)} in {self.path}{hint}")
+                entry = queue.popleft()
+                self.exact[entry["key"]].remove(entry)
+                self.stats["loose_matches"] += 1
+            self.stats["replayed"] += 1
+        return entry
+
+    async def delay(self, entry: Dict):
+        if self.latency_scale > 0:
+            await asyncio.sleep(entry["elapsed"] * self.latency_scale)
+
+    def report(self) -> Dict:
+        remaining = sum(len(q) for q in self.exact.values())
+        return {"mode": self.mode, "path": str(self.path), "latency_scale": self.latency_scale,
+                "allow_loose": self.allow_loose,
+                **self.stats, **({"remaining": remaining} if self.mode == REPLAY else {})}
+
+
+@lru_cache()
+def get_cassette() -> Optional[Cassette]:
+    mode = settings.CASSETTE_MODE.lower()
+    if mode == OFF:
+        return None
+    if mode not in (RECORD, REPLAY):
+        raise ValueError(f"CASSETTE_MODE must be off, record or replay, not {settings.CASSETTE_MODE!r}")
+    return Cassette(Path(settings.CASSETTE_PATH), mode, settings.CASSETTE_LATENCY_SCALE, settings.CASSETTE_ALLOW_LOOSE)
+
+
+def run_date() -> date:
+    """Today, or the day the cassette was recorded when replaying, so dated payloads match exactly."""
+    cassette = get_cassette()
+    if cassette is not None and cassette.mode == REPLAY and "run_date" in cassette.meta:
+        return date.fromisoformat(cassette.meta["run_date"])
+    return date.today()
+
+
+# === HTTP ===
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """Records the exchanges of an httpx client, or serves them back without touching the network."""
+
+    def __init__(self, kind: str, cassette: Cassette, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.kind = kind
+        self.cassette = cassette
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        payload = await request.aread()
+        url = str(request.url)
+        if self.cassette.mode == REPLAY:
+            entry = self.cassette.take(self.kind, request.method, url, payload)
+            await self.cassette.delay(entry)
+            recorded = entry["response"]
+            return httpx.Response(
+                recorded["status"],
+                headers=recorded["headers"],
+                content=localized(decode_body(recorded["body"])),
+                request=request,
+            )
+
+        started = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+        elapsed = time.perf_counter() - started
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS]
+        await self.cassette.record(self.kind, request.method, url, payload, {
+            "status": response.status_code,
+            "headers": headers,
+            "body": encode_body(portable(redact_body(content))),
+        }, elapsed)
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def http_transport(kind: str, transport: Optional[httpx.AsyncBaseTransport] = None) -> Optional[httpx.AsyncBaseTransport]:
+    """Transport for an httpx client of `kind` (llm, zoom, notion); None leaves httpx's default in place."""
+    cassette = get_cassette()
+    if cassette is None:
+        return transport
+    return CassetteTransport(kind, cassette, transport)
+
+
+# === MCP tools ===
+def _tool_schemas(tools: List) -> List[Dict]:
+    schemas = []
+    for t in tools:
+        args_schema = t.args_schema if isinstance(t.args_schema, dict) else t.args_schema.model_json_schema()
+        schemas.append({"name": t.name, "description": t.description, "args_schema": args_schema})
+    return schemas
+
+
+def _cassette_tool(cassette: Cassette, name: str, description: str, args_schema: Dict, call=None):
+    from langchain_core.tools import StructuredTool, ToolException
+
+    async def invoke(**arguments):
+        payload = json.dumps({"tool": name, "arguments": arguments}, sort_keys=True, default=str).encode()
+        url = f"mcp://notion/{name}"
+        if cassette.mode == REPLAY:
+            entry = cassette.take("mcp", "CALL", url, payload)
+            await cassette.delay(entry)
+            if entry["response"].get("error") is not None:
+                raise ToolException(entry["response"]["error"])
+            return entry["response"]["content"], None
+
+        started = time.perf_counter()
+        try:
+            content, _ = await call(**arguments)
+            response = {"content": content}
+        except ToolException as e:
+            content, response = None, {"error": str(e)}
+        await cassette.record("mcp", "CALL", url, payload, response, time.perf_counter() - started)
+        if content is None:
+            raise ToolException(response["error"])
+        # Non-text artifacts are not recorded, drop them in record mode too so both modes match
+        return content, None
+
+    return StructuredTool(
+        name=name,
+        description=description,
+        args_schema=args_schema,
+        coroutine=invoke,
+        response_format="content_and_artifact",
+    )
+
+
+async def wrap_mcp_tools(tools: List) -> List:
+    """Record every MCP tool call of `tools`; the tool list itself is kept for replay."""
+    cassette = get_cassette()
+    if cassette is None or cassette.mode != RECORD:
+        return tools
+    schemas = _tool_schemas(tools)
+    await cassette.record_meta("mcp_tools", schemas)
+    return [
+        _cassette_tool(cassette, s["name"], s["description"], s["args_schema"], call=t.coroutine)
+        for s, t in zip(schemas, tools)
+    ]
+
+
+def replayed_mcp_tools() -> Optional[List]:
+    """MCP tools served from the cassette, without spawning the MCP server; None unless replaying."""
+    cassette = get_cassette()
+    if cassette is None or cassette.mode != REPLAY:
+        return None
+    schemas = cassette.meta.get("mcp_tools")
+    if schemas is None:
+        raise CassetteMiss(f"{cassette.path} has no recorded MCP tool list")
+    return [_cassette_tool(cassette, s["name"], s["description"], s["args_schema"]) for s in schemas]
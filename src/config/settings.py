@@ -6,16 +6,136 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str
     OPENAI_BASE_URL: str = "https://yunwu.ai/v1"
     MODEL_NAME: str = "gpt-4o"
+    # Model of each agent (part of the result cache key, see src/result_cache.py)
+    SUPERVISOR_MODEL: str = "o3"
+    ZOOM_MODEL: str = "gpt-4o-mini"
+    DEBRIEF_MODEL: str = "gpt-4o"
+    NOTION_MODEL: str = "gpt-4o"
     
     # Notion settings
     NOTION_TOKEN: str
+    NOTION_API_BASE_URL: str = "https://api.notion.com/v1"
+    NOTION_VERSION: str = "2022-06-28"
+    NOTION_DEFAULT_PARENT: str = "Meeting Notes"
+    NOTION_MCP_COMMAND: str = "npx"
+    NOTION_MCP_ARGS: str = "-y @notionhq/notion-mcp-server"
+    NOTION_TARGET_CACHE_TTL: int = 7 * 24 * 3600  # seconds a resolved parent page/database id is reused
     
     # Zoom settings
     ZOOM_ACCOUNT_ID: str
     ZOOM_CLIENT_ID: str
     ZOOM_CLIENT_SECRET: str
+    ZOOM_OAUTH_URL: str = "https://zoom.us/oauth/token"
+    ZOOM_API_BASE_URL: str = "https://api.zoom.us/v2"
     ZOOM_WEBHOOK_USER: str
     ZOOM_WEBHOOK_PASS: str
+    ZOOM_WEBHOOK_SECRET_TOKEN: str = ""  # optional, enables x-zm-signature checks and URL validation
+    ZOOM_WEBHOOK_PRECOMPUTE_DEBRIEF: bool = False
+
+    # Admission control for /query pipeline runs (per worker process, see API_WORKERS)
+    MAX_INFLIGHT_RUNS: int = 8
+    ADMISSION_QUEUE_SIZE: int = 16
+    ADMISSION_MAX_WAIT_SECONDS: float = 10.0
+
+    # Per-run budget of the supervisor loop; an exhausted run ends with its partial results
+    RUN_MAX_HOPS: int = 8  # supervisor routing decisions to an agent
+    RUN_MAX_LLM_CALLS: int = 60
+    RUN_MAX_TOKENS: int = 400_000
+    RUN_MAX_SECONDS: float = 300.0
+    RUN_MAX_ROUTE_VISITS: int = 3  # times a single agent may be routed to
+
+    # Request deadlines (X-Request-Timeout header or timeout_seconds in the body); the run returns
+    # whatever is complete by then
+    REQUEST_TIMEOUT_SECONDS: float = 0  # default for clients that send none, 0 = no deadline
+    REQUEST_TIMEOUT_MAX_SECONDS: float = 600.0
+    DEADLINE_MARGIN_SECONDS: float = 1.0  # kept for the final summary and completion event
+    DEADLINE_MIN_STEP_SECONDS: float = 3.0  # no new graph step starts with less time left
+    DEADLINE_DEGRADE_SECONDS: float = 30.0  # below this the debrief uses the fast model and fewer chunks
+    DEADLINE_FAST_MODEL: str = "gpt-4o-mini"
+    DEADLINE_DEGRADED_CHUNKS: int = 4  # new chunk digests built at most when degraded
+
+    # Priority scheduling of LLM calls between interactive queries and background work (per worker process)
+    LLM_CONCURRENCY: int = 8
+    INTERACTIVE_WEIGHT: float = 4.0
+    BACKGROUND_WEIGHT: float = 1.0
+    INTERACTIVE_RESERVED_SLOTS: int = 2
+    BACKGROUND_MAX_YIELD_SECONDS: float = 30.0
+
+    # Transcripts downloaded at once when a query covers several meetings
+    ZOOM_DOWNLOAD_CONCURRENCY: int = 4
+
+    # Background ingest settings
+    INGEST_WORKERS: int = 2
+    INGEST_QUEUE_SIZE: int = 100
+
+    # Transcript I/O settings
+    TRANSCRIPT_IO_WORKERS: int = 4
+
+    # Transcript store settings
+    TRANSCRIPT_DIR: str = "zoom_transcripts"
+    TRANSCRIPT_MEMORY_CACHE_MB: int = 64
+    TRANSCRIPT_DISK_QUOTA_MB: int = 1024
+
+    # Direct transcript uploads (VTT, SRT or plain text), streamed into the transcript store
+    UPLOAD_MAX_MB: int = 512
+
+    # Local cache database (download cache and other persistent caches)
+    CACHE_DB_PATH: str = "cache/meeting_agent.sqlite3"
+
+    # Multi-process serving (run_api.py --prod): worker processes share the cache database above,
+    # and coordinate work in progress through leases in it so it is done once across workers
+    # MAX_INFLIGHT_RUNS, ADMISSION_QUEUE_SIZE, LLM_CONCURRENCY and INFLIGHT_MAX_WAITERS are per worker:
+    # the service as a whole allows API_WORKERS times as many, size them for the upstream rate limits
+    API_WORKERS: int = 0  # 0: one worker per CPU core
+    INFLIGHT_LEASE_SECONDS: float = 30.0  # renewed while the holder runs; a crashed worker's work is retried after this
+    INFLIGHT_POLL_MS: int = 200
+    INFLIGHT_MAX_WAIT_SECONDS: float = 300.0
+    INFLIGHT_MAX_WAITERS: int = 32  # queries of a worker waiting for an identical running query, beyond that 429
+
+    # Final pipeline results, replayed for repeated queries on an unchanged transcript
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_TTL: int = 24 * 3600  # seconds
+
+    # Large graph state values (transcript text, debrief outputs) travel as blob handles
+    BLOB_INLINE_MAX_BYTES: int = 512  # values up to this size stay inline in the state
+    BLOB_MEMORY_MB: int = 64
+    BLOB_TTL: int = 24 * 3600  # seconds
+    BLOB_PURGE_INTERVAL: int = 3600  # seconds between sweeps of expired blobs
+
+    # Full-text transcript index (BM25) and retrieval
+    TRANSCRIPT_INDEX_PATH: str = "cache/transcript_index.sqlite3"
+    INDEX_PASSAGE_CHARS: int = 600
+    RETRIEVAL_TOP_K: int = 5
+
+    # Chunk digests shared by all debrief tasks of a transcript
+    DIGEST_MODEL: str = "gpt-4o-mini"
+    DIGEST_CHUNK_CHARS: int = 6000
+    DIGEST_CONCURRENCY: int = 4
+
+    # Startup warm-up of Zoom, Notion and LLM connections, reported by /ready
+    WARMUP_ENABLED: bool = True
+    WARMUP_TIMEOUT_SECONDS: float = 60.0
+    # Retries of a failed graph, LLM or Zoom warm-up, backing off from 1 s up to the maximum
+    WARMUP_RETRIES: int = 5
+    WARMUP_RETRY_BACKOFF_SECONDS: float = 1.0
+    WARMUP_RETRY_MAX_BACKOFF_SECONDS: float = 30.0
+
+    # Record/replay of LLM, Zoom, Notion and MCP interactions for reproducible benchmarks
+    CASSETTE_MODE: str = "off"  # off, record or replay
+    CASSETTE_PATH: str = "cassettes/default.jsonl"
+    CASSETTE_LATENCY_SCALE: float = 1.0  # replayed latency = recorded latency * scale, 0 replays instantly
+    CASSETTE_ALLOW_LOOSE: bool = False  # replay calls whose payload differs from the recording (see request_keys)
+
+    # On-demand profiling of single /query runs (X-Profile: 1 or ?profile=1, `mem` adds tracemalloc)
+    PROFILE_DIR: str = "cache/profiles"
+    PROFILE_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILE_MAX_CONCURRENT: int = 2
+    PROFILE_KEEP: int = 50  # artifacts kept on disk, oldest removed first
+    PROFILE_ADMIN_TOKEN: str = ""  # X-Admin-Token to request or download profiles; profiling is off while empty
+
+    # Event loop monitoring
+    LOOP_LAG_THRESHOLD_MS: int = 100
+    LOOP_LAG_CHECK_INTERVAL_MS: int = 50
     
     class Config:
         env_file = ".env"
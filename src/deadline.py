@@ -0,0 +1,77 @@
+import contextvars
+import time
+from typing import Dict, List, Optional
+import httpx
+from loguru import logger
+from src.config.settings import settings
+
+# Deadline of the request the current task works for (inherited by the graph's node tasks)
+current_deadline: contextvars.ContextVar[Optional["Deadline"]] = contextvars.ContextVar("current_deadline", default=None)
+
+
+class Deadline:
+    """
+    Point in time by which a request must have its answer.
+
+    The last `margin` seconds are kept for the final summary and the completion event,
+    so nodes, LLM, Zoom, Notion and MCP calls all work against `remaining()`.
+    Work that was skipped, cut short or downgraded to meet the deadline is noted in `degraded`.
+    """
+
+    def __init__(self, seconds: float, margin: float):
+        self.seconds = seconds
+        self.margin = margin
+        self.at = time.monotonic() + seconds
+        self.degraded: List[str] = []
+        self.expired = False
+
+    def remaining(self) -> float:
+        return max(0.0, self.at - self.margin - time.monotonic())
+
+    def short(self) -> bool:
+        """Too little time left for the full-quality path (largest model, every chunk)."""
+        return self.remaining() < settings.DEADLINE_DEGRADE_SECONDS
+
+    def check(self) -> Optional[str]:
+        """Reason to stop starting new steps, or None."""
+        if self.remaining() < settings.DEADLINE_MIN_STEP_SECONDS:
+            self.expired = True
+            return "request deadline reached"
+        return None
+
+    def degrade(self, note: str):
+        logger.info(f"⏳ Deadline: {note} ({self.remaining():.1f}s left)")
+        self.degraded.append(note)
+
+    def report(self) -> Dict:
+        return {
+            "timeout_seconds": self.seconds,
+            "remaining_seconds": round(max(0.0, self.at - time.monotonic()), 2),
+            "expired": self.expired,
+            "degraded": self.degraded,
+        }
+
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request's work, None without a deadline."""
+    deadline = current_deadline.get()
+    return deadline.remaining() if deadline else None
+
+
+def bounded(default: float) -> float:
+    """`default` timeout, shortened to what is left of the current deadline."""
+    left = remaining()
+    return default if left is None else min(default, left)
+
+
+def http_timeout(default: float, connect: float = 10.0) -> httpx.Timeout:
+    """httpx timeout for a call made within the current deadline."""
+    return httpx.Timeout(bounded(default), connect=bounded(connect))
+
+
+def request_timeout(requested: Optional[float]) -> Optional[float]:
+    """Timeout of a query from the client (header or body), else the configured default; None means no deadline."""
+    seconds = requested if requested is not None else settings.REQUEST_TIMEOUT_SECONDS
+    if not seconds or seconds <= 0:
+        return None
+    return min(seconds, settings.REQUEST_TIMEOUT_MAX_SECONDS)
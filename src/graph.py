@@ -1,45 +1,65 @@
 from typing import Literal, Optional
+import inspect
 import operator
 
 from langgraph.constants import Send
 from langgraph.graph import START, END, StateGraph
-from langgraph.types import interrupt, Command
 from typing_extensions import TypedDict
 from src.agents.zoom_agent import zoom_agent_node
-from src.agents.debrief_agent import debrief_agent_node
+from src.agents.debrief_agent import debrief_agent_node, debrief_meeting_node, merge_debriefs_node
 from src.agents.notion_agent import notion_agent_node
 from src.agents.supervisor_agent import supervisor_agent_node
-from src.config.settings import settings
-from openai import OpenAI
+from src.scheduler import get_scheduler
+from src.deadline import current_deadline
+from utils.blob_store import offload_fields, resolve_fields
 import asyncio
-from langchain_openai import ChatOpenAI
 from typing_extensions import Annotated
-from langgraph.graph.message import add_messages
-from typing import List
- 
-client = ChatOpenAI(
-    model=settings.MODEL_NAME,
-    api_key=settings.OPENAI_API_KEY,
-    base_url=settings.OPENAI_BASE_URL,
-)
+from typing import Dict, List
 
 
 class AgentState(TypedDict, total=False):
     last_user_message: str
     meeting_name: Optional[str]
+    meeting_id: Optional[str]
     transcript_path: Optional[str]
     transcript: Optional[str]
     summary: Optional[str]
     todo: Optional[str]
     feedback: Optional[str]
+    analytics: Optional[Dict]
     notion_parent_id: Optional[str]
     route: Optional[Literal["zoom", "debrief", "notion", "end"]]
     step_summary: Annotated[List[str], operator.add]
     next_step: Optional[str]
+    # Incremental refresh of a growing/regenerated transcript (can be set through the query context)
+    incremental: Optional[bool]
+    # Multi-meeting mode: resolved meetings and the per-meeting branch results
+    meetings: Optional[List[Dict]]
+    meeting: Optional[Dict]
+    meeting_debriefs: Annotated[List[Dict], operator.add]
+    fanout_id: Optional[str]
+
+
+# Values that may be held as blob handles (see utils/blob_store.py) instead of inline
+BLOB_FIELDS = ("transcript", "summary", "todo", "feedback", "analytics")
+
+# Fields of the final result; the only place where the large values are resolved for the client
+FINAL_FIELDS = (
+    "meeting_name", "meeting_id", "transcript_path", "meetings", "summary", "todo",
+    "feedback", "analytics", "notion_parent_id",
+)
+
 
+async def initial_state(query: str, context: Optional[Dict] = None) -> AgentState:
+    """Graph input for a query; large values passed through the context (e.g. a transcript) become handles"""
+    return await offload_fields({
+        "last_user_message": query,
+        "step_summary": [],
+        **(context or {})
+    }, BLOB_FIELDS)
 
 
-def log_final_summary(state: AgentState) -> AgentState:
+async def log_final_summary(state: AgentState) -> AgentState:
     """Log the final step_summary at the end of the pipeline"""
     step_summary = state.get("step_summary", [])
     
@@ -60,18 +80,50 @@ def log_final_summary(state: AgentState) -> AgentState:
     for i, summary in enumerate(step_summary, 1):
         summary_text += f"{i}. {summary}\n"
     
+    # The final result, not a copy of the whole state: the raw transcript stays out of it
+    result = await resolve_fields({field: state[field] for field in FINAL_FIELDS if field in state}, BLOB_FIELDS)
     return {
-        **state,
+        **result,
         "final_summary": summary_text,
         "step_summary": step_summary  # Keep the existing step_summary
     }
 
+def scheduled(node, on_deadline: Optional[Dict] = None):
+    """
+    Node boundary: background runs yield here to waiting interactive work before the next node,
+    and under a request deadline the node is skipped or cut off once the time is up.
+    `on_deadline` is merged into the update of a node that did not run to completion.
+    """
+    async def invoke(state):
+        await get_scheduler().checkpoint()
+        result = node(state)
+        return await result if inspect.isawaitable(result) else result
+
+    async def run(state):
+        deadline = current_deadline.get()
+        if deadline is None:
+            return await invoke(state)
+        name = node.__name__.removesuffix("_node").removesuffix("_agent")
+        if deadline.check():
+            deadline.degrade(f"skipped {name}")
+            return {**(on_deadline or {}), "step_summary": [f"Skipped {name}: request deadline reached"]}
+        try:
+            return await asyncio.wait_for(invoke(state), timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            deadline.expired = True
+            deadline.degrade(f"cut off {name}")
+            return {**(on_deadline or {}), "step_summary": [f"Stopped {name} at the request deadline"]}
+    return run
+
 main_graph = StateGraph(AgentState)
 
-main_graph.add_node("supervisor", supervisor_agent_node)
-main_graph.add_node("zoom", zoom_agent_node)
-main_graph.add_node("debrief", debrief_agent_node)
-main_graph.add_node("notion", notion_agent_node)
+# A supervisor that runs out of time ends the run instead of repeating its last route
+main_graph.add_node("supervisor", scheduled(supervisor_agent_node, on_deadline={"route": "end"}))
+main_graph.add_node("zoom", scheduled(zoom_agent_node))
+main_graph.add_node("debrief", scheduled(debrief_agent_node))
+main_graph.add_node("notion", scheduled(notion_agent_node))
+main_graph.add_node("debrief_meeting", scheduled(debrief_meeting_node))
+main_graph.add_node("merge_debriefs", scheduled(merge_debriefs_node))
 main_graph.add_node("log_summary", log_final_summary)
 
 main_graph.add_edge(START, "supervisor")
@@ -84,15 +136,33 @@ targets = {
     "end": "log_summary"
 }
 
+def route_from_supervisor(state: AgentState):
+    """Pick the route set in supervisor_agent_node, fanning debriefs out when several meetings are resolved"""
+    meetings = state.get("meetings") or []
+    if state["route"] == "debrief" and len(meetings) > 1:
+        return [
+            Send("debrief_meeting", {
+                "meeting": meeting,
+                "next_step": state.get("next_step", ""),
+                "last_user_message": state.get("last_user_message", ""),
+                "fanout_id": state.get("fanout_id"),
+            })
+            for meeting in meetings
+        ]
+    return state["route"]
+
 main_graph.add_conditional_edges(
     "supervisor",
-    lambda state: state["route"],  # just pick the route we set in supervisor_agent_node
-    targets
+    route_from_supervisor,
+    {**targets, "debrief_meeting": "debrief_meeting"}
 )
 # After each agent completes, go back to supervisor for next routing decision
 main_graph.add_edge("zoom", "supervisor")
 main_graph.add_edge("debrief", "supervisor")
 main_graph.add_edge("notion", "supervisor")
+# Parallel per-meeting branches join in the merge node before going back to the supervisor
+main_graph.add_edge("debrief_meeting", "merge_debriefs")
+main_graph.add_edge("merge_debriefs", "supervisor")
 
 # Add edge from logging node to END
 main_graph.add_edge("log_summary", END)
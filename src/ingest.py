@@ -0,0 +1,99 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from loguru import logger
+from src.config.settings import settings
+from src.scheduler import BACKGROUND, get_scheduler, priority
+
+
+@dataclass
+class IngestJob:
+    meeting: Dict
+    download_token: Optional[str] = None
+    precompute_debrief: bool = False
+    ingested_via: str = "webhook"
+
+
+async def ingest_meeting(job: IngestJob) -> Optional[Dict]:
+    """
+    Download, parse and index one meeting's transcript so later queries find it locally.
+    Optionally runs the full debrief ahead of time.
+    """
+    from src.tools.zoom_tools import fetch_meeting_transcript, get_access_token
+    token = job.download_token or await get_access_token()
+    result = await fetch_meeting_transcript(job.meeting, token, ingested_via=job.ingested_via)
+    if result is None:
+        logger.warning(f"⚠️ No transcript file to ingest for {job.meeting.get('topic')}")
+        return None
+    logger.info(f"📥 Ingested transcript for {result['topic']}: {result['transcript_path']}")
+
+    if job.precompute_debrief:
+        await get_scheduler().checkpoint()
+        # Imported lazily, the debrief agent pulls in the LLM client libraries
+        from src.agents.debrief_agent import precompute_debrief
+        await precompute_debrief(result["transcript_path"])
+        logger.info(f"🧠 Pre-computed debrief for {result['topic']}")
+    return result
+
+
+class IngestQueue:
+    """Bounded background queue processed by a fixed number of worker tasks."""
+
+    def __init__(self, workers: int, maxsize: int):
+        self.workers = workers
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        for i in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"ingest-worker-{i}"))
+        logger.info(f"📥 Ingest queue started with {self.workers} workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def enqueue(self, job: IngestJob) -> bool:
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            logger.warning(f"⚠️ Ingest queue full, dropping {job.meeting.get('topic')}")
+            return False
+        return True
+
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            try:
+                with priority(BACKGROUND):
+                    await ingest_meeting(job)
+            except Exception as e:
+                logger.error(f"❌ Ingest failed for {job.meeting.get('topic')}: {e}")
+            finally:
+                self.queue.task_done()
+
+
+ingest_queue: Optional[IngestQueue] = None
+
+
+def get_ingest_queue() -> Optional[IngestQueue]:
+    return ingest_queue
+
+
+def start_ingest_queue() -> IngestQueue:
+    global ingest_queue
+    ingest_queue = IngestQueue(workers=settings.INGEST_WORKERS, maxsize=settings.INGEST_QUEUE_SIZE)
+    ingest_queue.start()
+    return ingest_queue
+
+
+async def stop_ingest_queue():
+    global ingest_queue
+    if ingest_queue is not None:
+        await ingest_queue.stop()
+        ingest_queue = None
@@ -0,0 +1,58 @@
+from functools import lru_cache
+import httpx
+from src.budget import record_llm_response
+from src.cassette import http_transport
+from src.config.settings import settings
+from src.deadline import remaining
+from src.scheduler import get_scheduler
+
+
+class ScheduledTransport(httpx.AsyncBaseTransport):
+    """Sends every LLM request through the priority scheduler's call slots, and charges it to the run budget."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        left = remaining()
+        if left is not None:
+            # No single call outlives the request deadline
+            request.extensions["timeout"] = {
+                key: left if value is None else min(value, left)
+                for key, value in request.extensions.get("timeout", {}).items()
+            }
+        async with get_scheduler().slot():
+            response = await self.transport.handle_async_request(request)
+            # Hold the slot until the body is in, a completion is only done once it is read
+            content = await response.aread()
+        if request.url.path.endswith("/chat/completions"):
+            record_llm_response(content, response.headers.get("content-type", ""))
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+@lru_cache()
+def get_llm_http_client() -> httpx.AsyncClient:
+    """Shared async HTTP client for every ChatOpenAI instance."""
+    return httpx.AsyncClient(
+        transport=ScheduledTransport(http_transport("llm", httpx.AsyncHTTPTransport())),
+        timeout=httpx.Timeout(600.0, connect=10.0),
+    )
+
+
+@lru_cache()
+def get_chat_model(model: str):
+    """
+    ChatOpenAI client for `model`, built on first use and shared afterwards.
+    langchain_openai (and the openai SDK under it) is imported here rather than
+    at module level, it is the largest part of the service's import time.
+    """
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        model=model,
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        http_async_client=get_llm_http_client(),
+    )
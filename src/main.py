@@ -1,11 +1,73 @@
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from loguru import logger
 from src.api.routes import router
+from src.config.settings import settings
+from src.ingest import start_ingest_queue, stop_ingest_queue
+from src.tools.notion_publisher import close_notion_client
+from src.tools.notion_tools import stop_notion_session
+from src.warmup import register_warmup_steps, run_warmup
+from utils.blob_store import get_blob_store
+from utils.inflight import get_inflight_registry
+from utils.loop_monitor import start_loop_monitor, stop_loop_monitor
+from utils.transcript_io import run_io, shutdown_executor
+from utils.transcript_index import get_transcript_index
+
+
+async def index_existing_transcripts():
+    """Pick up transcripts that were written before the index existed; one worker process does it"""
+    lease = await get_inflight_registry().acquire("index_directory")
+    if lease is None:
+        return
+    try:
+        await run_io(get_transcript_index().index_directory, Path(settings.TRANSCRIPT_DIR))
+    finally:
+        await lease.release()
+
+
+async def purge_expired_blobs():
+    """Sweep expired state blobs at startup and then periodically; nothing else deletes the unread ones"""
+    while True:
+        try:
+            purged = await run_io(get_blob_store().purge_expired)
+            if purged:
+                logger.info(f"🧹 Purged {purged} expired state blobs")
+        except Exception as e:
+            logger.warning(f"⚠️ Purging expired state blobs failed: {e}")
+        await asyncio.sleep(settings.BLOB_PURGE_INTERVAL)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_loop_monitor(settings.LOOP_LAG_THRESHOLD_MS, settings.LOOP_LAG_CHECK_INTERVAL_MS)
+    start_ingest_queue()
+    index_task = asyncio.create_task(index_existing_transcripts())
+    purge_task = asyncio.create_task(purge_expired_blobs())
+    # Warm up in the background; /ready reports when the replica can take traffic
+    warmup_task = None
+    if settings.WARMUP_ENABLED:
+        register_warmup_steps()
+        warmup_task = asyncio.create_task(run_warmup())
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+    index_task.cancel()
+    purge_task.cancel()
+    await stop_ingest_queue()
+    await close_notion_client()
+    await stop_notion_session()
+    await stop_loop_monitor()
+    shutdown_executor()
+
 
 app = FastAPI(
     title="Meeting Agent API",
     description="API for processing meeting transcripts and managing Notion integration",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+from loguru import logger
+from src.config.settings import settings
+from src.tools import zoom_download_cache
+from utils.kv_store import get_kv_store
+from utils.transcript_io import run_io
+
+# query (+ context) -> the meeting and transcript it resolved to last time
+ALIAS_NAMESPACE = "query_aliases"
+# "<meeting_id>:<key digest>" -> final pipeline result
+RESULT_NAMESPACE = "pipeline_results"
+
+# Models used along the pipeline; a change here must not serve results from the old ones
+MODEL_CONFIG = {
+    "supervisor": settings.SUPERVISOR_MODEL,
+    "zoom": settings.ZOOM_MODEL,
+    "debrief": settings.DEBRIEF_MODEL,
+    "digest": settings.DIGEST_MODEL,
+    "default": settings.MODEL_NAME,
+    "base_url": settings.OPENAI_BASE_URL,
+}
+
+TASK_PATTERNS = {
+    "summary": re.compile(r"summar|recap|总结|摘要", re.IGNORECASE),
+    "todo": re.compile(r"todo|to-do|action item|待办", re.IGNORECASE),
+    "feedback": re.compile(r"feedback|反馈", re.IGNORECASE),
+    "notion": re.compile(r"notion", re.IGNORECASE),
+}
+
+# Fields of the final state worth replaying; the raw transcript is left out
+RESULT_FIELDS = (
+    "meeting_name", "meeting_id", "transcript_path", "summary", "todo",
+    "feedback", "analytics", "notion_parent_id", "step_summary", "final_summary",
+)
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", query).strip().casefold()
+
+
+def requested_tasks(query: str) -> List[str]:
+    """The set of outputs a query asks for; questions are keyed on their own text."""
+    from src.agents.debrief_agent import is_question
+    if is_question(query):
+        return [f"question:{normalize_query(query)}"]
+    return sorted(name for name, pattern in TASK_PATTERNS.items() if pattern.search(query)) or ["debrief"]
+
+
+def bypasses_cache(query: str) -> bool:
+    """Refresh requests ask for a new run by definition."""
+    from src.agents.debrief_agent import REFRESH_RE
+    return bool(REFRESH_RE.search(query))
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _alias_key(query: str, context: Optional[Dict]) -> str:
+    return _digest([normalize_query(query), context or {}])
+
+
+def run_key(query: str, context: Optional[Dict]) -> str:
+    """In-flight registry key of a pipeline run: identical queries share one run and its cached result."""
+    return f"run:{_alias_key(query, context)}"
+
+
+def _result_key(meeting_id: str, transcript_hash: str, tasks: List[str]) -> str:
+    return f"{meeting_id}:{_digest([transcript_hash, tasks, MODEL_CONFIG])}"
+
+
+@lru_cache(maxsize=256)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    # Keyed on size and mtime so a rewritten file is hashed again
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _transcript_hash(transcript_path: str) -> Optional[str]:
+    path = Path(transcript_path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return _file_digest(str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def lookup(query: str, context: Optional[Dict]) -> Optional[Dict]:
+    """Cached result for a query whose meeting was resolved before and whose transcript is unchanged."""
+    store = get_kv_store()
+    alias = store.get(ALIAS_NAMESPACE, _alias_key(query, context))
+    if not alias:
+        return None
+    transcript_hash = _transcript_hash(alias["transcript_path"])
+    if transcript_hash is None:
+        return None
+    return store.get(RESULT_NAMESPACE, _result_key(alias["meeting_id"], transcript_hash, requested_tasks(query)))
+
+
+def record(query: str, context: Optional[Dict], final_state: Dict, nodes: List[str]) -> bool:
+    """
+    Store a finished run. Runs that published to Notion (side effects), covered
+    several meetings, or never resolved a transcript are not cached.
+    """
+    tasks = requested_tasks(query)
+    transcript_path = final_state.get("transcript_path")
+    if "notion" in tasks or "notion" in nodes or final_state.get("meetings") or not transcript_path:
+        return False
+    transcript_hash = _transcript_hash(transcript_path)
+    if transcript_hash is None:
+        return False
+    meeting_id = str(final_state.get("meeting_id") or Path(transcript_path).stem)
+    meeting_name = final_state.get("meeting_name")
+    if not meeting_name:
+        downloaded = zoom_download_cache.find_by_transcript_path(transcript_path)
+        meeting_name = downloaded["topic"] if downloaded else ""
+
+    store = get_kv_store()
+    ttl = settings.RESULT_CACHE_TTL
+    store.set(ALIAS_NAMESPACE, _alias_key(query, context),
+              {"meeting_id": meeting_id, "meeting_name": meeting_name,
+               "transcript_path": transcript_path}, ttl)
+    store.set(RESULT_NAMESPACE, _result_key(meeting_id, transcript_hash, tasks), {
+        "meeting_id": meeting_id,
+        "tasks": tasks,
+        "created_at": time.time(),
+        "result": {field: final_state.get(field) for field in RESULT_FIELDS if field in final_state},
+    }, ttl)
+    logger.info(f"💾 Cached pipeline result for meeting {meeting_id} ({', '.join(tasks)})")
+    return True
+
+
+def invalidate_meeting(meeting_id, topic: str = "") -> int:
+    """
+    Drop every cached result of a meeting, e.g. when a new transcript was downloaded.
+    Queries whose meeting name matches `topic` are forgotten too, since they may now
+    resolve to this newer recording instead.
+    """
+    store = get_kv_store()
+    stale = []
+    if meeting_id:
+        prefix = f"{meeting_id}:"
+        stale = [key for key, _ in store.items(RESULT_NAMESPACE) if key.startswith(prefix)]
+        for key in stale:
+            store.delete(RESULT_NAMESPACE, key)
+    if topic:
+        # Every recording of the topic, e.g. earlier occurrences of a recurring meeting
+        same_topic = [entry for _, entry in store.items(zoom_download_cache.NAMESPACE) if entry.get("topic") == topic]
+        meeting_ids = {str(m) for m in [meeting_id, *(entry.get("meeting_id") for entry in same_topic)] if m}
+        transcript_paths = {entry.get("transcript_path") for entry in same_topic}
+        for key, alias in list(store.items(ALIAS_NAMESPACE)):
+            if (
+                alias.get("meeting_id") in meeting_ids
+                or alias.get("transcript_path") in transcript_paths
+                or (alias.get("meeting_name") and alias["meeting_name"] in topic)
+            ):
+                store.delete(ALIAS_NAMESPACE, key)
+    if stale:
+        logger.info(f"🗑️ Invalidated {len(stale)} cached results for meeting {meeting_id}")
+    return len(stale)
+
+
+async def alookup(query: str, context: Optional[Dict]) -> Optional[Dict]:
+    return await run_io(lookup, query, context)
+
+
+async def arecord(query: str, context: Optional[Dict], final_state: Dict, nodes: List[str]) -> bool:
+    return await run_io(record, query, context, final_state, nodes)
@@ -0,0 +1,143 @@
+import asyncio
+import contextvars
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Deque, Dict, Tuple
+from loguru import logger
+from src.config.settings import settings
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITY_CLASSES = (INTERACTIVE, BACKGROUND)
+
+# Priority class of the work running in the current task (inherited by child tasks)
+current_priority: contextvars.ContextVar[str] = contextvars.ContextVar("current_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority(priority_class: str):
+    """Run the enclosed work (and tasks it spawns) under `priority_class`."""
+    if priority_class not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown priority class: {priority_class}")
+    token = current_priority.set(priority_class)
+    try:
+        yield
+    finally:
+        current_priority.reset(token)
+
+
+class PriorityScheduler:
+    """
+    Weighted fair queuing over a fixed number of LLM call slots.
+
+    Each waiting call gets a virtual finish tag of `max(virtual time, last tag
+    of its class) + 1 / weight`, and free slots go to the smallest tag, so
+    under contention each class gets slots in proportion to its weight.
+    `interactive_reserved` slots are never given to background work, so a
+    burst of interactive calls always finds capacity without waiting for
+    background calls to finish.
+    """
+
+    def __init__(self, capacity: int, weights: Dict[str, float], interactive_reserved: int):
+        self.capacity = capacity
+        self.weights = weights
+        self.interactive_reserved = min(interactive_reserved, capacity - 1)
+        self.active = {cls: 0 for cls in PRIORITY_CLASSES}
+        self.granted = {cls: 0 for cls in PRIORITY_CLASSES}
+        self._queues: Dict[str, Deque[Tuple[float, asyncio.Future]]] = {cls: deque() for cls in PRIORITY_CLASSES}
+        self._virtual_time = 0.0
+        self._last_tag = {cls: 0.0 for cls in PRIORITY_CLASSES}
+        self._interactive_idle = asyncio.Event()
+        self._interactive_idle.set()
+
+    def _eligible(self, cls: str) -> bool:
+        if cls == BACKGROUND:
+            return self.active[BACKGROUND] < self.capacity - self.interactive_reserved
+        return True
+
+    def _dispatch(self):
+        while sum(self.active.values()) < self.capacity:
+            heads = [
+                (queue[0][0], cls) for cls, queue in self._queues.items()
+                if queue and self._eligible(cls)
+            ]
+            if not heads:
+                break
+            tag, cls = min(heads)
+            _, waiter = self._queues[cls].popleft()
+            if waiter.done():  # cancelled while queued
+                continue
+            self._virtual_time = tag
+            self.active[cls] += 1
+            self.granted[cls] += 1
+            waiter.set_result(None)
+        self._update_interactive_idle()
+
+    def _update_interactive_idle(self):
+        if self._queues[INTERACTIVE]:
+            self._interactive_idle.clear()
+        else:
+            self._interactive_idle.set()
+
+    async def acquire(self, cls: str):
+        tag = max(self._virtual_time, self._last_tag[cls]) + 1.0 / self.weights[cls]
+        self._last_tag[cls] = tag
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues[cls].append((tag, waiter))
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(cls)
+            else:
+                waiter.cancel()
+                self._queues[cls] = deque(entry for entry in self._queues[cls] if entry[1] is not waiter)
+                self._update_interactive_idle()
+            raise
+
+    def release(self, cls: str):
+        self.active[cls] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, cls: str = None):
+        cls = cls or current_priority.get()
+        await self.acquire(cls)
+        try:
+            yield
+        finally:
+            self.release(cls)
+
+    async def checkpoint(self):
+        """
+        Preemption point for background work, called between pipeline steps.
+        Background work yields here while interactive calls are waiting for a
+        slot (bounded by BACKGROUND_MAX_YIELD_SECONDS); interactive work passes straight through.
+        """
+        if current_priority.get() != BACKGROUND or self._interactive_idle.is_set():
+            return
+        try:
+            await asyncio.wait_for(self._interactive_idle.wait(), timeout=settings.BACKGROUND_MAX_YIELD_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning("⏳ Background work resumed after yielding for the maximum time")
+
+    def stats(self) -> Dict:
+        return {
+            "capacity": self.capacity,
+            "interactive_reserved": self.interactive_reserved,
+            "weights": self.weights,
+            "active": dict(self.active),
+            "queued": {cls: len(queue) for cls, queue in self._queues.items()},
+            "granted": dict(self.granted),
+        }
+
+
+@lru_cache()
+def get_scheduler() -> PriorityScheduler:
+    return PriorityScheduler(
+        capacity=settings.LLM_CONCURRENCY,
+        weights={INTERACTIVE: settings.INTERACTIVE_WEIGHT, BACKGROUND: settings.BACKGROUND_WEIGHT},
+        interactive_reserved=settings.INTERACTIVE_RESERVED_SLOTS,
+    )
@@ -0,0 +1,130 @@
+import asyncio
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from src.llm import get_chat_model
+from src.config.settings import settings
+from src.scheduler import get_scheduler
+from utils.inflight import get_inflight_registry
+from utils.transcript_io import run_io
+from utils.transcript_store import get_transcript_store
+
+logger = logging.getLogger(__name__)
+
+DIGEST_SUFFIX = ".digests.json"
+
+
+class ChunkDigest(BaseModel):
+    notes: List[str]
+    decisions: List[str]
+    action_items: List[str]
+    open_questions: List[str]
+    speakers: List[str]
+
+
+def split_chunks(text: str, max_chars: int) -> List[Dict]:
+    """Split a transcript into line-aligned chunks of roughly max_chars."""
+    lines = text.splitlines()
+    chunks, start, size = [], 0, 0
+    for i, line in enumerate(lines):
+        if i > start and size + len(line) > max_chars:
+            chunks.append({"start": start, "end": i, "text": "\n".join(lines[start:i])})
+            start, size = i, 0
+        size += len(line) + 1
+    if start < len(lines):
+        chunks.append({"start": start, "end": len(lines), "text": "\n".join(lines[start:])})
+    return chunks
+
+
+def fingerprint(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+async def digest_chunk(text: str) -> ChunkDigest:
+    result = await get_chat_model(settings.DIGEST_MODEL).ainvoke(
+        [
+            {
+                "role": "system",
+                "content": "You write compact notes for one segment of a meeting transcript. "
+                           "Keep every point short and factual. Record decisions, action items "
+                           "(with owner and due date when stated), open questions and who spoke. "
+                           "Return JSON.",
+            },
+            {"role": "user", "content": f"Transcript segment:\n{text}"},
+        ],
+        response_format=ChunkDigest,
+    )
+    return result.additional_kwargs["parsed"]
+
+
+def spread(items: List, count: int) -> List:
+    """`count` items evenly spaced over `items`, first and last included."""
+    if count >= len(items):
+        return items
+    if count <= 1:
+        return items[:count]
+    step = (len(items) - 1) / (count - 1)
+    return [items[round(i * step)] for i in range(count)]
+
+
+async def get_or_build_digests(transcript_path: str, text: str, max_new: Optional[int] = None) -> List[Dict]:
+    """
+    Return the chunk digests of a transcript, generating only the chunks that have none yet.
+    Digests are stored next to the transcript (<stem>.digests.json) so every later
+    summary/todo/feedback/question task reuses them instead of re-reading the raw text.
+    With `max_new`, at most that many missing chunks (spread over the meeting) are generated
+    and the result covers only the chunks that have a digest.
+    """
+    digest_file = Path(transcript_path).with_suffix(DIGEST_SUFFIX)
+    # One build per transcript at a time, across worker processes too; the others wait and reuse it
+    async with get_inflight_registry().hold(f"digests:{Path(transcript_path).stem}"):
+        stored = {}
+        if await run_io(digest_file.exists):
+            data = json.loads(await run_io(digest_file.read_text, encoding="utf-8"))
+            stored = {chunk["fingerprint"]: chunk for chunk in data.get("chunks", [])}
+
+        chunks = split_chunks(text, settings.DIGEST_CHUNK_CHARS)
+        for chunk in chunks:
+            chunk["fingerprint"] = fingerprint(chunk.pop("text"))
+        missing = [chunk for chunk in chunks if chunk["fingerprint"] not in stored]
+        if max_new is not None and len(missing) > max_new:
+            logger.info(f"⏳ Digesting {max_new} of {len(missing)} missing chunks to meet the deadline")
+            missing = spread(missing, max_new)
+
+        if missing:
+            logger.info(f"🧾 Generating {len(missing)}/{len(chunks)} chunk digests for {transcript_path}")
+            lines = text.splitlines()
+            semaphore = asyncio.Semaphore(settings.DIGEST_CONCURRENCY)
+
+            async def build(chunk: Dict):
+                await get_scheduler().checkpoint()
+                async with semaphore:
+                    digest = await digest_chunk("\n".join(lines[chunk["start"]:chunk["end"]]))
+                stored[chunk["fingerprint"]] = {**chunk, "digest": digest.model_dump()}
+
+            await asyncio.gather(*(build(chunk) for chunk in missing))
+            data = {"chunks": [stored[chunk["fingerprint"]] for chunk in chunks if chunk["fingerprint"] in stored]}
+            await get_transcript_store().awrite_derived(
+                Path(transcript_path), json.dumps(data, ensure_ascii=False), DIGEST_SUFFIX
+            )
+
+        return [stored[chunk["fingerprint"]] for chunk in chunks if chunk["fingerprint"] in stored]
+
+
+def format_digests(chunks: List[Dict]) -> str:
+    """Render chunk digests as compact text that stands in for the raw transcript."""
+    sections = []
+    for i, chunk in enumerate(chunks, 1):
+        digest = chunk["digest"]
+        parts = [f"### Segment {i} (lines {chunk['start'] + 1}-{chunk['end']})"]
+        for field in ("notes", "decisions", "action_items", "open_questions"):
+            if digest.get(field):
+                parts.append(f"{field.replace('_', ' ').capitalize()}:")
+                parts.extend(f"- {item}" for item in digest[field])
+        if digest.get("speakers"):
+            parts.append(f"Speakers: {', '.join(digest['speakers'])}")
+        sections.append("\n".join(parts))
+    return "\n\n".join(sections)
@@ -0,0 +1,31 @@
+import logging
+from typing import Dict, Optional
+from src.config.settings import settings
+from src.tools.notion_names import normalize_name
+from utils.kv_store import get_kv_store
+from utils.transcript_io import run_io
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "notion_targets"
+
+
+async def get_cached_parent(target_name: str) -> Optional[Dict]:
+    """Resolved {"type", "id"} for a target name, if seen within NOTION_TARGET_CACHE_TTL."""
+    return await run_io(get_kv_store().get, NAMESPACE, normalize_name(target_name))
+
+
+async def cache_parent(target_name: str, parent: Dict):
+    await run_io(
+        get_kv_store().set, NAMESPACE, normalize_name(target_name), parent, settings.NOTION_TARGET_CACHE_TTL
+    )
+
+
+async def invalidate_parent(target_name: str):
+    logger.info(f"🗑️ Dropping cached Notion target '{target_name}'")
+    await run_io(get_kv_store().delete, NAMESPACE, normalize_name(target_name))
+
+
+async def known_parents() -> Dict[str, Dict]:
+    """Every cached target, handed to the fallback agent so it can skip the search step."""
+    return dict(await run_io(lambda: list(get_kv_store().items(NAMESPACE))))
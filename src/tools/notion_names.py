@@ -0,0 +1,6 @@
+import re
+
+
+def normalize_name(name: str) -> str:
+    """Key for comparing Notion titles and target names: whitespace collapsed, case folded."""
+    return re.sub(r"\s+", " ", name).strip().casefold()
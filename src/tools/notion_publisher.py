@@ -0,0 +1,253 @@
+import re
+import logging
+from typing import Dict, List, Optional
+import httpx
+from src.cassette import http_transport, run_date
+from src.config.settings import settings
+from src.deadline import http_timeout
+from src.tools.notion_cache import get_cached_parent, cache_parent, invalidate_parent
+from src.tools.notion_names import normalize_name
+
+logger = logging.getLogger(__name__)
+
+# Notion API limits
+MAX_BLOCKS_PER_REQUEST = 100
+MAX_TEXT_LENGTH = 2000
+
+# Per-call timeout, shortened to the request deadline when there is one
+NOTION_TIMEOUT_SECONDS = 30.0
+
+# Pooled client shared by every publish, created on first use
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_notion_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=settings.NOTION_API_BASE_URL,
+            headers={
+                "Authorization": f"Bearer {settings.NOTION_TOKEN}",
+                "Notion-Version": settings.NOTION_VERSION,
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            timeout=httpx.Timeout(NOTION_TIMEOUT_SECONDS),
+            transport=http_transport("notion"),
+        )
+    return _client
+
+
+async def close_notion_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# === Debrief text -> Notion blocks ===
+def rich_text(text: str) -> List[Dict]:
+    return [
+        {"type": "text", "text": {"content": text[i:i + MAX_TEXT_LENGTH]}}
+        for i in range(0, len(text), MAX_TEXT_LENGTH)
+    ] or [{"type": "text", "text": {"content": ""}}]
+
+
+def block(block_type: str, text: str, **extra) -> Dict:
+    return {"object": "block", "type": block_type, block_type: {"rich_text": rich_text(text), **extra}}
+
+
+def text_to_blocks(text: str) -> List[Dict]:
+    """Convert the markdown-ish debrief text into Notion blocks."""
+    blocks = []
+    for raw in (text or "").splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("### "):
+            blocks.append(block("heading_3", line[4:]))
+        elif line.startswith("## "):
+            blocks.append(block("heading_2", line[3:]))
+        elif line.startswith("# "):
+            blocks.append(block("heading_1", line[2:]))
+        elif re.match(r"^[-*] \[[ xX]\] ", line):
+            blocks.append(block("to_do", line[6:], checked=line[3] in "xX"))
+        elif re.match(r"^[-*•] ", line):
+            blocks.append(block("bulleted_list_item", line[2:]))
+        elif re.match(r"^\d+[.)] ", line):
+            blocks.append(block("numbered_list_item", line.split(" ", 1)[1]))
+        else:
+            blocks.append(block("paragraph", line))
+    return blocks
+
+
+def debrief_to_blocks(summary: Optional[str], todo: Optional[str], feedback: Optional[str]) -> List[Dict]:
+    blocks = []
+    for title, text in (("Summary", summary), ("Todo", todo), ("Feedback", feedback)):
+        if text:
+            blocks.append(block("heading_2", title))
+            blocks.extend(text_to_blocks(text))
+    return blocks
+
+
+# === Parent resolution ===
+# Words that name the kind of target rather than an actual page ("save to a new Notion page")
+GENERIC_TARGETS = {"notion", "a notion", "the notion", "new", "a new", "a new notion", "new notion", "a"}
+
+
+def extract_target_name(*texts: str) -> str:
+    """Find the parent page/database named in the request, falling back to the configured default."""
+    for text in texts:
+        if not text:
+            continue
+        for named in re.finditer(r"\b(?:under|in|into|to)\s+(?:the\s+)?(.+?)\s+(?:page|database)\b", text, re.IGNORECASE):
+            if normalize_name(named.group(1)) not in GENERIC_TARGETS:
+                return named.group(1).strip()
+        quoted = re.search(r"[\"“「](.+?)[\"”」]", text)
+        if quoted:
+            return quoted.group(1).strip()
+    return settings.NOTION_DEFAULT_PARENT
+
+
+def result_title(result: Dict) -> str:
+    if result.get("object") == "database":
+        parts = result.get("title", [])
+    else:
+        parts = next(
+            (prop.get("title", []) for prop in result.get("properties", {}).values() if prop.get("type") == "title"),
+            [],
+        )
+    return "".join(part.get("plain_text") or part.get("text", {}).get("content", "") for part in parts)
+
+
+async def search_parent(target_name: str) -> Optional[Dict]:
+    """
+    Search Notion for the target page/database.
+    Returns {"type": "page"|"database", "id": ...} on exactly one exact-title match, None if ambiguous.
+    """
+    resp = await get_notion_client().post(
+        "/search", json={"query": target_name, "page_size": 20}, timeout=http_timeout(NOTION_TIMEOUT_SECONDS)
+    )
+    resp.raise_for_status()
+    wanted = normalize_name(target_name)
+    matches = [r for r in resp.json().get("results", []) if normalize_name(result_title(r)) == wanted]
+    if len(matches) != 1:
+        logger.info(f"Notion target '{target_name}' is ambiguous ({len(matches)} exact matches)")
+        return None
+    return {"type": matches[0]["object"], "id": matches[0]["id"]}
+
+
+# === Page creation ===
+class IncompletePageError(Exception):
+    """The page was created, but appending its remaining blocks failed."""
+
+    def __init__(self, page: Dict, appended: int, total: int, error: httpx.HTTPError):
+        super().__init__(f"Notion page {page.get('id')} has only {appended} of {total} blocks: {error}")
+        self.page = page
+        self.appended = appended
+        self.total = total
+        self.error = error
+
+
+class PageMaybeCreatedError(Exception):
+    """POST /pages timed out or failed on Notion's side: the page may exist although no id came back."""
+
+    def __init__(self, parent: Dict, title: str, error: httpx.HTTPError):
+        super().__init__(f"Notion did not confirm page '{title}' under {parent['id']}: {error}")
+        self.parent = parent
+        self.title = title
+        self.error = error
+
+
+# The request never reached Notion, so no page can have been created
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+async def database_title_property(database_id: str) -> str:
+    resp = await get_notion_client().get(f"/databases/{database_id}", timeout=http_timeout(NOTION_TIMEOUT_SECONDS))
+    resp.raise_for_status()
+    return next(
+        (name for name, prop in resp.json().get("properties", {}).items() if prop.get("type") == "title"),
+        "Name",
+    )
+
+
+async def create_page(parent: Dict, title: str, blocks: List[Dict]) -> Dict:
+    """
+    Create the page with the first 100 blocks, then append the rest in batches of 100.
+    Raises IncompletePageError when an append fails after the page was created, and
+    PageMaybeCreatedError when the create call itself ends without a clear answer.
+    """
+    client = get_notion_client()
+    if parent["type"] == "database":
+        title_property = await database_title_property(parent["id"])
+        body = {
+            "parent": {"database_id": parent["id"]},
+            "properties": {title_property: {"title": rich_text(title)}},
+        }
+    else:
+        body = {
+            "parent": {"page_id": parent["id"]},
+            "properties": {"title": {"title": rich_text(title)}},
+        }
+    body["children"] = blocks[:MAX_BLOCKS_PER_REQUEST]
+    try:
+        resp = await client.post("/pages", json=body, timeout=http_timeout(NOTION_TIMEOUT_SECONDS))
+    except NOT_SENT_ERRORS:
+        raise
+    except httpx.TransportError as e:
+        # e.g. a read timeout: Notion may have created the page before the response was lost
+        raise PageMaybeCreatedError(parent, title, e) from e
+    if resp.status_code >= 500:
+        raise PageMaybeCreatedError(parent, title, httpx.HTTPStatusError(
+            f"Notion answered {resp.status_code}", request=resp.request, response=resp,
+        ))
+    # A 4xx means the page was not created
+    resp.raise_for_status()
+    page = resp.json()
+
+    for start in range(MAX_BLOCKS_PER_REQUEST, len(blocks), MAX_BLOCKS_PER_REQUEST):
+        try:
+            resp = await client.patch(
+                f"/blocks/{page['id']}/children",
+                json={"children": blocks[start:start + MAX_BLOCKS_PER_REQUEST]},
+                timeout=http_timeout(NOTION_TIMEOUT_SECONDS),
+            )
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            # The page exists now: report against it rather than let a retry create a second one
+            raise IncompletePageError(page, start, len(blocks), e) from e
+    return page
+
+
+async def publish_debrief(state: Dict) -> Optional[Dict]:
+    """
+    Publish the debrief to Notion without the agent loop.
+    Returns the created page, or None when the target parent is ambiguous and the agent should decide.
+    """
+    target_name = extract_target_name(state.get("next_step", ""), state.get("last_user_message", ""))
+    title = f"{state.get('meeting_name') or 'Meeting'} debrief - {run_date().isoformat()}"
+    blocks = debrief_to_blocks(state.get("summary"), state.get("todo"), state.get("feedback"))
+
+    parent = await get_cached_parent(target_name)
+    if parent:
+        try:
+            page = await create_page(parent, title, blocks)
+            logger.info(f"✅ Published debrief to Notion page {page.get('id')} under cached '{target_name}'")
+            return {"page": page, "parent": parent, "target_name": target_name, "block_count": len(blocks)}
+        except httpx.HTTPStatusError as e:
+            # Only the parent lookup and the page creation get here: a failed append raises
+            # IncompletePageError, and its 404 says nothing about the parent
+            if e.response.status_code != 404:
+                raise
+            # Parent was deleted or moved: forget it and resolve again
+            await invalidate_parent(target_name)
+
+    parent = await search_parent(target_name)
+    if parent is None:
+        return None
+    await cache_parent(target_name, parent)
+
+    page = await create_page(parent, title, blocks)
+    logger.info(f"✅ Published debrief to Notion page {page.get('id')} under '{target_name}'")
+    return {"page": page, "parent": parent, "target_name": target_name, "block_count": len(blocks)}
@@ -1,22 +1,91 @@
 # src/tools/notion_tools.py
-from langchain_mcp_adapters.client import MultiServerMCPClient
+import asyncio
+import shlex
+from functools import lru_cache
+from typing import List, Optional
+from loguru import logger
+from src.cassette import replayed_mcp_tools, wrap_mcp_tools
 from src.config.settings import settings
 
-client = MultiServerMCPClient({
-    "notion": {
-        "command": "npx",
-        "args": ["-y", "@notionhq/notion-mcp-server"],
-        "transport": "stdio",
-        "env": {
-            "OPENAPI_MCP_HEADERS": (
-                '{"Authorization": "Bearer ' + settings.NOTION_TOKEN + '",'
-                '"Notion-Version": "2022-06-28"}'
-            )
-        },
-    }
-})
+
+@lru_cache()
+def get_mcp_client():
+    """The MCP client (and the langchain_mcp_adapters import) is only needed once the agent falls back to MCP."""
+    from langchain_mcp_adapters.client import MultiServerMCPClient
+    return MultiServerMCPClient({
+        "notion": {
+            "command": settings.NOTION_MCP_COMMAND,
+            "args": shlex.split(settings.NOTION_MCP_ARGS),
+            "transport": "stdio",
+            "env": {
+                "OPENAPI_MCP_HEADERS": (
+                    '{"Authorization": "Bearer ' + settings.NOTION_TOKEN + '",'
+                    '"Notion-Version": "2022-06-28"}'
+                )
+            },
+        }
+    })
+
+
+# Tools bound to a long-lived MCP session, set while start_notion_session's task holds it open
+_session_tools: Optional[List] = None
+_session_task: Optional[asyncio.Task] = None
+_session_stop: Optional[asyncio.Event] = None
+
+
+async def _hold_session(ready: asyncio.Future):
+    """Keep one MCP server process and session open; entered and exited in this task, as anyio requires."""
+    global _session_tools
+    from langchain_mcp_adapters.tools import load_mcp_tools
+    try:
+        async with get_mcp_client().session("notion") as session:
+            _session_tools = await wrap_mcp_tools(await load_mcp_tools(session, server_name="notion"))
+            ready.set_result(len(_session_tools))
+            await _session_stop.wait()
+    except Exception as e:
+        if not ready.done():
+            ready.set_exception(e)
+        else:
+            logger.error(f"❌ Notion MCP session ended: {e}")
+    finally:
+        _session_tools = None
+
+
+async def start_notion_session() -> int:
+    """Spawn the Notion MCP server once and keep its session for every later agent call."""
+    global _session_task, _session_stop, _session_tools
+    if _session_tools is not None:
+        return len(_session_tools)
+    replayed = replayed_mcp_tools()
+    if replayed is not None:
+        _session_tools = replayed
+        return len(replayed)
+    _session_stop = asyncio.Event()
+    ready = asyncio.get_running_loop().create_future()
+    _session_task = asyncio.create_task(_hold_session(ready), name="notion-mcp-session")
+    # Shielded: a warm-up timeout must not cancel the session that is still starting
+    return await asyncio.shield(ready)
+
+
+async def stop_notion_session():
+    global _session_task
+    if _session_task is None:
+        return
+    _session_stop.set()
+    try:
+        await asyncio.wait_for(_session_task, timeout=10)
+    except (asyncio.TimeoutError, Exception):
+        _session_task.cancel()
+    _session_task = None
+
 
 # Instead of trying to `await` at the top-level,
 # provide an async function to fetch the tools
 async def get_notion_tools():
-    return await client.get_tools()
+    if _session_tools is not None:
+        return _session_tools
+    replayed = replayed_mcp_tools()
+    if replayed is not None:
+        return replayed
+    # No warm session: every tool call spawns its own server process
+    return await wrap_mcp_tools(await get_mcp_client().get_tools())
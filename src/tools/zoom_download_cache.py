@@ -0,0 +1,134 @@
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+from utils.kv_store import get_kv_store
+from utils.transcript_io import run_io
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "zoom_downloads"
+
+# Preference when a recording has more than one transcript file
+TRANSCRIPT_FILE_TYPES = ("TRANSCRIPT", "VTT")
+
+
+def select_transcript_file(files: List[Dict]) -> Optional[Dict]:
+    """
+    Pick the single best transcript among a recording's files.
+    Prefers TRANSCRIPT over VTT, completed files over in-progress ones, then the larger file.
+    """
+    candidates = [
+        f for f in files
+        if f.get("file_type") in TRANSCRIPT_FILE_TYPES and f.get("download_url")
+    ]
+    if not candidates:
+        return None
+    return min(
+        candidates,
+        key=lambda f: (
+            TRANSCRIPT_FILE_TYPES.index(f["file_type"]),
+            f.get("status", "completed") != "completed",
+            -(f.get("file_size") or 0),
+        ),
+    )
+
+
+def cache_key(recording_file: Dict) -> str:
+    return str(recording_file.get("id") or recording_file.get("download_url"))
+
+
+def _is_fresh(entry: Dict, recording_file: Dict) -> bool:
+    if entry.get("file_size") != recording_file.get("file_size"):
+        return False
+    if entry.get("recording_end") != recording_file.get("recording_end"):
+        return False
+    vtt_path = Path(entry["vtt_path"])
+    transcript_path = Path(entry["transcript_path"])
+    if not (vtt_path.exists() and transcript_path.exists()):
+        return False
+    expected_size = recording_file.get("file_size")
+    return not expected_size or vtt_path.stat().st_size == expected_size
+
+
+def lookup(recording_file: Dict) -> Optional[Dict]:
+    """Return the cached entry if the local .vtt and .txt still match the Zoom file."""
+    entry = get_kv_store().get(NAMESPACE, cache_key(recording_file))
+    if entry and _is_fresh(entry, recording_file):
+        return entry
+    return None
+
+
+async def alookup(recording_file: Dict) -> Optional[Dict]:
+    return await run_io(lookup, recording_file)
+
+
+def record(
+    meeting: Dict,
+    recording_file: Dict,
+    vtt_path: Path,
+    transcript_path: Path,
+    ingested_via: str = "query",
+) -> Dict:
+    entry = {
+        "file_id": recording_file.get("id"),
+        "meeting_id": meeting.get("id"),
+        "uuid": meeting.get("uuid"),
+        "topic": meeting.get("topic", "").strip(),
+        "start_time": meeting.get("start_time"),
+        "file_type": recording_file.get("file_type"),
+        "file_size": recording_file.get("file_size"),
+        "recording_end": recording_file.get("recording_end"),
+        "vtt_path": str(vtt_path),
+        "transcript_path": str(transcript_path),
+        "ingested_via": ingested_via,
+        "updated_at": time.time(),
+    }
+    get_kv_store().set(NAMESPACE, cache_key(recording_file), entry)
+    # A new download means the meeting's transcript changed, so earlier results are stale
+    from src.result_cache import invalidate_meeting
+    invalidate_meeting(entry["meeting_id"], entry["topic"])
+    logger.info(f"💾 Recorded download cache entry for {entry['topic']} ({entry['file_id']})")
+    return entry
+
+
+async def arecord(
+    meeting: Dict,
+    recording_file: Dict,
+    vtt_path: Path,
+    transcript_path: Path,
+    ingested_via: str = "query",
+) -> Dict:
+    return await run_io(record, meeting, recording_file, vtt_path, transcript_path, ingested_via)
+
+
+def find_by_transcript_path(transcript_path: str) -> Optional[Dict]:
+    """The download cache entry whose processed transcript is `transcript_path`, if any."""
+    for _, entry in get_kv_store().items(NAMESPACE):
+        if entry.get("transcript_path") == str(transcript_path):
+            return entry
+    return None
+
+
+def find_by_topic(meeting_name: str) -> Optional[Dict]:
+    """
+    Local lookup of an ingested transcript by (partial) meeting topic.
+    Only entries ingested from a webhook are trusted here: webhook ingestion sees every
+    completed recording, so the newest matching entry is the newest meeting on Zoom too.
+    """
+    matches = [
+        entry for _, entry in get_kv_store().items(NAMESPACE)
+        if meeting_name in entry.get("topic", "")
+    ]
+    if not matches:
+        return None
+    latest = max(matches, key=lambda entry: entry.get("start_time") or "")
+    if latest.get("ingested_via") != "webhook":
+        return None
+    if not Path(latest["transcript_path"]).exists():
+        return None
+    return latest
+
+
+async def afind_by_topic(meeting_name: str) -> Optional[Dict]:
+    return await run_io(find_by_topic, meeting_name)
@@ -1,53 +1,80 @@
+import asyncio
 import time
 import urllib.parse
+from datetime import date, timedelta
 import httpx
-import re
 import logging
 from pathlib import Path
 from langchain_core.tools import tool
+from src.cassette import http_transport
 from src.config.settings import settings
+from src.deadline import http_timeout
+from utils.inflight import get_inflight_registry
+from utils.kv_store import get_kv_store
+from utils.transcript_io import run_io
+from utils.transcript_store import get_transcript_store
+from utils.transcript_index import get_transcript_index
+from utils.vtt import clean_line
+from src.tools import zoom_download_cache
 
 # === Zoom App Credentials ===
 ZOOM_ACCOUNT_ID = settings.ZOOM_ACCOUNT_ID
 ZOOM_CLIENT_ID = settings.ZOOM_CLIENT_ID
 ZOOM_CLIENT_SECRET = settings.ZOOM_CLIENT_SECRET
 
-# Token cache
+# Token cache: this process's copy of the token shared by all worker processes through the KV store
+# (the cache database holds a live token, keep CACHE_DB_PATH as private as .env)
 access_token = None
 token_expiry = 0
-
-# Download directory
-DOWNLOAD_DIR = Path("zoom_transcripts")
-DOWNLOAD_DIR.mkdir(exist_ok=True)
+TOKEN_NAMESPACE = "zoom_tokens"
 
 # Logger
 logger = logging.getLogger(__name__)
 
 
-# === Helper: Get Zoom Access Token ===
-async def get_access_token():
-    global access_token, token_expiry
-    now = time.time()
-    if access_token and now < token_expiry:
-        return access_token
+def zoom_http_client(**kwargs) -> httpx.AsyncClient:
+    """
+    httpx client for Zoom calls, recorded or replayed when a cassette is active.
+    Keeps httpx's default 5s timeout, shortened to the request deadline when there is one.
+    """
+    return httpx.AsyncClient(transport=http_transport("zoom"), timeout=http_timeout(5.0, connect=5.0), **kwargs)
+
 
-    url = f"https://zoom.us/oauth/token?grant_type=account_credentials&account_id={ZOOM_ACCOUNT_ID}"
-    async with httpx.AsyncClient() as client:
+# === Helper: Get Zoom Access Token ===
+async def request_access_token() -> dict:
+    url = f"{settings.ZOOM_OAUTH_URL}?grant_type=account_credentials&account_id={ZOOM_ACCOUNT_ID}"
+    async with zoom_http_client() as client:
         resp = await client.post(url, auth=(ZOOM_CLIENT_ID, ZOOM_CLIENT_SECRET))
         resp.raise_for_status()
         data = resp.json()
-        access_token = data["access_token"]
-        token_expiry = now + data["expires_in"] - 60
+    lifetime = data["expires_in"] - 60
+    token = {"access_token": data["access_token"], "expires_at": time.time() + lifetime}
+    await run_io(get_kv_store().set, TOKEN_NAMESPACE, ZOOM_ACCOUNT_ID, token, lifetime)
+    return token
+
+
+async def get_access_token():
+    global access_token, token_expiry
+    if access_token and time.time() < token_expiry:
         return access_token
 
+    # One token request across worker processes, the others pick the token up from the store
+    token = await get_inflight_registry().single_flight(
+        f"zoom_token:{ZOOM_ACCOUNT_ID}",
+        lookup=lambda: run_io(get_kv_store().get, TOKEN_NAMESPACE, ZOOM_ACCOUNT_ID),
+        compute=request_access_token,
+    )
+    access_token, token_expiry = token["access_token"], token["expires_at"]
+    return access_token
+
 
-# === Download transcript file ===
-async def download_file(download_url: str, filename: Path, token: str):
+# === Download transcript file into the transcript store ===
+async def download_file(download_url: str, token: str) -> Path:
     url_with_token = f"{download_url}?access_token={token}"
-    async with httpx.AsyncClient(follow_redirects=True) as client:
+    async with zoom_http_client(follow_redirects=True) as client:
         resp = await client.get(url_with_token)
         resp.raise_for_status()
-        filename.write_bytes(resp.content)
+        filename = await get_transcript_store().aput_bytes(resp.content, ".vtt")
         logger.info(f"✅ Downloaded transcript: {filename}")
     return filename
 
@@ -58,28 +85,107 @@ def process_transcript(vtt_file: Path) -> Path:
     Convert Zoom WEBVTT transcript into simple 'Speaker: text' lines.
     """
     lines_out = []
-    with vtt_file.open("r", encoding="utf-8") as f:
+    with vtt_file.open("r", encoding="utf-8-sig") as f:
         for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith("WEBVTT"):
-                continue
-            if re.match(r"^\d+$", line):  # skip cue numbers
-                continue
-            if "-->" in line:  # skip timestamps
-                continue
-            # Keep only actual transcript lines
-            lines_out.append(line)
-
-    # Save cleaned transcript
-    clean_file = vtt_file.with_suffix(".txt")
-    clean_file.write_text("\n".join(lines_out), encoding="utf-8")
+            # Keep only actual transcript lines (no header, cue numbers or timestamps)
+            line = clean_line(line)
+            if line is not None:
+                lines_out.append(line)
+
+    # Save cleaned transcript next to its source in the transcript store
+    clean_file = get_transcript_store().write_derived(vtt_file, "\n".join(lines_out), ".txt")
     logger.info(f"📝 Cleaned transcript saved to {clean_file}")
+
+    # Incrementally add the new transcript to the full-text index
+    get_transcript_index().add_transcript(clean_file)
     return clean_file
 
 
-# === Tool: Search Zoom Recordings by Topic and Return Transcript ===
+# === List account recordings across date windows ===
+async def iter_account_recordings(token: str, from_date: date, to_date: date, window_days: int = 30, page_size: int = 300):
+    """
+    Yield every meeting from /accounts/me/recordings between from_date and to_date (inclusive).
+    The range is split into windows (Zoom caps a single query at one month) and each window is paginated.
+    """
+    if window_days < 1:
+        raise ValueError(f"window_days must be at least 1, got {window_days}")
+    url = f"{settings.ZOOM_API_BASE_URL}/accounts/me/recordings"
+    window_start = from_date
+    async with zoom_http_client() as client:
+        while window_start <= to_date:
+            window_end = min(window_start + timedelta(days=window_days - 1), to_date)
+            next_page_token = ""
+            while True:
+                params = {
+                    "from": window_start.isoformat(),
+                    "to": window_end.isoformat(),
+                    "page_size": page_size,
+                }
+                if next_page_token:
+                    params["next_page_token"] = next_page_token
+                resp = await client.get(url, headers={"Authorization": f"Bearer {token}"}, params=params)
+                resp.raise_for_status()
+                data = resp.json()
+                for meeting in data.get("meetings", []):
+                    yield meeting
+                next_page_token = data.get("next_page_token")
+                if not next_page_token:
+                    break
+            window_start = window_end + timedelta(days=1)
+
+
+# === Fetch (or reuse) the transcript of one meeting ===
+async def fetch_meeting_transcript(meeting: dict, token: str, ingested_via: str = "query") -> dict | None:
+    """
+    Resolve the best transcript file of a meeting and make sure a processed copy exists locally.
+    Skips the download and reprocessing when the download cache says the local copy matches Zoom.
+    """
+    topic = meeting.get("topic", "").strip()
+    meeting_id = meeting.get("id")
+
+    files = meeting.get("recording_files")
+    if files is None:
+        encoded_uuid = urllib.parse.quote(urllib.parse.quote(meeting.get("uuid"), safe=""), safe="")
+        url = f"{settings.ZOOM_API_BASE_URL}/meetings/{encoded_uuid}/recordings"
+        async with zoom_http_client() as client:
+            resp = await client.get(url, headers={"Authorization": f"Bearer {token}"})
+            resp.raise_for_status()
+            files = resp.json().get("recording_files", [])
+    print(f"[zoom_find_transcript] 🎥 Found {len(files)} recording files")
+
+    recording_file = zoom_download_cache.select_transcript_file(files)
+    if recording_file is None:
+        return None
+
+    cached = await zoom_download_cache.alookup(recording_file)
+    if cached:
+        print(f"[zoom_find_transcript] ♻️ Local transcript is up to date: {cached['transcript_path']}")
+        clean_file = cached["transcript_path"]
+    else:
+        async def download() -> dict:
+            file_type = recording_file.get("file_type")
+            print(f"[zoom_find_transcript] ⬇️ Downloading {file_type} transcript for {topic}")
+            vtt_file = await download_file(recording_file["download_url"], token)
+
+            clean_file = await run_io(process_transcript, vtt_file)
+            print(f"[zoom_find_transcript] 🧹 Processed transcript saved at {clean_file}")
+            return await zoom_download_cache.arecord(meeting, recording_file, vtt_file, clean_file, ingested_via)
+
+        # Concurrent requests (in any worker process) for the same file share one download
+        entry = await get_inflight_registry().single_flight(
+            f"zoom_download:{zoom_download_cache.cache_key(recording_file)}",
+            lookup=lambda: zoom_download_cache.alookup(recording_file),
+            compute=download,
+        )
+        clean_file = entry["transcript_path"]
+
+    return {
+        "meeting_id": meeting_id,
+        "topic": topic,
+        "transcript_path": str(clean_file),
+    }
+
+
 # === Tool: Search Zoom Recordings by Topic and Return Transcript ===
 @tool("zoom_find_transcript")
 async def zoom_find_transcript(meeting_name: str) -> dict:
@@ -90,12 +196,23 @@ async def zoom_find_transcript(meeting_name: str) -> dict:
     """
 
     print(f"[zoom_find_transcript] Searching transcript for meeting: {meeting_name}")
+
+    # Transcripts pushed by the Zoom webhook are already processed locally
+    ingested = await zoom_download_cache.afind_by_topic(meeting_name)
+    if ingested:
+        print(f"[zoom_find_transcript] ⚡ Using pre-ingested transcript for {ingested['topic']}")
+        return {
+            "meeting_id": ingested["meeting_id"],
+            "topic": ingested["topic"],
+            "transcript_path": ingested["transcript_path"],
+        }
+
     token = await get_access_token()
     print("[zoom_find_transcript] ✅ Got access token")
 
     # List account recordings
-    url = "https://api.zoom.us/v2/accounts/me/recordings"
-    async with httpx.AsyncClient() as client:
+    url = f"{settings.ZOOM_API_BASE_URL}/accounts/me/recordings"
+    async with zoom_http_client() as client:
         resp = await client.get(url, headers={"Authorization": f"Bearer {token}"}, params={"page_size": 30})
         resp.raise_for_status()
         data = resp.json()
@@ -113,42 +230,47 @@ async def zoom_find_transcript(meeting_name: str) -> dict:
         print("MEETING NAME", meeting_name)
         print("TOPIC", topic)
         print(f"[zoom_find_transcript] ✅ Match found for topic: {topic}")
-        encoded_uuid = urllib.parse.quote(urllib.parse.quote(uuid, safe=""), safe="")
-        url = f"https://api.zoom.us/v2/meetings/{encoded_uuid}/recordings"
-
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, headers={"Authorization": f"Bearer {token}"})
-            resp.raise_for_status()
-            rec_data = resp.json()
-        print(f"[zoom_find_transcript] 🎥 Found {len(rec_data.get('recording_files', []))} recording files")
-
-        files = rec_data.get("recording_files", [])
-        for f in files:
-            file_type = f.get("file_type")
-            download_url = f.get("download_url")
-            print(f"[zoom_find_transcript] ▶️ File type={file_type}, download_url={bool(download_url)}")
-
-            if not download_url:
-                continue
-
-            if file_type in ("TRANSCRIPT", "VTT"):
-                safe_topic = topic.replace(" ", "_")
-                filename = DOWNLOAD_DIR / f"{meeting_id}_{safe_topic}_{file_type}.vtt"
-                print(f"[zoom_find_transcript] ⬇️ Downloading transcript to {filename}")
-                vtt_file = await download_file(download_url, filename, token)
-
-                clean_file = process_transcript(vtt_file)
-                print(f"[zoom_find_transcript] 🧹 Processed transcript saved at {clean_file}")
-                transcript_text = clean_file.read_text(encoding="utf-8")
-
-                print(f"[zoom_find_transcript] ✅ Returning transcript for {topic}")
-                return {
-                    "meeting_id": meeting_id,
-                    "topic": topic,
-                    "transcript_path": str(clean_file),
-                }
+        result = await fetch_meeting_transcript(meeting, token)
+        if result:
+            print(f"[zoom_find_transcript] ✅ Returning transcript for {topic}")
+            return result
 
     print(f"[zoom_find_transcript] ❌ No transcript found for meeting: {meeting_name}")
     return {"error": f"No transcript found for meeting '{meeting_name}'"}
 
-ZOOM_TOOLS = [zoom_find_transcript]
\ No newline at end of file
+# === Tool: Find Transcripts of Every Matching Meeting in a Date Range ===
+@tool("zoom_find_transcripts")
+async def zoom_find_transcripts(meeting_name: str, from_date: str, to_date: str) -> dict:
+    """
+    Find all Zoom meetings whose topic contains meeting_name between from_date and to_date,
+    and make their transcripts available locally. Use this for questions about several meetings
+    (e.g. "all standups this week").
+    Input: meeting_name (str) - part of the meeting topic, from_date / to_date (str) - YYYY-MM-DD.
+    Output: dict with a "meetings" list of meeting_id, topic, start_time and transcript_path.
+    """
+    print(f"[zoom_find_transcripts] Searching meetings '{meeting_name}' from {from_date} to {to_date}")
+    token = await get_access_token()
+
+    matches = []
+    async for meeting in iter_account_recordings(token, date.fromisoformat(from_date), date.fromisoformat(to_date)):
+        if meeting_name in meeting.get("topic", ""):
+            matches.append(meeting)
+    print(f"[zoom_find_transcripts] ✅ {len(matches)} matching meetings")
+
+    semaphore = asyncio.Semaphore(settings.ZOOM_DOWNLOAD_CONCURRENCY)
+
+    async def fetch(meeting: dict):
+        async with semaphore:
+            return await fetch_meeting_transcript(meeting, token)
+
+    results = await asyncio.gather(*(fetch(m) for m in matches))
+    meetings = [
+        {**result, "start_time": meeting.get("start_time")}
+        for meeting, result in zip(matches, results)
+        if result
+    ]
+    if not meetings:
+        return {"error": f"No transcripts found for meetings matching '{meeting_name}'"}
+    return {"meetings": meetings}
+
+ZOOM_TOOLS = [zoom_find_transcript, zoom_find_transcripts]
\ No newline at end of file
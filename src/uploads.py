@@ -0,0 +1,279 @@
+import codecs
+import hashlib
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from loguru import logger
+from src.config.settings import settings
+from utils.kv_store import get_kv_store
+from utils.transcript_index import get_transcript_index
+from utils.transcript_io import run_io
+from utils.transcript_store import get_transcript_store
+from utils.vtt import clean_line
+
+# transcript id (content hash) -> metadata of an uploaded transcript
+UPLOAD_NAMESPACE = "transcript_uploads"
+
+FORMATS = ("vtt", "srt", "txt")
+CONTENT_TYPES = {
+    "text/vtt": "vtt",
+    "application/x-subrip": "srt",
+    "application/srt": "srt",
+    "text/srt": "srt",
+}
+
+
+class UploadError(ValueError):
+    """An upload that cannot become a transcript; `status` is the HTTP status to answer with."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def declared_format(fmt: Optional[str], filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """Format named by the client (parameter, file extension or content type); None means sniff it."""
+    if fmt:
+        fmt = fmt.lower().lstrip(".")
+        fmt = "txt" if fmt in ("text", "plain") else fmt
+        if fmt not in FORMATS:
+            raise UploadError(f"format must be one of {', '.join(FORMATS)}")
+        return fmt
+    suffix = Path(filename or "").suffix.lower().lstrip(".")
+    if suffix in FORMATS:
+        return suffix
+    return CONTENT_TYPES.get((content_type or "").split(";")[0].strip().lower())
+
+
+def sniff_format(first_line: str) -> str:
+    line = first_line.strip()
+    if line.startswith("WEBVTT"):
+        return "vtt"
+    if line.isdecimal() or "-->" in line:
+        return "srt"
+    return "txt"
+
+
+class TranscriptUpload:
+    """
+    One transcript upload, cleaned while it streams in.
+
+    Each chunk is hashed and appended to a temporary copy of the raw file, and its
+    complete lines are cleaned into 'Speaker: text' lines (as process_transcript does
+    for Zoom downloads) written to a temporary `.txt`. Only the current partial line is
+    kept in memory, so a transcript of any size is ingested in constant memory.
+    finish() moves both files to their content-hash names in the transcript store and
+    indexes the cleaned text. Methods do file I/O and belong on the transcript I/O pool.
+    """
+
+    def __init__(self, fmt: Optional[str] = None, name: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.store = get_transcript_store()
+        self.format = fmt
+        self.name = name
+        self.max_bytes = max_bytes if max_bytes is not None else settings.UPLOAD_MAX_MB * 1024 * 1024
+        self.size = 0
+        self.lines = 0
+        self._hash = hashlib.sha256()
+        # utf-8-sig drops the byte order mark some caption editors write
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        self._pending = ""
+        root = self.store.ensure_root()
+        # Dot-prefixed temporaries are skipped by the store's disk quota accounting
+        token = uuid.uuid4().hex
+        self._raw_tmp = root / f".upload-{token}.raw.tmp"
+        self._clean_tmp = root / f".upload-{token}.txt.tmp"
+        self._raw = self._raw_tmp.open("wb")
+        self._clean = self._clean_tmp.open("w", encoding="utf-8")
+
+    def feed(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadError(f"Transcript exceeds the upload limit of {settings.UPLOAD_MAX_MB} MB", status=413)
+        self._hash.update(chunk)
+        self._raw.write(chunk)
+        self._clean_text(self._decoder.decode(chunk))
+
+    def _clean_text(self, text: str):
+        lines = (self._pending + text).split("\n")
+        self._pending = lines.pop()
+        for line in lines:
+            self._clean_line(line)
+
+    def _clean_line(self, line: str):
+        if self.format is None:
+            if not line.strip():
+                return
+            self.format = sniff_format(line)
+        cleaned = clean_line(line, timed=self.format != "txt")
+        if cleaned is None:
+            return
+        self._clean.write(f"\n{cleaned}" if self.lines else cleaned)
+        self.lines += 1
+
+    def finish(self) -> Dict:
+        """Store the upload under its content hash, index it and return its metadata."""
+        self._clean_text(self._decoder.decode(b"", final=True))
+        self._clean_line(self._pending)
+        self._pending = ""
+        self._raw.close()
+        self._clean.close()
+        if not self.lines:
+            self.discard()
+            raise UploadError("Upload contains no transcript text")
+
+        digest = self._hash.hexdigest()
+        clean_path = self.store.path_for(digest, ".txt")
+        if self.format == "txt":
+            self._raw_tmp.unlink(missing_ok=True)
+        else:
+            # Kept for the timing-based analytics (see utils/vtt.load_cues)
+            os.replace(self._raw_tmp, self.store.path_for(digest, f".{self.format}"))
+        os.replace(self._clean_tmp, clean_path)
+        self.store.enforce_quota(keep={digest})
+        get_transcript_index().add_transcript(clean_path)
+
+        record = {
+            "transcript_id": digest,
+            "transcript_path": str(clean_path),
+            "meeting_id": f"upload-{digest[:16]}",
+            "meeting_name": self.name or f"Uploaded transcript {digest[:8]}",
+            "format": self.format,
+            "bytes": self.size,
+            "lines": self.lines,
+            "uploaded_at": time.time(),
+        }
+        get_kv_store().set(UPLOAD_NAMESPACE, digest, record)
+        logger.info(f"📤 Stored uploaded {self.format} transcript {clean_path} ({self.size} bytes, {self.lines} lines)")
+        return record
+
+    def discard(self):
+        for f in (self._raw, self._clean):
+            f.close()
+        self._raw_tmp.unlink(missing_ok=True)
+        self._clean_tmp.unlink(missing_ok=True)
+
+
+# === Streaming ingest ===
+async def ingest_stream(chunks: AsyncIterator[bytes], fmt: Optional[str], name: Optional[str]) -> Dict:
+    """Ingest a transcript sent as the raw request body."""
+    upload = await run_io(TranscriptUpload, fmt, name)
+    try:
+        async for chunk in chunks:
+            if chunk:
+                await run_io(upload.feed, chunk)
+        return await run_io(upload.finish)
+    except BaseException:
+        # Also on a client disconnect (cancellation), so no await here
+        upload.discard()
+        raise
+
+
+class _MultipartEvents:
+    """Collects python-multipart parser callbacks for the async side to act on."""
+
+    def __init__(self):
+        self.events: List[Tuple[str, object]] = []
+        self._headers: Dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+
+    def callbacks(self) -> Dict:
+        return {
+            "on_part_begin": self._headers.clear,
+            "on_header_field": lambda data, start, end: self._append("_field", data[start:end]),
+            "on_header_value": lambda data, start, end: self._append("_value", data[start:end]),
+            "on_header_end": self._header_end,
+            "on_headers_finished": lambda: self.events.append(("part", dict(self._headers))),
+            "on_part_data": lambda data, start, end: self.events.append(("data", bytes(data[start:end]))),
+        }
+
+    def _append(self, attr: str, data: bytes):
+        setattr(self, attr, getattr(self, attr) + data)
+
+    def _header_end(self):
+        self._headers[self._field.lower()] = self._value
+        self._field, self._value = b"", b""
+
+
+async def ingest_multipart(chunks: AsyncIterator[bytes], content_type: str, fmt: Optional[str],
+                           name: Optional[str]) -> Dict:
+    """
+    Ingest the first file part of a multipart/form-data upload while it streams in.
+    Small `format` and `name` fields sent before the file override the query parameters.
+    """
+    from python_multipart.multipart import MultipartParser, parse_options_header
+
+    boundary = parse_options_header(content_type)[1].get(b"boundary")
+    if not boundary:
+        raise UploadError("multipart upload without a boundary")
+    collector = _MultipartEvents()
+    parser = MultipartParser(boundary, collector.callbacks())
+    upload: Optional[TranscriptUpload] = None
+    fields: Dict[str, str] = {}
+    part = None
+    try:
+        async for chunk in chunks:
+            parser.write(chunk)
+            data = bytearray()
+            for kind, value in collector.events:
+                if kind == "part":
+                    params = parse_options_header(value.get(b"content-disposition"))[1]
+                    filename = params.get(b"filename")
+                    if filename is None:
+                        part = params.get(b"name", b"").decode("utf-8", "replace")
+                        fields[part] = ""
+                    elif upload is None:
+                        filename = filename.decode("utf-8", "replace")
+                        upload = await run_io(
+                            TranscriptUpload,
+                            declared_format(fields.get("format") or fmt, filename,
+                                            value.get(b"content-type", b"").decode("latin-1")),
+                            fields.get("name") or name or Path(filename).stem,
+                        )
+                        part = upload
+                    else:
+                        part = None  # only the first file is a transcript
+                elif part is upload and upload is not None:
+                    data += value
+                elif part in ("format", "name") and len(fields[part]) < 256:
+                    fields[part] += value.decode("utf-8", "replace")
+            collector.events.clear()
+            if data:
+                await run_io(upload.feed, bytes(data))
+        parser.finalize()
+        if upload is None:
+            raise UploadError("multipart upload has no file part")
+        return await run_io(upload.finish)
+    except BaseException:
+        if upload is not None:
+            upload.discard()
+        raise
+
+
+def query_context(record: Dict) -> Dict:
+    """Context for /query that points the pipeline at an uploaded transcript."""
+    return {k: record[k] for k in ("transcript_path", "meeting_id", "meeting_name")}
+
+
+def lookup_upload(transcript_id: str) -> Optional[Dict]:
+    """Metadata of an upload that is still in the transcript store, else None."""
+    if not all(c in "0123456789abcdef" for c in transcript_id) or len(transcript_id) != 64:
+        return None
+    record = get_kv_store().get(UPLOAD_NAMESPACE, transcript_id)
+    if record is None or not Path(record["transcript_path"]).exists():
+        return None
+    return record
+
+
+async def resolve_upload_context(context: Dict) -> Dict:
+    """Expand `{"transcript_id": ...}` in a query context to the uploaded transcript's path and meeting."""
+    transcript_id = context.get("transcript_id")
+    if not transcript_id:
+        return context
+    record = await run_io(lookup_upload, str(transcript_id))
+    if record is None:
+        raise UploadError(f"Unknown or expired transcript_id {transcript_id}", status=404)
+    resolved = {k: v for k, v in context.items() if k != "transcript_id"}
+    return {**query_context(record), **resolved}
@@ -0,0 +1,133 @@
+import asyncio
+import importlib
+import time
+from typing import Awaitable, Callable, Dict
+from loguru import logger
+from src.config.settings import settings
+from utils.transcript_io import run_io
+
+
+class WarmupTracker:
+    """Warm status and latency of each dependency, reported by /ready."""
+
+    def __init__(self):
+        self.dependencies: Dict[str, Dict] = {}
+
+    def register(self, name: str, critical: bool):
+        self.dependencies[name] = {"status": "pending", "critical": critical, "latency_ms": None, "error": None}
+
+    async def run(self, name: str, step: Callable[[], Awaitable]):
+        """
+        Run one warm-up step. A critical step that fails is retried with exponential backoff
+        (WARMUP_RETRIES times), so a dependency that is down at startup does not keep the
+        replica unready for good.
+        """
+        entry = self.dependencies[name]
+        attempts = 1 + (settings.WARMUP_RETRIES if entry["critical"] else 0)
+        for attempt in range(1, attempts + 1):
+            started = time.perf_counter()
+            try:
+                detail = await asyncio.wait_for(step(), timeout=settings.WARMUP_TIMEOUT_SECONDS)
+                entry.update(status="warm", detail=detail, error=None, attempts=attempt)
+                logger.info(f"🔥 Warmed {name} in {(time.perf_counter() - started) * 1000:.0f} ms")
+            except Exception as e:
+                entry.update(status="failed", error=str(e) or type(e).__name__, attempts=attempt)
+                logger.warning(f"⚠️ Warm-up of {name} failed (attempt {attempt}/{attempts}): {entry['error']}")
+            entry["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            if entry["status"] == "warm" or attempt == attempts:
+                return
+            entry["status"] = "retrying"
+            delay = min(settings.WARMUP_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1), settings.WARMUP_RETRY_MAX_BACKOFF_SECONDS)
+            await asyncio.sleep(delay)
+
+    def ready(self) -> bool:
+        return all(dep["status"] == "warm" for dep in self.dependencies.values() if dep["critical"])
+
+    def report(self) -> Dict:
+        return {"ready": self.ready(), "dependencies": self.dependencies}
+
+
+warmup_tracker = WarmupTracker()
+
+
+# === Warm-up steps ===
+# Heavy modules are imported on the I/O pool: an import on the loop thread would block it,
+# and waits on the import lock while build_graph imports the same packages in parallel.
+async def import_off_loop(*modules: str):
+    for module in modules:
+        await run_io(importlib.import_module, module)
+
+
+def build_graph() -> str:
+    """Import the graph and build the agents and LLM clients, all normally deferred to the first query."""
+    importlib.import_module("src.graph")
+    from src.agents.supervisor_agent import get_supervisor_agent
+    from src.agents.zoom_agent import get_zoom_agent
+    get_supervisor_agent()
+    get_zoom_agent()
+    return "compiled"
+
+
+async def warm_graph():
+    return await run_io(build_graph)
+
+
+async def warm_llm():
+    """Open pooled connections to the LLM endpoint (TLS handshake included)."""
+    from src.llm import get_llm_http_client
+    # Building the client imports httpcore and loads the CA bundle, keep that off the loop too
+    client = await run_io(get_llm_http_client)
+    resp = await client.get(
+        f"{settings.OPENAI_BASE_URL}/models",
+        headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
+    )
+    resp.raise_for_status()
+    return f"HTTP {resp.status_code}"
+
+
+async def warm_zoom():
+    await import_off_loop("src.tools.zoom_tools")
+    from src.tools.zoom_tools import get_access_token
+    await get_access_token()
+    return "token cached"
+
+
+async def warm_notion_api():
+    from src.tools.notion_publisher import get_notion_client
+    client = await run_io(get_notion_client)
+    resp = await client.get("/users/me")
+    resp.raise_for_status()
+    return f"HTTP {resp.status_code}"
+
+
+async def warm_notion_mcp():
+    await import_off_loop("langchain_mcp_adapters.client", "langchain_mcp_adapters.tools")
+    from src.tools.notion_tools import start_notion_session
+    return f"{await start_notion_session()} tools"
+
+
+# name -> (step, critical). Notion is only needed at the end of a run, so it does not gate readiness.
+WARMUP_STEPS = {
+    "graph": (warm_graph, True),
+    "llm": (warm_llm, True),
+    "zoom": (warm_zoom, True),
+    "notion_api": (warm_notion_api, False),
+    "notion_mcp": (warm_notion_mcp, False),
+}
+
+
+def register_warmup_steps():
+    """Register the steps as pending before the warm-up task starts, so /ready is not ready in between."""
+    for name, (_, critical) in WARMUP_STEPS.items():
+        warmup_tracker.register(name, critical)
+
+
+async def run_warmup():
+    if not warmup_tracker.dependencies:
+        register_warmup_steps()
+    await asyncio.gather(*(warmup_tracker.run(name, step) for name, (step, _) in WARMUP_STEPS.items()))
+    logger.info(f"🚦 Warm-up finished, ready={warmup_tracker.ready()}")
+
+
+def get_warmup_tracker() -> WarmupTracker:
+    return warmup_tracker
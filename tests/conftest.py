@@ -0,0 +1,17 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Settings are read at import time: give the required ones dummy values and keep
+# every cache, index and transcript the tests write in a throwaway directory
+_workdir = Path(tempfile.mkdtemp(prefix="meeting-agent-tests-"))
+for name in ("OPENAI_API_KEY", "NOTION_TOKEN", "ZOOM_ACCOUNT_ID", "ZOOM_CLIENT_ID",
+             "ZOOM_CLIENT_SECRET", "ZOOM_WEBHOOK_USER", "ZOOM_WEBHOOK_PASS"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("CACHE_DB_PATH", str(_workdir / "cache.sqlite3"))
+os.environ.setdefault("TRANSCRIPT_INDEX_PATH", str(_workdir / "index.sqlite3"))
+os.environ.setdefault("TRANSCRIPT_DIR", str(_workdir / "transcripts"))
+os.environ.setdefault("CASSETTE_MODE", "off")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,106 @@
+import asyncio
+import pytest
+from src.admission import AdmissionController, Rejected
+
+
+def test_runs_up_to_the_limit_then_queue_then_reject():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=2, max_queue=1, max_wait=5)
+        first = await controller.acquire()
+        await controller.acquire()
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.stats()["queued"] == 1
+
+        with pytest.raises(Rejected) as rejected:
+            await controller.acquire()
+        assert rejected.value.retry_after >= 1
+        assert controller.rejected == 1
+
+        # The slot goes straight to the queued run
+        first.release()
+        await asyncio.wait_for(queued, 1)
+        assert (controller.in_flight, controller.depth()) == (2, 0)
+
+    asyncio.run(scenario())
+
+
+def test_queued_runs_are_admitted_in_order():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=3, max_wait=5)
+        running = await controller.acquire()
+        order = []
+
+        async def run(name):
+            ticket = await controller.acquire()
+            order.append(name)
+            ticket.release()
+
+        tasks = [asyncio.create_task(run(name)) for name in "abc"]
+        await asyncio.sleep(0)
+        running.release()
+        await asyncio.gather(*tasks)
+        assert order == ["a", "b", "c"]
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_a_queued_run_times_out():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=1, max_wait=0.01)
+        await controller.acquire()
+        with pytest.raises(Rejected, match="Timed out"):
+            await controller.acquire()
+        assert controller.depth() == 0
+
+    asyncio.run(scenario())
+
+
+def test_a_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=1, max_wait=5)
+        running = await controller.acquire()
+        queued = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert controller.depth() == 0
+        running.release()
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_release_is_idempotent():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=1, max_queue=0, max_wait=5)
+        ticket = await controller.acquire()
+        ticket.release()
+        ticket.release()
+        assert controller.in_flight == 0
+        await controller.acquire()
+        assert controller.in_flight == 1
+
+    asyncio.run(scenario())
+
+
+def test_queries_waiting_for_an_identical_run_are_capped():
+    async def scenario():
+        controller = AdmissionController(max_in_flight=3, max_queue=0, max_wait=5, max_waiters=1)
+        waiting = await controller.acquire(waiting=True)
+        assert controller.waiting == 1
+        with pytest.raises(Rejected, match="identical"):
+            await controller.acquire(waiting=True)
+
+        waiting.done_waiting()
+        assert controller.waiting == 0
+        second = await controller.acquire(waiting=True)
+        # Releasing also ends the wait, once
+        second.release()
+        second.release()
+        assert controller.waiting == 0
+        assert controller.in_flight == 1
+
+    asyncio.run(scenario())
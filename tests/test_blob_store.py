@@ -0,0 +1,68 @@
+import asyncio
+import time
+import pytest
+from utils.blob_store import BLOB_NAMESPACE, BlobStore, is_handle, offload, offload_fields, resolve, resolve_fields
+from utils.kv_store import get_kv_store
+
+LARGE = "Alice: " + "we ship on friday. " * 100
+
+
+def test_small_values_stay_inline_and_large_ones_become_handles():
+    assert asyncio.run(offload("short")) == "short"
+    assert asyncio.run(offload(None)) is None
+    handle = asyncio.run(offload(LARGE))
+    assert is_handle(handle)
+    assert handle["size"] == len(LARGE.encode("utf-8"))
+    assert asyncio.run(offload(handle)) is handle
+    assert asyncio.run(resolve(handle)) == LARGE
+
+
+def test_fields_round_trip_and_other_keys_are_untouched():
+    values = {"summary": LARGE, "todo": "- [ ] ship", "analytics": {"speakers": ["Alice"] * 200}, "step": 1}
+    offloaded = asyncio.run(offload_fields(values, ("summary", "todo", "analytics", "feedback")))
+    assert is_handle(offloaded["summary"]) and is_handle(offloaded["analytics"])
+    assert offloaded["todo"] == "- [ ] ship" and "feedback" not in offloaded
+    assert asyncio.run(resolve_fields(offloaded, ("summary", "todo", "analytics"))) == values
+
+
+def test_a_value_evicted_from_memory_is_read_back_from_the_kv_store():
+    store = BlobStore(memory_limit_bytes=100, ttl=60)
+    first = store.put("a" * 80)
+    store.put("b" * 80)
+    assert store.stats()["blobs_in_memory"] == 1
+    assert store.get(first) == "a" * 80
+    assert BlobStore(100, 60).get(first) == "a" * 80
+
+
+def test_an_expired_blob_is_missing_and_purged():
+    store = BlobStore(memory_limit_bytes=1024, ttl=60)
+    live = store.put("still needed")
+    kv = get_kv_store()
+    kv.set(BLOB_NAMESPACE, "stale", {"kind": "str", "data": "old"}, ttl=0.01)
+    time.sleep(0.02)
+
+    assert store.purge_expired() >= 1
+    assert kv.get(BLOB_NAMESPACE, "stale") is None
+    assert store.purge_expired() == 0
+    assert BlobStore(1024, 60).get(live) == "still needed"
+    with pytest.raises(KeyError):
+        BlobStore(1024, 60).get({"blob": "stale", "size": 3, "kind": "str"})
+
+
+def test_sse_payloads_carry_resolved_debrief_outputs():
+    from src.api.routes import client_payload
+
+    async def scenario():
+        update = {
+            "summary": await offload(LARGE),
+            "transcript": await offload(LARGE),
+            "meeting_debriefs": [await offload_fields({"topic": "Weekly", "feedback": LARGE}, ("feedback",))],
+            "step_summary": ["Debriefed"],
+        }
+        return await client_payload(update)
+
+    payload = asyncio.run(scenario())
+    assert payload["summary"] == LARGE
+    assert payload["meeting_debriefs"][0] == {"topic": "Weekly", "feedback": LARGE}
+    # The raw transcript is never sent to the client
+    assert is_handle(payload["transcript"])
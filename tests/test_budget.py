@@ -0,0 +1,64 @@
+import contextvars
+import json
+from src.budget import RunBudget, current_budget, record_llm_response
+
+
+def make(hops=10, llm_calls=10, tokens=1000, seconds=60.0, route_visits=3):
+    return RunBudget(hops, llm_calls, tokens, seconds, route_visits)
+
+
+def test_limits_stop_the_run_and_the_first_reason_sticks():
+    budget = make(llm_calls=2, tokens=100)
+    budget.record_llm_call({"prompt_tokens": 40, "completion_tokens": 10})
+    assert budget.check() is None
+    budget.record_llm_call({"prompt_tokens": 40, "completion_tokens": 20})
+    assert budget.check() == "LLM call limit of 2 reached"
+    assert budget.check() == budget.exhausted == "LLM call limit of 2 reached"
+    assert budget.report()["used"]["tokens"] == 110
+
+
+def test_token_hop_and_time_limits():
+    budget = make(tokens=100)
+    budget.record_llm_call({"prompt_tokens": 100, "completion_tokens": None})
+    assert budget.check() == "token limit of 100 reached"
+
+    budget = make(hops=1)
+    budget.record_decision("zoom", "find the transcript")
+    assert budget.check() == "hop limit of 1 reached"
+
+    assert make(seconds=0).check() == "wall time limit of 0s reached"
+
+
+def test_a_repeated_decision_is_a_loop():
+    budget = make()
+    assert budget.record_decision("zoom", "Find the transcript.") is None
+    assert budget.record_decision("debrief", "summarise") is None
+    assert budget.record_decision("zoom", "find the  transcript") == \
+        "repeated decision: route 'zoom' with the same next step"
+    # Ending is not a hop
+    assert budget.record_decision("end", "") is None
+    assert budget.hops == 3
+
+
+def test_one_route_chosen_too_often():
+    budget = make(route_visits=2)
+    assert budget.record_decision("zoom", "first") is None
+    assert budget.record_decision("zoom", "second") is None
+    assert budget.record_decision("zoom", "third") == "route 'zoom' chosen 3 times"
+
+
+def test_llm_responses_are_charged_to_the_current_run():
+    def scenario():
+        budget = make()
+        current_budget.set(budget)
+        usage = {"prompt_tokens": 12, "completion_tokens": 3}
+        record_llm_response(json.dumps({"usage": usage}).encode(), "application/json")
+        stream = f'data: {{"choices": []}}\ndata: {json.dumps({"usage": usage})}\ndata: [DONE]\n'
+        record_llm_response(stream.encode(), "text/event-stream")
+        record_llm_response(b"not json", "application/json")
+        return budget
+
+    budget = contextvars.copy_context().run(scenario)
+    assert (budget.llm_calls, budget.prompt_tokens, budget.completion_tokens) == (3, 24, 6)
+    # Outside a run nothing is charged
+    record_llm_response(b'{"usage": {"prompt_tokens": 1}}', "application/json")
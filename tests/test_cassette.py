@@ -0,0 +1,54 @@
+import asyncio
+import json
+from datetime import date
+import pytest
+from src import cassette
+from src.cassette import RECORD, REPLAY, Cassette, CassetteMiss
+
+
+def recorded(tmp_path, run_date="2024-03-01"):
+    """A cassette file recorded on `run_date` with one LLM call."""
+    path = tmp_path / "run.jsonl"
+    recorder = Cassette(path, RECORD)
+    asyncio.run(recorder.record("llm", "POST", "https://api.test/v1/chat/completions",
+                                b'{"model": "m", "messages": [{"role": "user", "content": "hi"}]}',
+                                {"status": 200, "headers": [], "body": {"text": "{}"}}, 0.5))
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    lines[0]["value"] = run_date
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+    return path
+
+
+def test_record_stores_the_run_date(tmp_path):
+    path = tmp_path / "run.jsonl"
+    Cassette(path, RECORD)
+    first = json.loads(path.read_text(encoding="utf-8").splitlines()[0])
+    assert first == {"kind": "meta", "name": "run_date", "value": date.today().isoformat()}
+
+
+def test_replay_uses_the_recorded_date(tmp_path, monkeypatch):
+    replay = Cassette(recorded(tmp_path), REPLAY, latency_scale=0)
+    monkeypatch.setattr(cassette, "get_cassette", lambda: replay)
+    assert cassette.run_date() == date(2024, 3, 1)
+
+    monkeypatch.setattr(cassette, "get_cassette", lambda: None)
+    assert cassette.run_date() == date.today()
+
+
+def test_replay_hands_out_each_recording_once(tmp_path):
+    replay = Cassette(recorded(tmp_path), REPLAY, latency_scale=0)
+    payload = b'{"model": "m", "messages": [{"role": "user", "content": "hi"}]}'
+    entry = replay.take("llm", "POST", "https://other-host/v1/chat/completions", payload)
+    assert entry["elapsed"] == 0.5
+    with pytest.raises(CassetteMiss):
+        replay.take("llm", "POST", "https://other-host/v1/chat/completions", payload)
+
+
+def test_a_changed_payload_needs_loose_matching(tmp_path):
+    changed = b'{"model": "m", "messages": [{"role": "user", "content": "hello"}]}'
+    with pytest.raises(CassetteMiss, match="CASSETTE_ALLOW_LOOSE"):
+        Cassette(recorded(tmp_path), REPLAY).take("llm", "POST", "https://api.test/v1/chat/completions", changed)
+
+    loose = Cassette(recorded(tmp_path), REPLAY, allow_loose=True)
+    loose.take("llm", "POST", "https://api.test/v1/chat/completions", changed)
+    assert loose.report()["loose_matches"] == 1
@@ -0,0 +1,102 @@
+import asyncio
+import contextvars
+from types import SimpleNamespace
+import pytest
+from src.agents import debrief_agent
+from src.agents.debrief_agent import MergedDebrief, REFRESH_RE, cues_fingerprint, merge_new_cues, wants_incremental
+from src.config.settings import settings
+from src.deadline import Deadline, current_deadline
+from src.tools.digest_tools import ChunkDigest
+
+
+@pytest.mark.parametrize("message", [
+    "refresh the summary", "summary so far", "the meeting is live", "it is still running",
+    "rerun the debrief", "re-run the notes", "update the summary", "刷新一下", "目前为止的总结",
+])
+def test_refresh_requests(message):
+    assert REFRESH_RE.search(message)
+
+
+@pytest.mark.parametrize("message", [
+    "list the deliverables", "discuss delivery", "olive oil", "is the project alive",
+    "rerun planning", "summarise it",
+])
+def test_words_that_only_contain_a_refresh_term(message):
+    assert not REFRESH_RE.search(message)
+
+
+def test_wants_incremental_from_state_flag_or_message():
+    assert wants_incremental({"incremental": True, "last_user_message": "summarise"})
+    assert wants_incremental({"last_user_message": "refresh it"})
+    assert not wants_incremental({"last_user_message": "summarise"})
+
+
+def test_cues_fingerprint_changes_with_any_earlier_cue():
+    cues = [{"speaker": "Alice", "text": "hi"}, {"speaker": "Bob", "text": "bye"}]
+    assert cues_fingerprint(cues) == cues_fingerprint([dict(c) for c in cues])
+    assert cues_fingerprint(cues) != cues_fingerprint([cues[0], {"speaker": "Bob", "text": "bye!"}])
+    assert cues_fingerprint(cues[:1]) != cues_fingerprint(cues)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Record the model of every debrief call and the segments digested, without calling an LLM."""
+    calls = {"models": [], "digested": 0, "prompt": ""}
+
+    class Model:
+        def __init__(self, name):
+            self.name = name
+
+        async def ainvoke(self, messages, response_format):
+            calls["models"].append(self.name)
+            calls["prompt"] = messages[-1]["content"]
+            return SimpleNamespace(additional_kwargs={"parsed": MergedDebrief(summary="s", todo="t", feedback="f")})
+
+    async def digest_chunk(text):
+        calls["digested"] += 1
+        return ChunkDigest(notes=[text[:10]], decisions=[], action_items=[], open_questions=[], speakers=[])
+
+    monkeypatch.setattr(debrief_agent, "get_chat_model", Model)
+    monkeypatch.setattr(debrief_agent, "digest_chunk", digest_chunk)
+    return calls
+
+
+def merge_under(seconds, cue_count):
+    """Run merge_new_cues for `cue_count` long cues under a deadline of `seconds`; returns the deadline."""
+    cues = [{"speaker": "Alice", "text": "x" * 500, "start": float(i)} for i in range(cue_count)]
+    previous = {"summary": "old", "todo": "", "feedback": ""}
+
+    def scenario():
+        deadline = Deadline(seconds, margin=0)
+        current_deadline.set(deadline)
+        asyncio.run(merge_new_cues(previous, cues, "update the summary"))
+        return deadline
+
+    return contextvars.copy_context().run(scenario)
+
+
+def test_merge_with_time_to_spare_uses_the_full_model_on_every_segment(llm):
+    deadline = merge_under(600, 200)
+    assert llm["models"] == [debrief_agent.DEBRIEF_MODEL]
+    assert llm["digested"] > settings.DEADLINE_DEGRADED_CHUNKS
+    assert deadline.degraded == []
+
+
+def test_merge_close_to_the_deadline_uses_the_fast_model_and_fewer_segments(llm):
+    deadline = merge_under(settings.DEADLINE_DEGRADE_SECONDS / 2, 200)
+    assert llm["models"] == [settings.DEADLINE_FAST_MODEL]
+    assert llm["digested"] == settings.DEADLINE_DEGRADED_CHUNKS
+    assert "say the update is partial" in llm["prompt"]
+    assert len(deadline.degraded) == 2
+
+
+def test_answers_close_to_the_deadline_use_the_fast_model(llm, monkeypatch):
+    monkeypatch.setattr(debrief_agent, "retrieve_passages",
+                        lambda path, question: [{"ordinal": 0, "text": "Alice: we ship friday"}])
+
+    def scenario():
+        current_deadline.set(Deadline(settings.DEADLINE_DEGRADE_SECONDS / 2, margin=0))
+        asyncio.run(debrief_agent.answer_from_passages("weekly.vtt", "when do we ship?", "answer"))
+
+    contextvars.copy_context().run(scenario)
+    assert llm["models"] == [settings.DEADLINE_FAST_MODEL]
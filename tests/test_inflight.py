@@ -0,0 +1,100 @@
+import asyncio
+import time
+import uuid
+from utils.inflight import INFLIGHT_NAMESPACE, InflightRegistry
+from utils.kv_store import get_kv_store
+
+
+def make(ttl=30.0, poll_interval=0.01, max_wait=5.0):
+    return InflightRegistry(ttl, poll_interval, max_wait)
+
+
+def fresh_key():
+    return f"test:{uuid.uuid4().hex}"
+
+
+def test_one_holder_per_key_and_release_is_idempotent():
+    async def scenario():
+        registry, key = make(), fresh_key()
+        lease = await registry.acquire(key)
+        assert lease is not None
+        assert await registry.acquire(key) is None
+        assert any(entry["key"] == key for entry in registry.running())
+        await lease.release()
+        await lease.release()
+        again = await registry.acquire(key)
+        assert again is not None
+        await again.release()
+
+    asyncio.run(scenario())
+
+
+def test_waiters_in_the_holding_process_wake_on_release():
+    async def scenario():
+        # Polling alone would take seconds to notice the release
+        registry, key = make(poll_interval=5.0), fresh_key()
+        lease = await registry.acquire(key)
+        asyncio.get_running_loop().call_later(0.05, lambda: asyncio.ensure_future(lease.release()))
+        started = time.monotonic()
+        assert await registry.wait_released(key, timeout=3)
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) < 1
+
+
+def test_a_lease_held_elsewhere_is_polled_until_released():
+    async def scenario():
+        registry, key = make(), fresh_key()
+        other = {"owner": "other-host:1", "id": "x"}
+        assert get_kv_store().acquire(INFLIGHT_NAMESPACE, key, other, 30)
+        assert not await registry.wait_released(key, timeout=0.05)
+
+        asyncio.get_running_loop().call_later(0.05, get_kv_store().release, INFLIGHT_NAMESPACE, key, other)
+        assert await registry.wait_released(key, timeout=3)
+
+    asyncio.run(scenario())
+
+
+def test_hold_runs_anyway_when_the_holder_is_stuck():
+    async def scenario():
+        registry, key = make(), fresh_key()
+        assert get_kv_store().acquire(INFLIGHT_NAMESPACE, key, {"owner": "stuck"}, 30)
+        async with registry.hold(key, timeout=0.05):
+            return "ran"
+
+    assert asyncio.run(scenario()) == "ran"
+
+
+def test_a_lease_is_renewed_while_its_holder_runs():
+    async def scenario():
+        registry, key = make(ttl=0.3), fresh_key()
+        lease = await registry.acquire(key)
+        await asyncio.sleep(0.5)
+        held = get_kv_store().get(INFLIGHT_NAMESPACE, key)
+        await lease.release()
+        return held
+
+    assert asyncio.run(scenario()) is not None
+
+
+def test_single_flight_computes_once_for_concurrent_callers():
+    async def scenario():
+        registry, key = make(), fresh_key()
+        cache = {}
+        computed = []
+
+        async def lookup():
+            return cache.get(key)
+
+        async def compute():
+            computed.append(key)
+            await asyncio.sleep(0.05)
+            cache[key] = "result"
+            return "result"
+
+        results = await asyncio.gather(*(registry.single_flight(key, lookup, compute) for _ in range(5)))
+        return results, computed
+
+    results, computed = asyncio.run(scenario())
+    assert results == ["result"] * 5
+    assert len(computed) == 1
@@ -0,0 +1,75 @@
+import pytest
+from utils.meeting_analytics import compute_analytics, format_analytics, format_duration
+
+
+def cue(speaker, start, end, text="..."):
+    return {"speaker": speaker, "start": start, "end": end, "text": text}
+
+
+CUES = [
+    cue("Alice", 0, 10),
+    cue("Bob", 8, 15),     # starts while Alice still talks: an interruption
+    cue("Alice", 22, 30),  # after a 7 s silence
+    cue("Alice", 31, 32),  # same speaker, not a new turn
+]
+
+
+def test_talk_time_share_and_turns_per_speaker():
+    analytics = compute_analytics(CUES)
+    assert analytics["participants"] == ["Alice", "Bob"]
+    assert analytics["speakers"]["Alice"] == {
+        "talk_time_seconds": 19.0, "talk_share": 0.731, "turns": 2, "interruptions": 0,
+    }
+    assert analytics["speakers"]["Bob"] == {
+        "talk_time_seconds": 7.0, "talk_share": 0.269, "turns": 1, "interruptions": 1,
+    }
+
+
+def test_duration_silences_interruptions_and_balance():
+    analytics = compute_analytics(CUES)
+    assert analytics["duration_seconds"] == 32.0
+    assert analytics["speaker_count"] == 2
+    assert analytics["interruption_count"] == 1
+    assert analytics["silence"] == {"gap_count": 1, "total_seconds": 7.0, "longest_seconds": 7.0}
+    assert analytics["participation_balance"] == 8
+
+
+def test_a_long_cue_holds_the_floor_for_later_cues():
+    analytics = compute_analytics([cue("Alice", 0, 60), cue("Bob", 10, 12), cue("Carol", 20, 22)])
+    assert analytics["interruption_count"] == 2
+    assert analytics["silence"]["gap_count"] == 0
+    assert analytics["duration_seconds"] == 60.0
+
+
+def test_equal_talk_time_is_perfectly_balanced():
+    analytics = compute_analytics([cue("Alice", 0, 5), cue("Bob", 5, 10)])
+    assert analytics["participation_balance"] == 10
+
+
+def test_single_speaker_and_missing_speakers():
+    analytics = compute_analytics([cue(None, 0, 5), cue(None, 5, 7)])
+    assert analytics["participants"] == ["Unknown"]
+    assert analytics["participation_balance"] == 0
+    assert analytics["speakers"]["Unknown"]["turns"] == 1
+
+
+def test_untimed_cues_give_no_analytics():
+    assert compute_analytics([cue("Alice", None, None)]) is None
+    assert compute_analytics([]) is None
+
+
+def test_untimed_cues_are_skipped_among_timed_ones():
+    analytics = compute_analytics([cue("Alice", 0, 4), cue("Bob", None, None)])
+    assert analytics["participants"] == ["Alice"]
+
+
+@pytest.mark.parametrize("seconds, expected", [(0, "0m 00s"), (65.4, "1m 05s"), (3725, "1h 02m")])
+def test_format_duration(seconds, expected):
+    assert format_duration(seconds) == expected
+
+
+def test_format_analytics_lists_every_speaker():
+    text = format_analytics(compute_analytics(CUES))
+    assert text.splitlines()[0] == "Duration: 0m 32s"
+    assert "Participants (2): Alice, Bob" in text
+    assert "- Bob: 0m 07s (27%), 1 turns, 1 interruptions" in text
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import httpx
+import pytest
+from src.tools import notion_publisher
+from src.tools.notion_publisher import (
+    MAX_TEXT_LENGTH, IncompletePageError, PageMaybeCreatedError, create_page, debrief_to_blocks,
+    extract_target_name, rich_text, text_to_blocks,
+)
+
+PARENT = {"type": "page", "id": "parent-1"}
+
+
+@pytest.fixture
+def notion(monkeypatch):
+    """Route the publisher's client to a handler; returns the list of requests it saw."""
+    requests = []
+    handlers = {}
+
+    def transport(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return handlers["handle"](request)
+
+    client = httpx.AsyncClient(base_url="https://notion.test/v1", transport=httpx.MockTransport(transport))
+    monkeypatch.setattr(notion_publisher, "_client", client)
+    return requests, handlers
+
+
+def blocks(count):
+    return [notion_publisher.block("paragraph", f"line {i}") for i in range(count)]
+
+
+def test_rich_text_splits_at_the_notion_length_limit():
+    parts = rich_text("x" * (MAX_TEXT_LENGTH + 5))
+    assert [len(p["text"]["content"]) for p in parts] == [MAX_TEXT_LENGTH, 5]
+    assert rich_text("") == [{"type": "text", "text": {"content": ""}}]
+
+
+def test_text_to_blocks_maps_markdown_lines():
+    text = "# Title\n## Sub\n### Small\n- [x] done\n* [ ] open\n- bullet\n2) second\nplain\n\n"
+    kinds = [(b["type"], b[b["type"]]["rich_text"][0]["text"]["content"]) for b in text_to_blocks(text)]
+    assert kinds == [
+        ("heading_1", "Title"), ("heading_2", "Sub"), ("heading_3", "Small"), ("to_do", "done"),
+        ("to_do", "open"), ("bulleted_list_item", "bullet"), ("numbered_list_item", "second"), ("paragraph", "plain"),
+    ]
+    to_dos = [b["to_do"]["checked"] for b in text_to_blocks("- [x] a\n- [ ] b")]
+    assert to_dos == [True, False]
+
+
+def test_debrief_to_blocks_skips_empty_sections():
+    result = debrief_to_blocks("one", None, "two")
+    headings = [b["heading_2"]["rich_text"][0]["text"]["content"] for b in result if b["type"] == "heading_2"]
+    assert headings == ["Summary", "Feedback"]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("save it under the Team Notes page", "Team Notes"),
+    ("put it into the Projects database", "Projects"),
+    ("save to a new Notion page", "Meeting Notes"),
+    ('publish to "Weekly 周会"', "Weekly 周会"),
+])
+def test_extract_target_name(text, expected):
+    assert extract_target_name(text) == expected
+
+
+def test_create_page_sends_100_blocks_then_appends_the_rest_in_batches(notion):
+    requests, handlers = notion
+    handlers["handle"] = lambda request: httpx.Response(200, json={"id": "page-1"})
+
+    page = asyncio.run(create_page(PARENT, "Debrief", blocks(250)))
+
+    assert page == {"id": "page-1"}
+    sent = [(r.method, r.url.path, len(json.loads(r.content)["children"])) for r in requests]
+    assert sent == [
+        ("POST", "/v1/pages", 100),
+        ("PATCH", "/v1/blocks/page-1/children", 100),
+        ("PATCH", "/v1/blocks/page-1/children", 50),
+    ]
+
+
+def test_create_page_under_a_database_uses_its_title_property(notion):
+    requests, handlers = notion
+
+    def handle(request):
+        if request.method == "GET":
+            return httpx.Response(200, json={"properties": {"Task": {"type": "title"}, "Tag": {"type": "select"}}})
+        return httpx.Response(200, json={"id": "page-1"})
+
+    handlers["handle"] = handle
+    asyncio.run(create_page({"type": "database", "id": "db-1"}, "Debrief", blocks(1)))
+    body = json.loads(requests[-1].content)
+    assert body["parent"] == {"database_id": "db-1"}
+    assert list(body["properties"]) == ["Task"]
+
+
+def test_a_failed_append_reports_the_created_page(notion):
+    _, handlers = notion
+    handlers["handle"] = lambda request: (
+        httpx.Response(200, json={"id": "page-1"}) if request.method == "POST" else httpx.Response(404)
+    )
+    with pytest.raises(IncompletePageError) as raised:
+        asyncio.run(create_page(PARENT, "Debrief", blocks(150)))
+    assert raised.value.page["id"] == "page-1"
+    assert (raised.value.appended, raised.value.total) == (100, 150)
+
+
+def test_a_4xx_from_create_means_no_page(notion):
+    _, handlers = notion
+    handlers["handle"] = lambda request: httpx.Response(400, json={"message": "bad"})
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(create_page(PARENT, "Debrief", blocks(1)))
+
+
+@pytest.mark.parametrize("respond", [
+    lambda request: httpx.Response(502),
+    lambda request: (_ for _ in ()).throw(httpx.ReadTimeout("slow", request=request)),
+])
+def test_a_timeout_or_5xx_from_create_may_have_created_the_page(notion, respond):
+    _, handlers = notion
+    handlers["handle"] = respond
+    with pytest.raises(PageMaybeCreatedError) as raised:
+        asyncio.run(create_page(PARENT, "Debrief", blocks(1)))
+    assert raised.value.parent == PARENT
+
+
+def test_a_connection_failure_means_no_page(notion):
+    _, handlers = notion
+
+    def refuse(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    handlers["handle"] = refuse
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(create_page(PARENT, "Debrief", blocks(1)))
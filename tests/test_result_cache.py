@@ -0,0 +1,49 @@
+import os
+from src import result_cache
+
+
+def write(path, text, mtime_ns):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_transcript_hash_is_reused_until_the_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "meeting.txt"
+    write(path, "Alice: hello", 1_000_000_000)
+    first = result_cache._transcript_hash(str(path))
+
+    reads = []
+    original = result_cache.Path.read_bytes
+    monkeypatch.setattr(result_cache.Path, "read_bytes", lambda self: reads.append(self) or original(self))
+    assert result_cache._transcript_hash(str(path)) == first
+    assert reads == []
+
+    write(path, "Alice: hello, Bob", 2_000_000_000)
+    assert result_cache._transcript_hash(str(path)) != first
+    assert len(reads) == 1
+
+
+def test_transcript_hash_of_a_missing_file(tmp_path):
+    assert result_cache._transcript_hash(str(tmp_path / "gone.txt")) is None
+
+
+def test_record_then_lookup_until_the_transcript_changes(tmp_path):
+    path = tmp_path / "weekly.txt"
+    write(path, "Alice: ship it", 1_000_000_000)
+    state = {"transcript_path": str(path), "meeting_id": "m-1", "meeting_name": "Weekly", "summary": "Shipped."}
+    query = "summarize the weekly meeting"
+
+    assert result_cache.record(query, None, state, ["zoom", "debrief"])
+    cached = result_cache.lookup(query, None)
+    assert cached["result"]["summary"] == "Shipped."
+    assert result_cache.lookup("summarize the weekly meeting please", None) is None
+
+    write(path, "Alice: ship it next week", 2_000_000_000)
+    assert result_cache.lookup(query, None) is None
+
+
+def test_notion_runs_are_not_cached(tmp_path):
+    path = tmp_path / "weekly.txt"
+    path.write_text("Alice: ship it", encoding="utf-8")
+    state = {"transcript_path": str(path), "meeting_id": "m-1", "meeting_name": "Weekly"}
+    assert not result_cache.record("summarize and save to notion", None, state, ["zoom", "debrief"])
@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+from src.scheduler import BACKGROUND, INTERACTIVE, PriorityScheduler, current_priority, priority
+
+
+def make(capacity=1, interactive=3.0, background=1.0, reserved=0):
+    return PriorityScheduler(capacity, {INTERACTIVE: interactive, BACKGROUND: background}, reserved)
+
+
+async def grant_order(scheduler, classes):
+    """Queue one call per class in `classes` behind a held slot and return the order they ran in."""
+    order = []
+
+    async def call(cls):
+        async with scheduler.slot(cls):
+            order.append(cls)
+            await asyncio.sleep(0)
+
+    await scheduler.acquire(INTERACTIVE)
+    tasks = [asyncio.create_task(call(cls)) for cls in classes]
+    await asyncio.sleep(0)
+    scheduler.release(INTERACTIVE)
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_slots_are_shared_in_proportion_to_weight():
+    async def scenario():
+        scheduler = make(interactive=3.0, background=1.0)
+        order = await grant_order(scheduler, [BACKGROUND] * 8 + [INTERACTIVE] * 8)
+        assert order[:8].count(INTERACTIVE) == 6
+        assert scheduler.stats()["granted"] == {INTERACTIVE: 9, BACKGROUND: 8}
+
+    asyncio.run(scenario())
+
+
+def test_background_never_takes_the_reserved_slots():
+    async def scenario():
+        scheduler = make(capacity=3, reserved=1)
+        await scheduler.acquire(BACKGROUND)
+        await scheduler.acquire(BACKGROUND)
+        third = asyncio.create_task(scheduler.acquire(BACKGROUND))
+        await asyncio.sleep(0)
+        assert not third.done()
+
+        await asyncio.wait_for(scheduler.acquire(INTERACTIVE), 1)
+        assert scheduler.stats()["active"] == {INTERACTIVE: 1, BACKGROUND: 2}
+        scheduler.release(BACKGROUND)
+        await asyncio.wait_for(third, 1)
+
+    asyncio.run(scenario())
+
+
+def test_a_cancelled_call_leaves_the_queue():
+    async def scenario():
+        scheduler = make()
+        await scheduler.acquire(INTERACTIVE)
+        queued = asyncio.create_task(scheduler.acquire(BACKGROUND))
+        await asyncio.sleep(0)
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+        assert scheduler.stats()["queued"] == {INTERACTIVE: 0, BACKGROUND: 0}
+        scheduler.release(INTERACTIVE)
+        assert scheduler.stats()["active"] == {INTERACTIVE: 0, BACKGROUND: 0}
+
+    asyncio.run(scenario())
+
+
+def test_background_yields_at_checkpoints_while_interactive_calls_wait():
+    async def scenario():
+        scheduler = make()
+        await scheduler.acquire(BACKGROUND)
+        waiting = asyncio.create_task(scheduler.acquire(INTERACTIVE))
+        await asyncio.sleep(0)
+
+        with priority(BACKGROUND):
+            checkpoint = asyncio.create_task(scheduler.checkpoint())
+        await asyncio.sleep(0)
+        assert not checkpoint.done()
+        # Interactive work is never held at a checkpoint
+        await asyncio.wait_for(scheduler.checkpoint(), 1)
+
+        scheduler.release(BACKGROUND)
+        await asyncio.wait_for(waiting, 1)
+        await asyncio.wait_for(checkpoint, 1)
+
+    asyncio.run(scenario())
+
+
+def test_priority_context():
+    with priority(BACKGROUND):
+        assert current_priority.get() == BACKGROUND
+    assert current_priority.get() == INTERACTIVE
+    with pytest.raises(ValueError):
+        with priority("urgent"):
+            pass
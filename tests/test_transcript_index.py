@@ -0,0 +1,92 @@
+from utils.transcript_index import TranscriptIndex, split_passages, tokenize
+
+
+def test_tokenize_lowercases_latin_words_and_keeps_apostrophes():
+    assert tokenize("We'll ship v2 on Friday!") == ["we'll", "ship", "v2", "on", "friday"]
+
+
+def test_tokenize_indexes_cjk_runs_as_characters_and_bigrams():
+    assert tokenize("分享会") == ["分", "享", "会", "分享", "享会"]
+
+
+def test_tokenize_mixed_text():
+    tokens = tokenize("AI Sharing分享")
+    assert tokens[:2] == ["ai", "sharing"]
+    assert "分享" in tokens
+
+
+def test_split_passages_groups_lines_up_to_max_chars():
+    lines = ["a" * 4, "", "b" * 4, "c" * 4, "  "]
+    assert list(split_passages(lines, 8)) == ["aaaa\nbbbb", "cccc"]
+
+
+def test_split_passages_keeps_an_overlong_line_whole():
+    assert list(split_passages(["x" * 20, "y"], 8)) == ["x" * 20, "y"]
+
+
+def test_split_passages_of_nothing():
+    assert list(split_passages(["", " "], 8)) == []
+
+
+def make_index(tmp_path, passage_chars=40):
+    return TranscriptIndex(tmp_path / "index.sqlite3", passage_chars)
+
+
+def write_transcript(tmp_path, name, text):
+    path = tmp_path / f"{name}.txt"
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_search_ranks_the_passage_with_the_query_terms_first(tmp_path):
+    index = make_index(tmp_path)
+    index.add_transcript(write_transcript(tmp_path, "weekly", "\n".join([
+        "Alice: the budget review moves to Monday",
+        "Bob: we should hire two engineers",
+        "Carol: the launch date is March 3",
+        "Dan: budget is fine, budget is approved",
+    ])))
+    results = index.search("budget approved", k=2)
+    assert results[0]["ordinal"] == 3
+    assert "approved" in results[0]["text"]
+    assert results[0]["score"] > results[1]["score"]
+
+
+def test_search_matches_chinese_terms(tmp_path):
+    index = make_index(tmp_path)
+    index.add_transcript(write_transcript(tmp_path, "zh", "甲: 今天讨论预算\n乙: 下周发布新版本"))
+    assert "预算" in index.search("预算是多少", k=1)[0]["text"]
+
+
+def test_search_can_be_restricted_to_documents(tmp_path):
+    index = make_index(tmp_path)
+    index.add_transcript(write_transcript(tmp_path, "one", "Alice: roadmap planning"))
+    index.add_transcript(write_transcript(tmp_path, "two", "Bob: roadmap review"))
+    assert {r["doc"] for r in index.search("roadmap", docs=["two"])} == {"two"}
+
+
+def test_search_without_matches_or_terms(tmp_path):
+    index = make_index(tmp_path)
+    assert index.search("anything") == []
+    index.add_transcript(write_transcript(tmp_path, "one", "Alice: roadmap planning"))
+    assert index.search("unrelated") == []
+    assert index.search("?!") == []
+
+
+def test_add_transcript_skips_unchanged_files_and_reindexes_changed_ones(tmp_path):
+    index = make_index(tmp_path)
+    path = write_transcript(tmp_path, "doc", "Alice: first version")
+    assert index.add_transcript(path) is True
+    assert index.add_transcript(path) is False
+    path.write_text("Alice: second, longer version of the text", encoding="utf-8")
+    assert index.add_transcript(path) is True
+    assert index.search("first") == []
+    assert index.search("second")[0]["doc"] == "doc"
+
+
+def test_remove_drops_a_document(tmp_path):
+    index = make_index(tmp_path)
+    index.add_transcript(write_transcript(tmp_path, "doc", "Alice: roadmap"))
+    index.remove("doc")
+    assert not index.has("doc")
+    assert index.search("roadmap") == []
@@ -0,0 +1,82 @@
+import pytest
+from utils.vtt import clean_line, load_cues, parse_cues, render_cue
+
+VTT = """WEBVTT
+
+1
+00:00:01.000 --> 00:00:04.500
+Alice: Good morning everyone
+
+2
+00:00:05.000 --> 00:00:07.250
+Bob：继续讨论预算
+and the launch
+
+3
+01:02:03.004 --> 01:02:05.000
+no speaker here
+"""
+
+
+def test_parse_cues_reads_timing_speaker_and_text():
+    cues = parse_cues(VTT)
+    assert cues == [
+        {"start": 1.0, "end": 4.5, "speaker": "Alice", "text": "Good morning everyone"},
+        {"start": 5.0, "end": 7.25, "speaker": "Bob", "text": "继续讨论预算 and the launch"},
+        {"start": 3723.004, "end": 3725.0, "speaker": None, "text": "no speaker here"},
+    ]
+
+
+def test_parse_cues_reads_srt_timestamps():
+    srt = "1\n00:00:01,000 --> 00:00:02,000\nAlice: hi\n\n2\n00:00:02,500 --> 00:00:03,000\nBob: bye\n"
+    cues = parse_cues(srt)
+    assert [(c["start"], c["end"], c["speaker"]) for c in cues] == [(1.0, 2.0, "Alice"), (2.5, 3.0, "Bob")]
+
+
+def test_parse_cues_only_takes_the_speaker_from_the_first_line():
+    cues = parse_cues("00:00.000 --> 00:01.000\nAlice: see item\nnote: not a speaker\n")
+    assert cues[0]["speaker"] == "Alice"
+    assert cues[0]["text"] == "see item note: not a speaker"
+
+
+def test_parse_cues_ignores_text_outside_cues():
+    assert parse_cues("WEBVTT\nKind: captions\n\nNOTE a comment\n") == []
+
+
+@pytest.mark.parametrize("line, timed, expected", [
+    ("  Alice: hi  ", True, "Alice: hi"),
+    ("", True, None),
+    ("WEBVTT", True, None),
+    ("12", True, None),
+    ("00:00:01.000 --> 00:00:02.000", True, None),
+    ("12", False, "12"),
+    ("WEBVTT is a format", False, "WEBVTT is a format"),
+])
+def test_clean_line(line, timed, expected):
+    assert clean_line(line, timed) == expected
+
+
+def test_render_cue():
+    assert render_cue({"speaker": "Alice", "text": "hi"}) == "Alice: hi"
+    assert render_cue({"speaker": None, "text": "hi"}) == "hi"
+
+
+def test_load_cues_prefers_the_timed_sibling(tmp_path):
+    (tmp_path / "abc.txt").write_text("Alice: Good morning everyone", encoding="utf-8")
+    (tmp_path / "abc.vtt").write_text(VTT, encoding="utf-8")
+    assert load_cues(str(tmp_path / "abc.txt"))[0]["start"] == 1.0
+
+
+def test_load_cues_reads_an_uploaded_srt_sibling(tmp_path):
+    (tmp_path / "abc.txt").write_text("Alice: hi", encoding="utf-8")
+    (tmp_path / "abc.srt").write_text("1\n00:00:01,000 --> 00:00:02,000\nAlice: hi\n", encoding="utf-8")
+    assert load_cues(str(tmp_path / "abc.txt"))[0]["end"] == 2.0
+
+
+def test_load_cues_falls_back_to_untimed_lines(tmp_path):
+    path = tmp_path / "abc.txt"
+    path.write_text("Alice: hi\n\njust text\n", encoding="utf-8")
+    assert load_cues(str(path)) == [
+        {"start": None, "end": None, "speaker": "Alice", "text": "hi"},
+        {"start": None, "end": None, "speaker": None, "text": "just text"},
+    ]
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+from src.config.settings import settings
+from utils.kv_store import get_kv_store
+from utils.transcript_io import run_io
+
+BLOB_NAMESPACE = "state_blobs"
+
+
+def is_handle(value: Any) -> bool:
+    return isinstance(value, dict) and value.keys() == {"blob", "size", "kind"}
+
+
+def _encode(value: Any) -> Tuple[bytes, str]:
+    if isinstance(value, str):
+        return value.encode("utf-8"), "str"
+    return json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8"), "json"
+
+
+def _decode(data: bytes, kind: str) -> Any:
+    text = data.decode("utf-8")
+    return text if kind == "str" else json.loads(text)
+
+
+class BlobStore:
+    """
+    Content-addressed store for large graph state values.
+
+    Graph state carries a small handle ({"blob": sha256, "size": bytes, "kind": ...})
+    instead of the value, so every hop, SSE event and checkpoint copies a constant-size
+    dict whatever the transcript or debrief size. Values live in a byte-bounded LRU in
+    memory and are written through to the KV store, so an evicted value (or one written
+    by another process) still resolves.
+    """
+
+    def __init__(self, memory_limit_bytes: int, ttl: float):
+        self.memory_limit = memory_limit_bytes
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def _remember(self, digest: str, data: bytes, kind: str):
+        with self._lock:
+            if digest in self._memory:
+                self._memory.move_to_end(digest)
+                return
+            self._memory[digest] = (data, kind)
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_limit and len(self._memory) > 1:
+                _, (evicted, _) = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def _cached(self, digest: str) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            entry = self._memory.get(digest)
+            if entry is not None:
+                self._memory.move_to_end(digest)
+            return entry
+
+    def put(self, value: Any) -> Dict:
+        data, kind = _encode(value)
+        digest = hashlib.sha256(data).hexdigest()
+        if self._cached(digest) is None:
+            get_kv_store().set(BLOB_NAMESPACE, digest, {"kind": kind, "data": data.decode("utf-8")}, ttl=self.ttl)
+        self._remember(digest, data, kind)
+        return {"blob": digest, "size": len(data), "kind": kind}
+
+    def get(self, handle: Dict) -> Any:
+        entry = self._cached(handle["blob"])
+        if entry is None:
+            stored = get_kv_store().get(BLOB_NAMESPACE, handle["blob"])
+            if stored is None:
+                raise KeyError(f"Blob {handle['blob']} is missing or expired")
+            entry = (stored["data"].encode("utf-8"), stored["kind"])
+            self._remember(handle["blob"], *entry)
+        return _decode(*entry)
+
+    def purge_expired(self) -> int:
+        """Drop expired blobs from the KV store; `get` only deletes the ones it reads."""
+        return get_kv_store().purge_expired(BLOB_NAMESPACE)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"blobs_in_memory": len(self._memory), "memory_bytes": self._memory_bytes}
+
+
+@lru_cache()
+def get_blob_store() -> BlobStore:
+    return BlobStore(settings.BLOB_MEMORY_MB * 1024 * 1024, settings.BLOB_TTL)
+
+
+# === State helpers ===
+async def offload(value: Any) -> Any:
+    """Handle for a large value; small values (and None) stay inline."""
+    if value is None or is_handle(value):
+        return value
+    data, _ = _encode(value)
+    if len(data) <= settings.BLOB_INLINE_MAX_BYTES:
+        return value
+    return await run_io(get_blob_store().put, value)
+
+
+async def resolve(value: Any) -> Any:
+    """The value behind a handle; anything else is returned as is."""
+    if not is_handle(value):
+        return value
+    # Values produced in this process are normally still in memory, skip the I/O pool then
+    store = get_blob_store()
+    if store._cached(value["blob"]) is not None:
+        return store.get(value)
+    return await run_io(store.get, value)
+
+
+async def offload_fields(values: Dict, fields: Iterable[str]) -> Dict:
+    """Copy of `values` with each of `fields` that is present offloaded."""
+    return {**values, **{field: await offload(values[field]) for field in fields if field in values}}
+
+
+async def resolve_fields(values: Dict, fields: Iterable[str]) -> Dict:
+    """Copy of `values` with each of `fields` that is present resolved."""
+    return {**values, **{field: await resolve(values[field]) for field in fields if field in values}}
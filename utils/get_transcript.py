@@ -1,10 +1,12 @@
 from pathlib import Path
 from loguru import logger
+from utils.transcript_io import run_io
+from utils.transcript_store import get_transcript_store
 
 def load_transcript(transcript_url: str) -> str:
     """
     Load transcript from local zoom_transcripts folder.
-    transcript_url example: 'zoom_transcripts/85720082470_AI_Sharing分享_TRANSCRIPT.txt'
+    transcript_url example: 'zoom_transcripts/<sha256 of the .vtt>.txt'
     """
     path = Path(transcript_url)
 
@@ -12,6 +14,13 @@ def load_transcript(transcript_url: str) -> str:
         logger.error(f"❌ Transcript file not found: {path}")
         return f"[Transcript unavailable: {path}]"
 
-    text = path.read_text(encoding="utf-8")
+    text = get_transcript_store().read_text(path)
     logger.info(f"✅ Loaded transcript: {path}")
     return text
+
+
+async def aload_transcript(transcript_url: str) -> str:
+    """
+    Async variant of load_transcript that reads on the transcript I/O pool.
+    """
+    return await run_io(load_transcript, transcript_url)
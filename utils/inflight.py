@@ -0,0 +1,146 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+import weakref
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from loguru import logger
+from src.config.settings import settings
+from utils.kv_store import get_kv_store
+from utils.transcript_io import run_io
+
+INFLIGHT_NAMESPACE = "inflight"
+
+
+class Lease:
+    """One key held in the in-flight registry, kept alive while the work runs."""
+
+    def __init__(self, registry: "InflightRegistry", key: str, value: Dict):
+        self.registry = registry
+        self.key = key
+        self.value = value
+        self.released = False
+        self._keepalive = asyncio.create_task(self._renew(), name=f"lease-{key[:40]}")
+
+    async def _renew(self):
+        while True:
+            await asyncio.sleep(self.registry.ttl / 3)
+            renewed = await run_io(get_kv_store().renew, INFLIGHT_NAMESPACE, self.key, self.value, self.registry.ttl)
+            if not renewed:
+                logger.warning(f"⚠️ Lost in-flight lease {self.key}, another worker may repeat this work")
+                return
+
+    async def release(self):
+        if self.released:
+            return
+        self.released = True
+        self._keepalive.cancel()
+        self.registry._released_here(self.key)
+        # Shielded: released from a cancelled request too, rather than held until the lease expires
+        await asyncio.shield(run_io(get_kv_store().release, INFLIGHT_NAMESPACE, self.key, self.value))
+
+
+class InflightRegistry:
+    """
+    Work in progress across all worker processes of the server (Zoom token refreshes,
+    transcript downloads, digest builds, pipeline runs), kept as leases in the shared
+    KV store.
+
+    The first caller for a key takes the lease and does the work; callers in this or
+    another process wait for the lease to go away and then read the result from the
+    shared cache. A lease lives `ttl` seconds and is renewed while its holder runs, so
+    work of a crashed worker is taken over once the lease expires. Waiters for a lease held
+    in their own process are woken on release; others poll the store, backing off from
+    `poll_interval` to ten times that.
+    """
+
+    def __init__(self, ttl: float, poll_interval: float, max_wait: float):
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        # Waiters of this process queue on a lock instead of polling the store
+        self._local_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        # key -> set when the lease this process holds on it is released
+        self._held: Dict[str, asyncio.Event] = {}
+
+    async def acquire(self, key: str) -> Optional[Lease]:
+        """Take the lease on `key` now, or None if someone holds it."""
+        value = {"owner": self.owner, "id": uuid.uuid4().hex, "started_at": time.time()}
+        if await run_io(get_kv_store().acquire, INFLIGHT_NAMESPACE, key, value, self.ttl):
+            self._held[key] = asyncio.Event()
+            return Lease(self, key, value)
+        return None
+
+    def _released_here(self, key: str):
+        event = self._held.pop(key, None)
+        if event is not None:
+            event.set()
+
+    async def wait_released(self, key: str, timeout: Optional[float] = None) -> bool:
+        """Wait until nobody holds `key`; False if it is still held after `timeout` seconds."""
+        waited_until = time.monotonic() + (self.max_wait if timeout is None else timeout)
+        interval = self.poll_interval
+        while await run_io(get_kv_store().get, INFLIGHT_NAMESPACE, key) is not None:
+            remaining = waited_until - time.monotonic()
+            if remaining <= 0:
+                return False
+            held_here = self._held.get(key)
+            if held_here is not None:
+                try:
+                    await asyncio.wait_for(held_here.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return False
+                continue
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.poll_interval * 10)
+        return True
+
+    @asynccontextmanager
+    async def hold(self, key: str, timeout: Optional[float] = None):
+        """
+        Run the block as the only holder of `key` across processes.
+        After `timeout` seconds of waiting the block runs anyway, a stuck holder must not block forever.
+        """
+        lock = self._local_locks.get(key)
+        if lock is None:
+            lock = self._local_locks[key] = asyncio.Lock()
+        async with lock:
+            lease = await self.acquire(key)
+            while lease is None:
+                if not await self.wait_released(key, timeout):
+                    logger.warning(f"⚠️ Gave up waiting for in-flight {key}, running it here as well")
+                    break
+                lease = await self.acquire(key)
+            try:
+                yield
+            finally:
+                if lease is not None:
+                    await lease.release()
+
+    async def single_flight(self, key: str, lookup: Callable[[], Awaitable[Any]],
+                            compute: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """`lookup()` if it has a result, else `compute()` once across processes while the others wait and look up."""
+        result = await lookup()
+        if result is not None:
+            return result
+        async with self.hold(key, timeout):
+            result = await lookup()
+            if result is not None:
+                return result
+            return await compute()
+
+    def running(self) -> List[Dict]:
+        return [{"key": key, **value} for key, value in get_kv_store().items(INFLIGHT_NAMESPACE)]
+
+
+@lru_cache()
+def get_inflight_registry() -> InflightRegistry:
+    return InflightRegistry(
+        ttl=settings.INFLIGHT_LEASE_SECONDS,
+        poll_interval=settings.INFLIGHT_POLL_MS / 1000,
+        max_wait=settings.INFLIGHT_MAX_WAIT_SECONDS,
+    )
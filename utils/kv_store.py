@@ -0,0 +1,126 @@
+import json
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple
+from src.config.settings import settings
+
+
+class KVStore:
+    """
+    Small persistent key/value store on SQLite.
+
+    Values are JSON encoded. Each cache uses its own namespace, and entries
+    can carry an optional TTL after which `get` treats them as missing.
+    The database runs in WAL mode, so the worker processes of one server share
+    it with concurrent readers; `acquire`/`renew`/`release` give them leases.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL,"
+                " updated_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM kv WHERE namespace = ? AND key = ?",
+            (namespace, key),
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            self.delete(namespace, key)
+            return None
+        return json.loads(value)
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        self._conn().execute(
+            "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (namespace, key, json.dumps(value, ensure_ascii=False), now + ttl if ttl else None, now),
+        )
+
+    def delete(self, namespace: str, key: str):
+        self._conn().execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
+    # === Leases (one holder per key across processes) ===
+    def acquire(self, namespace: str, key: str, value: Any, ttl: float) -> bool:
+        """Set `key` to `value` unless it holds a live entry; True if this call took it."""
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM kv WHERE namespace = ? AND key = ? AND expires_at < ?",
+                (namespace, key, now),
+            )
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO kv (namespace, key, value, expires_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, ensure_ascii=False), now + ttl, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount == 1
+
+    def renew(self, namespace: str, key: str, value: Any, ttl: float) -> bool:
+        """Extend a lease still held with `value`; False if it expired and was taken over."""
+        now = time.time()
+        cursor = self._conn().execute(
+            "UPDATE kv SET expires_at = ?, updated_at = ? WHERE namespace = ? AND key = ? AND value = ?",
+            (now + ttl, now, namespace, key, json.dumps(value, ensure_ascii=False)),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, namespace: str, key: str, value: Any):
+        """Drop a lease, unless another holder has taken it over since."""
+        self._conn().execute(
+            "DELETE FROM kv WHERE namespace = ? AND key = ? AND value = ?",
+            (namespace, key, json.dumps(value, ensure_ascii=False)),
+        )
+
+    def purge_expired(self, namespace: str) -> int:
+        """Delete the expired entries of `namespace` that nothing has read since; returns how many."""
+        cursor = self._conn().execute(
+            "DELETE FROM kv WHERE namespace = ? AND expires_at < ?", (namespace, time.time())
+        )
+        return cursor.rowcount
+
+    def items(self, namespace: str) -> Iterator[Tuple[str, Any]]:
+        now = time.time()
+        rows = self._conn().execute(
+            "SELECT key, value FROM kv WHERE namespace = ?"
+            " AND (expires_at IS NULL OR expires_at >= ?)",
+            (namespace, now),
+        ).fetchall()
+        for key, value in rows:
+            yield key, json.loads(value)
+
+
+@lru_cache()
+def get_kv_store() -> KVStore:
+    return KVStore(Path(settings.CACHE_DB_PATH))
@@ -0,0 +1,131 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, Dict, List, Optional
+from loguru import logger
+
+
+class LoopLagMonitor:
+    """
+    Detect event loop stalls.
+
+    A heartbeat coroutine stamps the loop every `interval_ms`. A watchdog
+    thread notices when the stamp goes stale for longer than `threshold_ms`,
+    and samples the loop thread's stack and current task while the stall is
+    still happening, so the report names the coroutine that blocked the loop.
+    """
+
+    def __init__(self, threshold_ms: int = 100, interval_ms: int = 50, history: int = 50):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.stalls: Deque[Dict] = deque(maxlen=history)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._culprit: Optional[Dict] = None
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat_task = self._loop.create_task(self._heartbeat(), name="loop-lag-heartbeat")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"⏱️ Loop lag monitor started (threshold={self.threshold * 1000:.0f}ms)")
+
+    async def stop(self):
+        self._stop.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog:
+            self._watchdog.join(timeout=1)
+
+    def recent_stalls(self) -> List[Dict]:
+        return list(self.stalls)
+
+    # === Heartbeat on the event loop ===
+    async def _heartbeat(self):
+        while True:
+            now = time.monotonic()
+            lag = now - self._last_beat - self.interval
+            if lag > self.threshold:
+                self._report(lag)
+            self._last_beat = now
+            await asyncio.sleep(self.interval)
+
+    def _report(self, lag: float):
+        culprit = self._culprit or {"task": None, "coroutine": None, "stack": []}
+        self._culprit = None
+        stall = {
+            "lag_ms": round(lag * 1000, 1),
+            "timestamp": time.time(),
+            **culprit,
+        }
+        self.stalls.append(stall)
+        where = stall["stack"][-1] if stall["stack"] else "unknown location"
+        logger.warning(
+            f"🐢 Event loop blocked for {stall['lag_ms']}ms "
+            f"by {stall['coroutine'] or 'unknown coroutine'} at {where}"
+        )
+
+    # === Watchdog thread ===
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            stale_for = time.monotonic() - self._last_beat - self.interval
+            if stale_for > self.threshold and self._culprit is None:
+                self._culprit = self._sample()
+
+    def _sample(self) -> Dict:
+        task = None
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            pass
+        coroutine = None
+        if task is not None:
+            coro = task.get_coro()
+            coroutine = getattr(coro, "__qualname__", repr(coro))
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = []
+        if frame is not None:
+            stack = [
+                f"{entry.filename}:{entry.lineno} in {entry.name}"
+                for entry in traceback.extract_stack(frame)[-8:]
+            ]
+        return {
+            "task": task.get_name() if task is not None else None,
+            "coroutine": coroutine,
+            "stack": stack,
+        }
+
+
+loop_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_loop_monitor() -> Optional[LoopLagMonitor]:
+    return loop_monitor
+
+
+def start_loop_monitor(threshold_ms: int, interval_ms: int) -> LoopLagMonitor:
+    global loop_monitor
+    loop_monitor = LoopLagMonitor(threshold_ms=threshold_ms, interval_ms=interval_ms)
+    loop_monitor.start()
+    return loop_monitor
+
+
+async def stop_loop_monitor():
+    global loop_monitor
+    if loop_monitor is not None:
+        await loop_monitor.stop()
+        loop_monitor = None
@@ -0,0 +1,94 @@
+from typing import Dict, List, Optional
+
+UNKNOWN_SPEAKER = "Unknown"
+
+
+def compute_analytics(cues: List[Dict], silence_threshold: float = 5.0) -> Optional[Dict]:
+    """
+    Speaker and engagement analytics from timed transcript cues, vectorized over cue arrays.
+
+    Returns None when the cues carry no timing (e.g. a plain-text transcript).
+    - talk time, talk share and turn count per speaker
+    - interruptions: a cue by another speaker starting before the previous cue ended
+    - silence gaps longer than `silence_threshold` seconds
+    - meeting duration and a 0-10 participation balance (normalized entropy of talk share)
+    """
+    import numpy as np  # only needed once analytics are computed, not to import the service
+
+    timed = [cue for cue in cues if cue.get("start") is not None and cue.get("end") is not None]
+    if not timed:
+        return None
+
+    start = np.fromiter((cue["start"] for cue in timed), dtype=np.float64, count=len(timed))
+    end = np.fromiter((cue["end"] for cue in timed), dtype=np.float64, count=len(timed))
+    names, codes = np.unique(
+        np.array([cue.get("speaker") or UNKNOWN_SPEAKER for cue in timed], dtype=object),
+        return_inverse=True,
+    )
+    n_speakers = len(names)
+
+    talk_time = np.bincount(codes, weights=np.clip(end - start, 0, None), minlength=n_speakers)
+    speaker_changed = np.r_[True, codes[1:] != codes[:-1]]
+    turns = np.bincount(codes[speaker_changed], minlength=n_speakers)
+
+    # End of speech so far, so a long cue still "holds the floor" for later cues
+    floor_end = np.maximum.accumulate(end)
+    interrupted = (start[1:] < floor_end[:-1]) & (codes[1:] != codes[:-1])
+    interruptions = np.bincount(codes[1:][interrupted], minlength=n_speakers)
+
+    gaps = start[1:] - floor_end[:-1]
+    silences = gaps[gaps > silence_threshold]
+
+    total_talk = talk_time.sum()
+    share = talk_time / total_talk if total_talk else np.zeros(n_speakers)
+    nonzero = share[share > 0]
+    entropy = -(nonzero * np.log(nonzero)).sum()
+    balance = entropy / np.log(n_speakers) if n_speakers > 1 else 0.0
+
+    order = np.argsort(-talk_time)
+    return {
+        "duration_seconds": round(float(floor_end[-1] - start.min()), 1),
+        "speaker_count": int(n_speakers),
+        "participants": [str(names[i]) for i in order],
+        "speakers": {
+            str(names[i]): {
+                "talk_time_seconds": round(float(talk_time[i]), 1),
+                "talk_share": round(float(share[i]), 3),
+                "turns": int(turns[i]),
+                "interruptions": int(interruptions[i]),
+            }
+            for i in order
+        },
+        "silence": {
+            "gap_count": int(silences.size),
+            "total_seconds": round(float(silences.sum()), 1),
+            "longest_seconds": round(float(silences.max()), 1) if silences.size else 0.0,
+        },
+        "interruption_count": int(interrupted.sum()),
+        "participation_balance": int(round(balance * 10)),
+    }
+
+
+def format_duration(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m" if hours else f"{minutes}m {secs:02d}s"
+
+
+def format_analytics(analytics: Dict) -> str:
+    """Readable block appended to the summary/feedback outputs."""
+    lines = [
+        f"Duration: {format_duration(analytics['duration_seconds'])}",
+        f"Participants ({analytics['speaker_count']}): {', '.join(analytics['participants'])}",
+        f"Participation balance: {analytics['participation_balance']}/10, "
+        f"interruptions: {analytics['interruption_count']}, "
+        f"silences over threshold: {analytics['silence']['gap_count']} "
+        f"({analytics['silence']['total_seconds']}s total)",
+    ]
+    for name, stats in analytics["speakers"].items():
+        lines.append(
+            f"- {name}: {format_duration(stats['talk_time_seconds'])} "
+            f"({stats['talk_share'] * 100:.0f}%), {stats['turns']} turns, "
+            f"{stats['interruptions']} interruptions"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,335 @@
+import asyncio
+import contextvars
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+from loguru import logger
+from src.config.settings import settings
+
+# The profile of the run the current task belongs to; tasks created under it inherit it
+active_profile: contextvars.ContextVar[Optional["RunProfile"]] = contextvars.ContextVar("active_profile", default=None)
+
+MAX_STACK_DEPTH = 48
+# Frames of this repository are labelled with their relative path, library frames with the file name
+REPO_ROOT = str(Path(__file__).resolve().parent.parent) + os.sep
+
+_tracemalloc_users = 0
+_tracemalloc_lock = threading.Lock()
+
+# Profiles reserved or sampling, bounded by PROFILE_MAX_CONCURRENT (see reserve_profile)
+running_profiles = set()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    filename = filename[len(REPO_ROOT):] if filename.startswith(REPO_ROOT) else os.path.basename(filename)
+    return f"{filename}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def cpu_stack(frame) -> List[str]:
+    """Outermost-first labels of a thread's Python stack."""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return labels[::-1]
+
+
+def await_stack(task: asyncio.Task) -> List[str]:
+    """Outermost-first labels of the coroutine chain a suspended task is waiting in."""
+    labels = []
+    awaitable = task.get_coro()
+    while awaitable is not None and len(labels) < MAX_STACK_DEPTH:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None) \
+            or getattr(awaitable, "ag_frame", None)
+        if frame is None:
+            # The chain ends on a Future or another Task
+            if isinstance(awaitable, asyncio.Task):
+                labels.append(f"<task {awaitable.get_name()}>")
+            elif not hasattr(awaitable, "cr_await"):
+                labels.append(f"<{type(awaitable).__name__}>")
+            break
+        labels.append(_frame_label(frame))
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None) \
+            or getattr(awaitable, "ag_await", None)
+    return labels
+
+
+class RunProfile:
+    """
+    Profile of one graph run.
+
+    A sampler thread looks at the event loop every `interval_ms`:
+    - when a task of the run holds the loop, its Python stack goes to the CPU profile;
+    - every task of the run that is suspended contributes its await chain to the
+      wait profile, so time spent awaiting the model, Zoom or MCP shows up by call site.
+    Tasks created while the run's context is active are tracked through a task factory,
+    which also gives the task timeline. Memory is the process RSS peak and, with
+    `trace_memory`, the tracemalloc high-water mark and largest allocation sites while the
+    run was active. tracemalloc traces every allocation of the process, so it slows down all
+    concurrent requests, not just this run, and its numbers include theirs.
+    """
+
+    def __init__(self, query: str, interval_ms: float = 5, trace_memory: bool = False):
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.query = query
+        self.trace_memory = trace_memory
+        self.interval = interval_ms / 1000
+        self.started_at = time.time()
+        self.duration: Optional[float] = None
+        self.cpu = Counter()
+        self.wait = Counter()
+        self.samples = {"run": 0, "other": 0, "idle": 0}
+        self.tasks: Dict[asyncio.Task, Dict] = {}
+        self.events: List[Dict] = []
+        self.memory: Dict = {}
+        self._t0 = time.perf_counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._token = None
+
+    def _now(self) -> float:
+        return round(time.perf_counter() - self._t0, 4)
+
+    # === Lifecycle ===
+    def start(self):
+        """Call from the task that drives the run."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        install_task_factory(self._loop)
+        if self.trace_memory:
+            self._start_tracemalloc()
+        self._t0 = time.perf_counter()
+        self._token = active_profile.set(self)
+        self.track(asyncio.current_task())
+        self._sampler = threading.Thread(target=self._sample_loop, name=f"profiler-{self.id}", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """Stop sampling; the allocation snapshot is taken later by finish(), off the loop."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=1)
+        self.duration = self._now()
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self.memory.update(traced_end_mb=round(current / 2 ** 20, 2), traced_peak_mb=round(peak / 2 ** 20, 2))
+        self.release()
+        if self._token is not None:
+            try:
+                active_profile.reset(self._token)
+            except ValueError:
+                # Reset from another context (generator closed elsewhere), the context dies with its task
+                pass
+
+    def release(self):
+        """Free the profile's slot; also for a reserved profile whose run never started."""
+        running_profiles.discard(self)
+
+    def mark(self, event: str, **data):
+        self.events.append({"at": self._now(), "event": event, **data})
+
+    def track(self, task: Optional[asyncio.Task]):
+        if task is None or task in self.tasks:
+            return
+        entry = {"start": self._now(), "end": None, "cpu_samples": 0}
+        self.tasks[task] = entry
+        task.add_done_callback(lambda _: entry.update(end=self._now()))
+
+    # === Sampling ===
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample()
+            except Exception:
+                # Racing the loop thread can catch a coroutine mid-switch, skip the sample
+                continue
+
+    def _sample(self):
+        current = asyncio.current_task(self._loop)
+        if current is None:
+            self.samples["idle"] += 1
+        elif current in self.tasks:
+            self.samples["run"] += 1
+            self.tasks[current]["cpu_samples"] += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None:
+                self.cpu[";".join(cpu_stack(frame))] += 1
+        else:
+            self.samples["other"] += 1
+        for task in list(self.tasks):
+            if task is not current and not task.done():
+                stack = await_stack(task)
+                if stack:
+                    self.wait[";".join(stack)] += 1
+
+    # === Memory ===
+    def _start_tracemalloc(self):
+        global _tracemalloc_users
+        with _tracemalloc_lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if _tracemalloc_users == 0:
+                tracemalloc.reset_peak()
+            _tracemalloc_users += 1
+        self.memory["traced_start_mb"] = round(tracemalloc.get_traced_memory()[0] / 2 ** 20, 2)
+
+    def finish(self):
+        """Record the largest live allocation sites, then stop tracemalloc unless another profile uses it."""
+        global _tracemalloc_users
+        if not self.trace_memory:
+            self.memory["process_max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        with _tracemalloc_lock:
+            _tracemalloc_users -= 1
+            overlapping = _tracemalloc_users > 0
+            if not overlapping:
+                tracemalloc.stop()
+        self.memory.update(
+            overlapping_profiles=overlapping,
+            process_max_rss_mb=round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            top_allocations=[
+                {"site": str(stat.traceback), "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:15]
+            ],
+        )
+
+    # === Artifacts ===
+    def to_dict(self) -> Dict:
+        interval_ms = self.interval * 1000
+        self_cpu = Counter()
+        for stack, count in self.cpu.items():
+            self_cpu[stack.rsplit(";", 1)[-1]] += count
+        # Wait time by the innermost repo frame and what it ends up awaiting
+        waiting_on = Counter()
+        for stack, count in self.wait.items():
+            frames = stack.split(";")
+            own = [f for f in frames if f.startswith(("src" + os.sep, "utils" + os.sep))]
+            leaf = next((f for f in reversed(frames) if not f.startswith("<")), frames[-1])
+            waiting_on[" -> ".join(dict.fromkeys([own[-1], leaf])) if own else leaf] += count
+        timeline = sorted((
+            {
+                "task": task.get_name(),
+                "coroutine": getattr(task.get_coro(), "__qualname__", repr(task.get_coro())),
+                "start": entry["start"],
+                "end": entry["end"],
+                "cpu_ms": round(entry["cpu_samples"] * interval_ms, 1),
+            }
+            for task, entry in self.tasks.items()
+        ), key=lambda t: t["start"])
+        return {
+            "id": self.id,
+            "query": self.query,
+            "started_at": self.started_at,
+            "duration_s": self.duration,
+            "sample_interval_ms": interval_ms,
+            "loop_samples": self.samples,
+            "cpu_top": [{"frame": f, "ms": round(c * interval_ms, 1)} for f, c in self_cpu.most_common(20)],
+            "waiting_on_top": [{"frames": f, "ms": round(c * interval_ms, 1)} for f, c in waiting_on.most_common(20)],
+            "tasks": timeline,
+            "events": self.events,
+            "memory": self.memory,
+        }
+
+    def collapsed(self, kind: str) -> str:
+        """Folded stacks (flamegraph.pl / speedscope) of the CPU or wait profile."""
+        counter = self.cpu if kind == "cpu" else self.wait
+        return "".join(f"{stack} {count}\n" for stack, count in counter.most_common())
+
+
+# === Task tracking ===
+_factory_loops = set()
+
+
+def reserve_profile(query: str, trace_memory: bool = False) -> Optional[RunProfile]:
+    """
+    A new profile holding one of the PROFILE_MAX_CONCURRENT slots, or None when all are taken.
+    The slot is taken here, not when the run starts, so concurrent requests cannot all pass the check.
+    """
+    if len(running_profiles) >= settings.PROFILE_MAX_CONCURRENT:
+        return None
+    profile = RunProfile(query, settings.PROFILE_SAMPLE_INTERVAL_MS, trace_memory)
+    running_profiles.add(profile)
+    return profile
+
+
+def install_task_factory(loop: asyncio.AbstractEventLoop):
+    """Chain a factory that adds tasks created inside a profiled run to its timeline."""
+    if id(loop) in _factory_loops:
+        return
+    previous = loop.get_task_factory()
+
+    def factory(loop, coro, **kwargs):
+        if previous is not None:
+            task = previous(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        context = kwargs.get("context")
+        profile = context.get(active_profile) if context is not None else active_profile.get()
+        if profile is not None and not profile._stop.is_set():
+            profile.track(task)
+        return task
+
+    loop.set_task_factory(factory)
+    _factory_loops.add(id(loop))
+
+
+# === Artifact store ===
+class ProfileStore:
+    """Profile artifacts on disk: <id>.json plus <id>.cpu.folded and <id>.wait.folded."""
+
+    def __init__(self, root: Path, keep: int = 50):
+        self.root = Path(root)
+        self.keep = keep
+
+    def save(self, profile: RunProfile) -> Dict:
+        profile.finish()
+        self.root.mkdir(parents=True, exist_ok=True)
+        report = profile.to_dict()
+        (self.root / f"{profile.id}.json").write_text(json.dumps(report, ensure_ascii=False, indent=1), encoding="utf-8")
+        (self.root / f"{profile.id}.cpu.folded").write_text(profile.collapsed("cpu"), encoding="utf-8")
+        (self.root / f"{profile.id}.wait.folded").write_text(profile.collapsed("wait"), encoding="utf-8")
+        self._prune()
+        logger.info(f"🔬 Saved profile {profile.id} ({report['duration_s']}s, {report['loop_samples']['run']} CPU samples)")
+        return report
+
+    def _prune(self):
+        reports = sorted(self.root.glob("*.json"))
+        for stale in reports[:-self.keep] if self.keep else []:
+            for path in self.root.glob(f"{stale.stem}.*"):
+                path.unlink(missing_ok=True)
+
+    def list(self) -> List[Dict]:
+        entries = []
+        for path in sorted(self.root.glob("*.json"), reverse=True) if self.root.exists() else []:
+            report = json.loads(path.read_text(encoding="utf-8"))
+            entries.append({k: report[k] for k in ("id", "query", "started_at", "duration_s")})
+        return entries
+
+    def path(self, profile_id: str, suffix: str) -> Optional[Path]:
+        # Ids are generated here; anything else (e.g. path separators) is not a profile
+        if not all(c.isalnum() or c == "-" for c in profile_id):
+            return None
+        path = self.root / f"{profile_id}{suffix}"
+        return path if path.exists() else None
+
+
+@lru_cache()
+def get_profile_store() -> ProfileStore:
+    return ProfileStore(Path(settings.PROFILE_DIR), settings.PROFILE_KEEP)
@@ -0,0 +1,183 @@
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+from loguru import logger
+from src.config.settings import settings
+
+# Latin words/numbers, and runs of CJK ideographs (plus kana/hangul)
+LATIN_RE = re.compile(r"[a-z0-9]+(?:['’][a-z]+)?")
+CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+")
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Tokenize mixed Chinese/English text without a segmenter.
+    English is split into lowercase words; CJK runs are indexed as single
+    characters plus overlapping bigrams, which matches multi-character words
+    well enough for BM25 ranking.
+    """
+    text = text.lower()
+    tokens = LATIN_RE.findall(text)
+    for run in CJK_RE.findall(text):
+        tokens.extend(run)
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def split_passages(lines: Iterable[str], max_chars: int) -> Iterator[str]:
+    """Group consecutive transcript lines into passages of roughly max_chars."""
+    current, size = [], 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if current and size + len(line) > max_chars:
+            yield "\n".join(current)
+            current, size = [], 0
+        current.append(line)
+        size += len(line)
+    if current:
+        yield "\n".join(current)
+
+
+class TranscriptIndex:
+    """
+    Local BM25 inverted index over transcript passages, stored in SQLite.
+    Documents are keyed by the transcript file stem (the content hash for
+    files written by the transcript store), so re-adding a file is a no-op.
+    """
+
+    def __init__(self, path: Path, passage_chars: int):
+        self.path = Path(path)
+        self.passage_chars = passage_chars
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            # WAL: searches in one worker process do not wait for another one's indexing
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS docs ("
+                " doc TEXT PRIMARY KEY, path TEXT NOT NULL, size INTEGER NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS passages ("
+                " id INTEGER PRIMARY KEY, doc TEXT NOT NULL, ordinal INTEGER NOT NULL,"
+                " text TEXT NOT NULL, length INTEGER NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS passages_doc ON passages (doc);"
+                "CREATE TABLE IF NOT EXISTS postings ("
+                " term TEXT NOT NULL, passage_id INTEGER NOT NULL, tf INTEGER NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS postings_term ON postings (term);"
+                "CREATE INDEX IF NOT EXISTS postings_passage ON postings (passage_id);"
+            )
+            self._local.conn = conn
+        return conn
+
+    # === Indexing ===
+    def has(self, doc: str, size: Optional[int] = None) -> bool:
+        row = self._conn().execute("SELECT size FROM docs WHERE doc = ?", (doc,)).fetchone()
+        return row is not None and (size is None or row[0] == size)
+
+    def add_transcript(self, path: Path) -> bool:
+        """Index a cleaned transcript file. Returns False if it was already indexed."""
+        path = Path(path)
+        doc, size = path.stem, path.stat().st_size
+        if self.has(doc, size):
+            return False
+
+        # Read line by line, a large upload is indexed without holding its text in memory
+        with self._write_lock, path.open("r", encoding="utf-8") as lines:
+            conn = self._conn()
+            with conn:
+                self._delete(conn, doc)
+                conn.execute("INSERT INTO docs (doc, path, size) VALUES (?, ?, ?)", (doc, str(path), size))
+                for ordinal, passage in enumerate(split_passages(lines, self.passage_chars)):
+                    terms = Counter(tokenize(passage))
+                    cursor = conn.execute(
+                        "INSERT INTO passages (doc, ordinal, text, length) VALUES (?, ?, ?, ?)",
+                        (doc, ordinal, passage, sum(terms.values())),
+                    )
+                    conn.executemany(
+                        "INSERT INTO postings (term, passage_id, tf) VALUES (?, ?, ?)",
+                        [(term, cursor.lastrowid, tf) for term, tf in terms.items()],
+                    )
+        logger.info(f"🔎 Indexed transcript {path}")
+        return True
+
+    def remove(self, doc: str):
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                self._delete(conn, doc)
+
+    def _delete(self, conn: sqlite3.Connection, doc: str):
+        conn.execute(
+            "DELETE FROM postings WHERE passage_id IN (SELECT id FROM passages WHERE doc = ?)", (doc,)
+        )
+        conn.execute("DELETE FROM passages WHERE doc = ?", (doc,))
+        conn.execute("DELETE FROM docs WHERE doc = ?", (doc,))
+
+    def index_directory(self, root: Path, pattern: str = "*.txt") -> int:
+        """Index every cleaned transcript in root that is not indexed yet."""
+        root = Path(root)
+        if not root.exists():
+            return 0
+        return sum(1 for path in root.glob(pattern) if self.add_transcript(path))
+
+    # === Search ===
+    def search(self, query: str, k: int = 5, docs: Optional[Iterable[str]] = None) -> List[Dict]:
+        """Return the top-k passages for query by BM25, optionally restricted to some documents."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        conn = self._conn()
+        total, avg_length = conn.execute("SELECT COUNT(*), AVG(length) FROM passages").fetchone()
+        if not total:
+            return []
+
+        doc_filter, doc_params = "", []
+        if docs is not None:
+            docs = list(docs)
+            doc_filter = f" AND p.doc IN ({','.join('?' * len(docs))})"
+            doc_params = docs
+
+        scores: Dict[int, float] = {}
+        for term in terms:
+            (df,) = conn.execute("SELECT COUNT(*) FROM postings WHERE term = ?", (term,)).fetchone()
+            if not df:
+                continue
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            rows = conn.execute(
+                "SELECT po.passage_id, po.tf, p.length FROM postings po"
+                " JOIN passages p ON p.id = po.passage_id"
+                f" WHERE po.term = ?{doc_filter}",
+                (term, *doc_params),
+            )
+            for passage_id, tf, length in rows:
+                norm = tf + K1 * (1 - B + B * length / avg_length)
+                scores[passage_id] = scores.get(passage_id, 0.0) + idf * tf * (K1 + 1) / norm
+
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        results = []
+        for passage_id, score in top:
+            doc, ordinal, text = conn.execute(
+                "SELECT doc, ordinal, text FROM passages WHERE id = ?", (passage_id,)
+            ).fetchone()
+            results.append({"doc": doc, "ordinal": ordinal, "text": text, "score": round(score, 3)})
+        return results
+
+
+@lru_cache()
+def get_transcript_index() -> TranscriptIndex:
+    return TranscriptIndex(Path(settings.TRANSCRIPT_INDEX_PATH), settings.INDEX_PASSAGE_CHARS)
@@ -0,0 +1,55 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, TypeVar
+from src.config.settings import settings
+
+T = TypeVar("T")
+
+# Bounded pool for all transcript disk I/O, so large reads/writes never run
+# on the event loop thread that serves every SSE connection.
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.TRANSCRIPT_IO_WORKERS,
+            thread_name_prefix="transcript-io",
+        )
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+async def run_io(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run a blocking file operation on the transcript I/O pool.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def read_text(path: Path, encoding: str = "utf-8") -> str:
+    return await run_io(Path(path).read_text, encoding=encoding)
+
+
+async def write_text(path: Path, text: str, encoding: str = "utf-8") -> Path:
+    await run_io(Path(path).write_text, text, encoding=encoding)
+    return Path(path)
+
+
+async def write_bytes(path: Path, data: bytes) -> Path:
+    await run_io(Path(path).write_bytes, data)
+    return Path(path)
+
+
+async def exists(path: Path) -> bool:
+    return await run_io(Path(path).exists)
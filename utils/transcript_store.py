@@ -0,0 +1,187 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from loguru import logger
+from src.config.settings import settings
+from utils.transcript_io import run_io
+from utils.transcript_index import get_transcript_index
+
+
+class TranscriptStore:
+    """
+    Owns the transcript directory.
+
+    - Raw downloads are named by the SHA-256 of their content, and derived
+      files (cleaned `.txt`, digests, ...) share the stem of the file they
+      came from, so re-downloading identical content never adds a new file.
+      A transcript and its derived files are evicted together.
+    - Decoded transcripts are kept in an in-memory LRU bounded by the size of
+      the decoded strings (non-ASCII text takes more memory than file bytes).
+    - The directory is kept under `disk_quota_bytes` by evicting the least
+      recently used transcripts (access time is bumped on every read).
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        memory_limit_bytes: int,
+        disk_quota_bytes: int,
+    ):
+        self.root = Path(root)
+        self.memory_limit_bytes = memory_limit_bytes
+        self.disk_quota_bytes = disk_quota_bytes
+        self._memory: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self._memory_sizes: Dict[Tuple[str, int, int], int] = {}
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        # Called with the stem of every evicted transcript
+        self.evict_listeners: List[Callable[[str], None]] = []
+
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def ensure_root(self) -> Path:
+        self.root.mkdir(parents=True, exist_ok=True)
+        return self.root
+
+    def path_for(self, digest: str, suffix: str) -> Path:
+        return self.root / f"{digest}{suffix}"
+
+    # === Writes ===
+    def put_bytes(self, data: bytes, suffix: str) -> Path:
+        """Store raw content under its content hash and return the path."""
+        self.ensure_root()
+        path = self.path_for(self.content_hash(data), suffix)
+        if path.exists() and path.stat().st_size == len(data):
+            self._touch(path)
+            logger.info(f"♻️ Transcript content already stored: {path}")
+            return path
+        self._atomic_write(path, data)
+        self.enforce_quota(keep={path.stem})
+        return path
+
+    def write_derived(self, source: Path, text: str, suffix: str) -> Path:
+        """Store a file derived from `source` (e.g. the cleaned `.txt`)."""
+        self.ensure_root()
+        path = Path(source).with_suffix(suffix)
+        self._atomic_write(path, text.encode("utf-8"))
+        self.enforce_quota(keep={Path(source).stem})
+        return path
+
+    def _atomic_write(self, path: Path, data: bytes):
+        tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    # === Reads ===
+    def read_text(self, path: Path) -> str:
+        path = Path(path)
+        stat = path.stat()
+        key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+        if text is not None:
+            self._touch(path, stat)
+            return text
+
+        text = path.read_text(encoding="utf-8")
+        self._remember(key, text)
+        self._touch(path, stat)
+        return text
+
+    def _remember(self, key: Tuple[str, int, int], text: str):
+        # Memory the decoded string takes (1, 2 or 4 bytes per character), not the file size
+        size = sys.getsizeof(text)
+        if size > self.memory_limit_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = text
+            self._memory_sizes[key] = size
+            self._memory_bytes += size
+            while self._memory_bytes > self.memory_limit_bytes and self._memory:
+                old_key, _ = self._memory.popitem(last=False)
+                self._memory_bytes -= self._memory_sizes.pop(old_key)
+
+    def _forget(self, path: Path):
+        resolved = str(path.resolve())
+        with self._lock:
+            for key in [k for k in self._memory if k[0] == resolved]:
+                del self._memory[key]
+                self._memory_bytes -= self._memory_sizes.pop(key)
+
+    def _touch(self, path: Path, stat: Optional[os.stat_result] = None):
+        # Bump atime only, mtime stays part of the memory cache key
+        try:
+            stat = stat or path.stat()
+            os.utime(path, ns=(time.time_ns(), stat.st_mtime_ns))
+        except OSError:
+            pass
+
+    # === Disk quota ===
+    def enforce_quota(self, keep: Optional[set] = None) -> List[Path]:
+        """Evict least recently used transcripts until the directory fits the quota."""
+        keep = keep or set()
+        if not self.root.exists():
+            return []
+        groups: Dict[str, Dict] = {}
+        for path in self.root.iterdir():
+            if not path.is_file() or path.name.startswith("."):
+                continue
+            stat = path.stat()
+            stem = path.name.split(".", 1)[0]
+            group = groups.setdefault(stem, {"paths": [], "size": 0, "atime": 0})
+            group["paths"].append(path)
+            group["size"] += stat.st_size
+            group["atime"] = max(group["atime"], stat.st_atime_ns)
+
+        total = sum(group["size"] for group in groups.values())
+        evicted = []
+        for stem, group in sorted(groups.items(), key=lambda item: item[1]["atime"]):
+            if total <= self.disk_quota_bytes:
+                break
+            if stem in keep:
+                continue
+            for path in group["paths"]:
+                self._forget(path)
+                path.unlink(missing_ok=True)
+                evicted.append(path)
+            for listener in self.evict_listeners:
+                listener(stem)
+            total -= group["size"]
+        if evicted:
+            logger.info(f"🧹 Evicted {len(evicted)} transcript files to stay under disk quota")
+        return evicted
+
+    # === Async API (runs on the transcript I/O pool) ===
+    async def aput_bytes(self, data: bytes, suffix: str) -> Path:
+        return await run_io(self.put_bytes, data, suffix)
+
+    async def awrite_derived(self, source: Path, text: str, suffix: str) -> Path:
+        return await run_io(self.write_derived, source, text, suffix)
+
+    async def aread_text(self, path: Path) -> str:
+        return await run_io(self.read_text, path)
+
+
+@lru_cache()
+def get_transcript_store() -> TranscriptStore:
+    store = TranscriptStore(
+        root=Path(settings.TRANSCRIPT_DIR),
+        memory_limit_bytes=settings.TRANSCRIPT_MEMORY_CACHE_MB * 1024 * 1024,
+        disk_quota_bytes=settings.TRANSCRIPT_DISK_QUOTA_MB * 1024 * 1024,
+    )
+    # Keep the full-text index in step with what is on disk
+    store.evict_listeners.append(get_transcript_index().remove)
+    return store
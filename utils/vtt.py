@@ -0,0 +1,82 @@
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TIMESTAMP_RE = re.compile(
+    r"(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})\s*-->\s*(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})"
+)
+SPEAKER_RE = re.compile(r"^([^:：]{1,60})[:：]\s*(.*)$")
+
+
+def _seconds(hours: Optional[str], minutes: str, seconds: str, millis: str) -> float:
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+
+def parse_cues(text: str) -> List[Dict]:
+    """
+    Parse WEBVTT (or SRT) text into cues: {"start", "end", "speaker", "text"}.
+    Zoom puts the speaker in front of the cue text ("Alice: ..."); cues without
+    a speaker prefix get speaker None.
+    """
+    cues = []
+    current = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        match = TIMESTAMP_RE.search(line)
+        if match:
+            g = match.groups()
+            current = {"start": _seconds(*g[:4]), "end": _seconds(*g[4:]), "speaker": None, "text": ""}
+            cues.append(current)
+            continue
+        if not line:
+            current = None
+            continue
+        if current is None:
+            continue  # header, cue number or cue identifier
+        if not current["text"]:
+            speaker = SPEAKER_RE.match(line)
+            if speaker:
+                current["speaker"], line = speaker.group(1).strip(), speaker.group(2)
+        current["text"] = f"{current['text']} {line}".strip()
+    return cues
+
+
+def clean_line(line: str, timed: bool = True) -> Optional[str]:
+    """
+    One line of a transcript in its cleaned 'Speaker: text' form, or None when it is dropped:
+    blank lines always, and for timed formats (VTT, SRT) headers, cue numbers and timestamps.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if timed and (line.startswith("WEBVTT") or line.isdecimal() or "-->" in line):
+        return None
+    return line
+
+
+def render_cue(cue: Dict) -> str:
+    return f"{cue['speaker']}: {cue['text']}" if cue.get("speaker") else cue["text"]
+
+
+def load_cues(transcript_path: str) -> List[Dict]:
+    """
+    Cues of a stored transcript: parsed from the sibling .vtt (or uploaded .srt) when it
+    exists, otherwise one cue per line of the cleaned text (without timing).
+    """
+    path = Path(transcript_path)
+    for suffix in (".vtt", ".srt"):
+        timed_path = path.with_suffix(suffix)
+        if timed_path.exists():
+            return parse_cues(timed_path.read_text(encoding="utf-8"))
+    cues = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        speaker = SPEAKER_RE.match(line)
+        cues.append({
+            "start": None,
+            "end": None,
+            "speaker": speaker.group(1).strip() if speaker else None,
+            "text": speaker.group(2) if speaker else line.strip(),
+        })
+    return cues